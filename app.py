@@ -20,13 +20,29 @@ from flask import (
 
 import firebase_admin
 from firebase_admin import credentials
-from helpers import current_user
+from helpers import current_user, pool_stats, upstream_calls
+from helpers.cache import cache_stats
+from helpers.circuit_breaker import breaker_stats
+from helpers.compression import init_compression
+from helpers.concurrency import submit
+from helpers.deadline import start_request_deadline
+from helpers.fragment_cache import FragmentCacheExtension, fragment_key
+from helpers.hedging import hedging_stats
+from helpers.http_client import init_upstream_calls
+from helpers.json_provider import JSONProvider
+from helpers.http_cache import compute_etag, not_modified, with_etag
+from helpers.markdown_render import init_markdown
+from helpers.request_cache import init_request_memo
+from helpers.singleflight import singleflight_stats
 from config import Config
-from services.post_service import get_post_limit
+from services.comment_service import get_comment_counts
+from services.post_service import autocomplete_posts, get_feed_page, search_posts
+from services.user_service import autocomplete_users
 
 
 def create_app(config_override=None):
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     app.config.from_object(Config)
 
     if config_override:
@@ -47,6 +63,16 @@ def create_app(config_override=None):
         # No detenemos la app si falla; los endpoints de sesión reportarán el error
         app.logger.error(f"Firebase Admin init failed: {e}")
 
+    # brotli/gzip y estáticos con huella (ver build_static.py)
+    init_compression(app)
+
+    # {% cache llave, ttl %} en las plantillas
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.globals["fragment_key"] = fragment_key
+
+    # caché del HTML de los posts y carga de los lexers de Pygments
+    init_markdown(app)
+
     # registrar Blueprints
     from routes import login_api, post_api, comment_api, user_api
 
@@ -65,15 +91,56 @@ def create_app(config_override=None):
 
         logger.info("======== index =========")
         query = request.args.get("q", "").strip()
-        posts = get_post_limit(25, query)
+        after = request.args.get("after", "").strip()
+        next_cursor = None
+
+        if query:
+            # la búsqueda se ordena por relevancia y no se pagina
+            posts = search_posts(query, 25)
+        else:
+            page = get_feed_page(25, after or None)
+            posts, next_cursor = page if page is not None else (None, None)
 
         if posts is None:
             logger.error("======== Error al obtener las publicaciones ========")
             flash(f"Error al obtener las publicaciones", "danger")
             posts = []
 
+        comment_counts = get_comment_counts([p.id for p in posts]) if posts else {}
+        user = current_user()
+        etag = compute_etag(
+            [(p.id, p.updated_at) for p in posts],
+            comment_counts,
+            next_cursor,
+            user.id if user else None,
+        )
+        response = not_modified(etag)
+
+        if response is not None:
+            return response
+
         logger.info(f"======== Mostrando {len(posts)} publicaciones ========")
-        return render_template("index.html", posts=posts, user=current_user())
+        html = render_template(
+            "index.html",
+            posts=posts,
+            next_cursor=next_cursor,
+            comment_counts=comment_counts,
+            user=user,
+        )
+        return with_etag(html, etag)
+
+    @app.get("/autocomplete")
+    def autocomplete():
+        # sugerencias para el buscador (títulos y usernames)
+        prefix = request.args.get("prefix", "").strip()
+
+        if len(prefix) < 2:
+            return {"posts": [], "users": []}
+
+        users_future = submit(autocomplete_users, prefix)
+        posts = autocomplete_posts(prefix)
+
+        return {"posts": posts, "users": users_future.result()}
 
     @app.errorhandler(403)
     def forbidden(e):  # pragma: no cover
@@ -106,6 +173,21 @@ def create_app(config_override=None):
             "firebase_config": fb_cfg,
         }
 
+    # memo de entidades y deadline por petición, compartidos con los hilos de fan-out
+    app.before_request(init_request_memo)
+    app.before_request(start_request_deadline)
+    app.before_request(init_upstream_calls)
+
+    if app.config.get("UPSTREAM_CALLS_HEADER"):
+
+        @app.after_request
+        def upstream_calls_header(response):
+            # "comments=1,post=2": lo lee benchmarks/loadtest.py
+            response.headers["X-Upstream-Calls"] = ",".join(
+                f"{name}={count}" for name, count in sorted(upstream_calls().items())
+            )
+            return response
+
     @app.after_request
     def remove_coop_headers(response):
         if request.path == "/login":  # o la ruta que renderiza tu template
@@ -121,6 +203,18 @@ def create_app(config_override=None):
     def live():
         return {"status": "ok"}
 
+    @app.get("/diagnostics")
+    def diagnostics():
+        # estado interno del worker que atiende la petición
+        return {
+            "pid": os.getpid(),
+            "pools": pool_stats(),
+            "breakers": breaker_stats(),
+            "caches": cache_stats(),
+            "singleflight": singleflight_stats(),
+            "hedging": hedging_stats(),
+        }
+
     return app
 
 
@@ -0,0 +1,133 @@
+"""
+Micro-benchmark del render de markdown de los posts.
+
+Compara, sobre un corpus de posts:
+
+- nuevo: ``markdown.markdown(...)`` (una instancia nueva por render, como antes)
+- reutilizado: instancia por hilo reutilizada con ``reset()``
+- caché: HTML ya renderizado (acierto en la caché por id/updated_at)
+
+Uso:
+    python benchmarks/bench_markdown.py
+    python benchmarks/bench_markdown.py --corpus posts.json --number 20
+
+``--corpus`` acepta la respuesta de ``/post/limit/<n>`` del microservicio de
+Post (``{"data": [...]}``) o una lista de posts con ``content``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import markdown  # noqa: E402
+
+from helpers.markdown_render import (  # noqa: E402
+    POST_EXTENSIONS,
+    _convert,
+    render_markdown,
+    warm_up,
+)
+
+_SAMPLE_POST = """
+# Cómo paginar en Firestore
+
+Paginar con `offset` obliga a leer todos los documentos anteriores. Con un
+**cursor** se continúa justo después del último documento visto.
+
+## Ejemplo
+
+```python
+query = (
+    collection.order_by("created_at", direction=firestore.Query.DESCENDING)
+    .start_after({"created_at": created_at, "__name__": post_id})
+    .limit(25)
+)
+docs = query.get()
+```
+
+```javascript
+const res = await fetch(`/post/feed?after=${cursor}`)
+const { data } = await res.json()
+```
+
+| Estrategia | Lecturas por página | Profundidad |
+|------------|---------------------|-------------|
+| offset     | O(n)                | limitada    |
+| cursor     | O(limit)            | ilimitada   |
+
+- Ordenar por un campo único o agregar el id como desempate
+- Guardar el cursor de forma opaca[^1]
+
+> Nota: los índices compuestos se crean desde la consola.
+
+[^1]: base64 de un JSON con la posición.
+"""
+
+
+def load_corpus(path: str = None) -> list:
+    if not path:
+        # posts de distinto largo: cortos, medianos y con mucho código
+        return [
+            "Un post corto con *énfasis* y un [enlace](https://example.com).",
+            _SAMPLE_POST,
+            _SAMPLE_POST * 5,
+        ]
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    posts = data.get("data", []) if isinstance(data, dict) else data
+    return [post["content"] for post in posts if post.get("content")]
+
+
+def bench(fn, corpus, number, repeat) -> float:
+    """Mejor tiempo por documento, en milisegundos."""
+    run = lambda: [fn(text) for text in corpus]
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / (number * len(corpus)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="JSON con posts (ver docstring)")
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    warm_up()
+
+    results = {
+        "nuevo": bench(
+            lambda text: markdown.markdown(text, extensions=list(POST_EXTENSIONS)),
+            corpus,
+            args.number,
+            args.repeat,
+        ),
+        "reutilizado": bench(
+            lambda text: _convert(text, POST_EXTENSIONS),
+            corpus,
+            args.number,
+            args.repeat,
+        ),
+        "caché": bench(
+            lambda text: render_markdown(text, cache_key=hash(text)),
+            corpus,
+            args.number,
+            args.repeat,
+        ),
+    }
+
+    print(f"{len(corpus)} posts, {args.number}x{args.repeat} repeticiones")
+
+    for name, ms in results.items():
+        speedup = results["nuevo"] / ms if ms else float("inf")
+        print(f"{name:<12} {ms:10.3f} ms/post  x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
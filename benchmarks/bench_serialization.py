@@ -0,0 +1,281 @@
+"""
+Micro-benchmarks de la serialización de posts, de punta a punta.
+
+Cada post pasa por ``Post.to_json`` -> ``ApiRes.to_json`` -> ``jsonify`` en el
+microservicio de Post y por ``loads`` -> ``PostDto.from_json`` en el monolito
+(ambos con json_provider.py: orjson si está instalado); el inicio repite eso
+por cada post de la página. Se mide cada paso, con posts de contenido largo
+(markdown), en operaciones por segundo y en memoria asignada por post (pico de
+tracemalloc). Las variantes ``msgpack`` y ``resumen`` de la ida y vuelta usan
+``WIRE_FORMAT=msgpack`` y la vista ``?view=summary`` (dtos/wire.py).
+
+Uso:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --items 100 --content-kb 8
+    python benchmarks/bench_serialization.py --save-baseline base.json
+    python benchmarks/bench_serialization.py --check base.json --tolerance 0.25
+
+``--check`` termina con código 1 si algún caso es más lento o asigna más
+memoria que la línea base por más de ``--tolerance`` (comparar en la misma
+máquina).
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+import requests
+from flask import Flask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POST_SERVICE = os.path.join(ROOT, "microservices", "post")
+
+# los logs de ApiRes se formatean igual, pero no se imprimen
+logging.basicConfig(
+    level=logging.INFO, handlers=[logging.StreamHandler(open(os.devnull, "w"))]
+)
+
+
+def load_module(name: str, path: str, imports: Dict[str, object] = None):
+    """
+    Cargar ``path`` como el módulo ``name``.
+
+    El monolito y los microservicios tienen módulos con el mismo nombre (``log``,
+    ``dtos``); ``imports`` indica qué módulo recibe cada ``import`` por nombre
+    mientras se carga.
+    """
+    imports = imports or {}
+    saved = {key: sys.modules.get(key) for key in imports}
+    sys.modules.update(imports)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, module in saved.items():
+            if module is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = module
+
+
+post_log = load_module("post_log", os.path.join(POST_SERVICE, "log.py"))
+post_model = load_module(
+    "post_model", os.path.join(POST_SERVICE, "db_connector", "post_model.py")
+)
+api_res = load_module(
+    "post_api_res",
+    os.path.join(POST_SERVICE, "dtos", "api_res.py"),
+    {"log": post_log},
+)
+post_dto = load_module("post_dto", os.path.join(ROOT, "dtos", "PostDto.py"))
+wire = load_module("wire", os.path.join(ROOT, "dtos", "wire.py"))
+# JSON de Flask del microservicio y lectura de respuestas del monolito
+json_provider = load_module(
+    "post_json_provider", os.path.join(POST_SERVICE, "json_provider.py")
+)
+client_json = load_module(
+    "client_json", os.path.join(ROOT, "helpers", "json_provider.py")
+)
+
+Post = post_model.Post
+ApiRes = api_res.ApiRes
+PostDto = post_dto.PostDto
+
+_PARAGRAPH = (
+    "Paginar con `offset` obliga a leer todos los documentos anteriores; con un "
+    "**cursor** se continúa justo después del último documento visto.\n\n"
+)
+_CODE = '```python\ndef f(x):\n    return {"x": x, "ok": True}\n```\n\n'
+
+
+def make_posts(count: int, content_kb: float):
+    """Posts con ``content_kb`` KB de markdown (texto y bloques de código)."""
+    block = _PARAGRAPH + _CODE
+    content = "# Título\n\n" + block * max(1, int(content_kb * 1024 / len(block)))
+    start = datetime(2025, 9, 21, 10, 0, 0)
+
+    return [
+        Post(
+            id=f"post{i:05d}abcdefghij",
+            title=f"Cómo paginar en Firestore, parte {i}",
+            content=content,
+            created_at=start + timedelta(minutes=i),
+            updated_at=start + timedelta(minutes=i, seconds=30),
+            user_id=f"user{i % 7:05d}",
+            username=f"usuario{i % 7}",
+        )
+        for i in range(count)
+    ]
+
+
+def cases(items: int, content_kb: float) -> Dict[str, tuple]:
+    """nombre -> (función, posts por llamada)."""
+    app = Flask("bench")
+    app.json = json_provider.JSONProvider(app)
+    posts = make_posts(items, content_kb)
+    post = posts[0]
+    post_json = post.to_json()
+    list_json = [p.to_json() for p in posts]
+    # el Accept de helpers.http_client con WIRE_FORMAT=msgpack
+    accept_msgpack = (
+        f"{client_json.MSGPACK_MIMETYPE}, {client_json.JSON_MIMETYPE};q=0.9"
+    )
+
+    with app.app_context():
+        body = ApiRes.success("Posts obtenidas", data=posts).flask_response()[0]
+        body = body.get_data()
+
+    def jsonify_list():
+        with app.app_context():
+            ApiRes.success("Posts obtenidas", data=posts).flask_response()[0].get_data()
+
+    def round_trip(accept: str = "application/json", summary: bool = False):
+        # microservicio -> bytes -> monolito, con el Accept de WIRE_FORMAT
+        with app.test_request_context(headers={"Accept": accept}):
+            data = posts
+
+            if summary:
+                data = [wire.summarize_post(p.to_json()) for p in posts]
+
+            sent = ApiRes.success("Posts obtenidas", data=data).flask_response()[0]
+
+        received = requests.Response()
+        received.headers["Content-Type"] = sent.content_type
+        received._content = sent.get_data()
+        data = client_json.response_json(received)["data"]
+
+        return [PostDto.from_json(p) for p in data]
+
+    return {
+        "Post.to_json": (post.to_json, 1),
+        "Post.from_json": (lambda: Post.from_json(post_json), 1),
+        "PostDto.from_json": (lambda: PostDto.from_json(post_json), 1),
+        "ApiRes.to_json[lista]": (
+            lambda: ApiRes.success("Posts obtenidas", data=posts).to_json(),
+            items,
+        ),
+        "jsonify[lista]": (jsonify_list, items),
+        "loads[lista]": (lambda: client_json.loads(body), items),
+        "PostDto.from_json[lista]": (
+            lambda: [PostDto.from_json(p) for p in list_json],
+            items,
+        ),
+        "ida y vuelta[lista]": (round_trip, items),
+        "ida y vuelta msgpack[lista]": (lambda: round_trip(accept_msgpack), items),
+        "ida y vuelta resumen[lista]": (lambda: round_trip(summary=True), items),
+        "ida y vuelta msgpack resumen[lista]": (
+            lambda: round_trip(accept_msgpack, summary=True),
+            items,
+        ),
+    }
+
+
+def measure(fn: Callable, per_call: int, number: int, repeat: int) -> dict:
+    best = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+    fn()  # lo que se asigna una sola vez (cachés, imports) no cuenta
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(1 / best, 1),
+        "us_per_item": round(best / per_call * 1e6, 3),
+        "alloc_bytes_per_item": round(peak / per_call),
+    }
+
+
+def check(results: dict, baseline: dict, tolerance: float) -> list:
+    """Casos más lentos o que asignan más que la línea base (con ``tolerance``)."""
+    failures = []
+
+    for name, base in baseline["results"].items():
+        current = results.get(name)
+
+        if current is None:
+            continue
+
+        if current["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            failures.append(
+                f"{name}: {current['ops_per_sec']} ops/s "
+                f"(línea base {base['ops_per_sec']})"
+            )
+
+        if current["alloc_bytes_per_item"] > base["alloc_bytes_per_item"] * (
+            1 + tolerance
+        ):
+            failures.append(
+                f"{name}: {current['alloc_bytes_per_item']} B/post "
+                f"(línea base {base['alloc_bytes_per_item']})"
+            )
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=25, help="posts por página")
+    parser.add_argument("--content-kb", type=float, default=4, help="KB por post")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", metavar="ARCHIVO")
+    parser.add_argument("--check", metavar="ARCHIVO")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {
+        name: measure(fn, per_call, args.number, args.repeat)
+        for name, (fn, per_call) in cases(args.items, args.content_kb).items()
+    }
+
+    print(f"{args.items} posts de {args.content_kb} KB, mejor de {args.repeat}")
+    print(f"{'caso':<36} {'ops/s':>12} {'µs/post':>10} {'B/post':>10}")
+
+    for name, r in results.items():
+        print(
+            f"{name:<36} {r['ops_per_sec']:>12.1f} {r['us_per_item']:>10.3f} "
+            f"{r['alloc_bytes_per_item']:>10}"
+        )
+
+    report = {
+        "params": {"items": args.items, "content_kb": args.content_kb},
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        if baseline["params"] != report["params"]:
+            print("Aviso: la línea base usa otros parámetros", baseline["params"])
+
+        failures = check(results, baseline, args.tolerance)
+
+        for failure in failures:
+            print("REGRESIÓN", failure)
+
+        if failures:
+            sys.exit(1)
+
+        print("Sin regresiones respecto de", args.check)
+
+
+if __name__ == "__main__":
+    main()
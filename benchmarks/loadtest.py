@@ -0,0 +1,603 @@
+"""
+Load test de punta a punta del monolito y los microservicios.
+
+Levanta los microservicios de post, user y comments y el monolito como
+subprocesos locales, con almacenamiento en memoria (o SQLite) en lugar de
+Firestore, carga un dataset y lanza una mezcla de lecturas y escrituras a una
+tasa objetivo:
+
+- index: ``GET /``
+- post: ``GET /post/<id>``
+- comment: ``POST /post/<id>/comment``
+- profile: ``GET /u/<username>``
+
+Las peticiones se programan a intervalos fijos (carga abierta): la latencia se
+mide desde el momento en que la petición debía salir, así un servidor saturado
+no esconde su cola. Por ruta se reporta p50/p95/p99, throughput, errores y las
+llamadas a microservicios por petición (cabecera ``X-Upstream-Calls`` que el
+monolito agrega con UPSTREAM_CALLS_HEADER=true). Una redirección cuenta como
+error si deja un mensaje flash de error (p. ej. "Error al agregar el
+comentario"). El resultado se guarda en JSON
+para comparar corridas.
+
+Uso:
+    python benchmarks/loadtest.py --rps 50 --duration 30 --out run.json
+    python benchmarks/loadtest.py --mix index=6,post=3,comment=1 --users 50
+    python benchmarks/loadtest.py --compare base.json run.json
+
+Los números absolutos dependen de la máquina: comparar corridas hechas en la
+misma, con los mismos parámetros y la misma ``--seed``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from flask import Flask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nombre -> directorio del servicio
+SERVICES = {
+    "user": os.path.join(ROOT, "microservices", "user"),
+    "post": os.path.join(ROOT, "microservices", "post"),
+    "comments": os.path.join(ROOT, "microservices", "comments-service"),
+}
+
+_BOOT_SERVICE = (
+    "import sys; from app import create_app; "
+    "create_app().run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)"
+)
+_BOOT_MONOLITH = (
+    "import sys; from app import app; "
+    "app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)"
+)
+
+_POST_CONTENT = """
+Un post de prueba con *énfasis*, una lista y código:
+
+- uno
+- dos
+
+```python
+def hola(nombre):
+    return f"hola {nombre}"
+```
+"""
+
+DEFAULT_MIX = "index=40,post=40,comment=10,profile=10"
+
+
+# =============================
+# PROCESOS
+# =============================
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El proceso terminó antes de responder en {url}")
+
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+
+        time.sleep(0.2)
+
+    raise TimeoutError(f"Sin respuesta de {url}")
+
+
+class Stack:
+    """
+    Monolito y microservicios en subprocesos, con almacenamiento local.
+
+    Parameters:
+        storage (str): memory | sqlite (STORAGE_ENGINE de los microservicios).
+        secret_key (str): SECRET_KEY del monolito, para firmar la cookie de sesión.
+        log_dir (str): Directorio de los logs de cada proceso.
+    """
+
+    def __init__(self, storage: str, secret_key: str, log_dir: str):
+        self.storage = storage
+        self.secret_key = secret_key
+        self.log_dir = log_dir
+        self.urls: Dict[str, str] = {}
+        self._processes: List[subprocess.Popen] = []
+
+    def _start(self, name: str, cwd: str, boot: str, env: dict, ready_path: str):
+        port = free_port()
+        log = open(os.path.join(self.log_dir, f"{name}.log"), "w")
+        process = subprocess.Popen(
+            [sys.executable, "-c", boot, str(port)],
+            cwd=cwd,
+            env={**os.environ, **env},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        self._processes.append(process)
+        url = f"http://127.0.0.1:{port}"
+        wait_ready(url + ready_path, process)
+        self.urls[name] = url
+
+    def start(self):
+        for name, cwd in SERVICES.items():
+            env = {
+                "STORAGE_ENGINE": self.storage,
+                "STORAGE_SQLITE_PATH": os.path.join(self.log_dir, f"{name}.sqlite3"),
+            }
+            self._start(name, cwd, _BOOT_SERVICE, env, "/live")
+
+        env = {
+            "USER_SECRET_KEY": self.secret_key,
+            "USER_SERVICE_URL": self.urls["user"],
+            "POST_SERVICE_URL": self.urls["post"],
+            "COMMENTS_BASE": self.urls["comments"] + "/v1",
+            "UPSTREAM_CALLS_HEADER": "true",
+        }
+        self._start("monolith", ROOT, _BOOT_MONOLITH, env, "/live")
+
+    def stop(self):
+        for process in self._processes:
+            process.terminate()
+
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def __enter__(self):
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _session_serializer(secret_key: str):
+    app = Flask("loadtest")
+    app.secret_key = secret_key
+    return app.session_interface.get_signing_serializer(app)
+
+
+def session_cookie(secret_key: str, user_id: str, username: str) -> str:
+    """Cookie de sesión del monolito para ``user``, sin pasar por Firebase."""
+    serializer = _session_serializer(secret_key)
+    return serializer.dumps({"user_id": user_id, "username": username})
+
+
+def flashed_categories(secret_key: str, cookie: Optional[str]) -> List[str]:
+    """Categorías de los mensajes flash que el monolito dejó en la sesión."""
+    if not cookie:
+        return []
+
+    try:
+        session = _session_serializer(secret_key).loads(cookie)
+    except Exception:
+        return []
+
+    return [category for category, _ in session.get("_flashes", [])]
+
+
+# =============================
+# DATASET
+# =============================
+
+
+@dataclass
+class Dataset:
+    users: List[Tuple[str, str]] = field(default_factory=list)
+    post_ids: List[str] = field(default_factory=list)
+    comments: int = 0
+
+
+def seed(
+    urls: Dict[str, str],
+    users: int,
+    posts_per_user: int,
+    comments_per_post: int,
+    rng: random.Random,
+    workers: int = 16,
+) -> Dataset:
+    """Crear usuarios, posts y comentarios directo en los microservicios."""
+    dataset = Dataset(users=[(f"u{i:05d}", f"user{i:05d}") for i in range(users)])
+    http = requests.Session()
+
+    def create_user(user):
+        user_id, username = user
+        http.post(
+            f"{urls['user']}/u/new", json={"id": user_id, "username": username}
+        ).raise_for_status()
+
+    def create_post(args):
+        (user_id, username), n = args
+        res = http.post(
+            f"{urls['post']}/post/new",
+            json={
+                "title": f"Post {n} de {username}",
+                "content": _POST_CONTENT,
+                "username": username,
+            },
+            headers={"X-User-ID": user_id},
+        )
+        res.raise_for_status()
+        return res.json()["data"]["id"]
+
+    def create_comment(args):
+        post_id, (user_id, username), n = args
+        res = http.post(
+            f"{urls['comments']}/v1/comments",
+            json={
+                "post_id": post_id,
+                "content": f"Comentario {n}",
+                "username": username,
+            },
+            headers={"X-User-Id": user_id},
+        )
+        res.raise_for_status()
+        return res.json()["id"]
+
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(create_user, dataset.users))
+        dataset.post_ids = list(
+            pool.map(
+                create_post,
+                [(user, n) for user in dataset.users for n in range(posts_per_user)],
+            )
+        )
+        dataset.comments = len(
+            list(
+                pool.map(
+                    create_comment,
+                    [
+                        (post_id, rng.choice(dataset.users), n)
+                        for post_id in dataset.post_ids
+                        for n in range(comments_per_post)
+                    ],
+                )
+            )
+        )
+
+    return dataset
+
+
+# =============================
+# CARGA
+# =============================
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+
+    unknown = set(weights) - {"index", "post", "comment", "profile"}
+
+    if unknown:
+        raise ValueError(f"Rutas desconocidas en --mix: {', '.join(sorted(unknown))}")
+
+    return weights
+
+
+def next_request(route: str, dataset: Dataset, rng: random.Random) -> tuple:
+    """(método, path, form) de una petición de ``route``."""
+    if route == "index":
+        return "GET", "/", None
+
+    if route == "post":
+        return "GET", f"/post/{rng.choice(dataset.post_ids)}", None
+
+    if route == "comment":
+        content = f"Comentario de carga {rng.random():.6f}"
+        return (
+            "POST",
+            f"/post/{rng.choice(dataset.post_ids)}/comment",
+            {"content": content},
+        )
+
+    return "GET", f"/u/{rng.choice(dataset.users)[1]}", None
+
+
+def parse_upstream_calls(header: Optional[str]) -> Dict[str, int]:
+    calls = {}
+
+    for part in (header or "").split(","):
+        name, _, count = part.partition("=")
+
+        if name and count.isdigit():
+            calls[name] = int(count)
+
+    return calls
+
+
+@dataclass
+class Sample:
+    route: str
+    latency: float
+    service_time: float
+    status: int
+    upstream: Dict[str, int]
+    ok: bool
+
+
+def is_ok(response: requests.Response, secret_key: str) -> bool:
+    """2xx, o una redirección que no dejó un mensaje flash de error."""
+    if 200 <= response.status_code < 300:
+        return True
+
+    if 300 <= response.status_code < 400:
+        categories = flashed_categories(secret_key, response.cookies.get("session"))
+        return "danger" not in categories
+
+    return False
+
+
+def run_load(
+    base_url: str,
+    secret_key: str,
+    cookies: Dict[str, str],
+    dataset: Dataset,
+    mix: Dict[str, float],
+    rps: float,
+    duration: float,
+    concurrency: int,
+    rng: random.Random,
+) -> Tuple[List[Sample], float]:
+    """
+    Lanzar ``rps`` peticiones por segundo durante ``duration`` segundos.
+
+    Returns:
+        (muestras, segundos transcurridos)
+    """
+    routes, weights = zip(*mix.items())
+    local = threading.local()
+    samples: List[Sample] = []
+    samples_lock = threading.Lock()
+
+    def send(route, method, path, form, scheduled):
+        http = getattr(local, "http", None)
+
+        if http is None:
+            http = local.http = requests.Session()
+
+        start = time.perf_counter()
+
+        try:
+            res = http.request(
+                method,
+                base_url + path,
+                data=form,
+                cookies=cookies,
+                allow_redirects=False,
+                timeout=30,
+            )
+            status, upstream = res.status_code, parse_upstream_calls(
+                res.headers.get("X-Upstream-Calls")
+            )
+            ok = is_ok(res, secret_key)
+        except requests.RequestException:
+            status, upstream, ok = 0, {}, False
+
+        end = time.perf_counter()
+        sample = Sample(route, end - scheduled, end - start, status, upstream, ok)
+
+        with samples_lock:
+            samples.append(sample)
+
+    total = int(rps * duration)
+    began = time.perf_counter()
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        for i in range(total):
+            scheduled = began + i / rps
+            delay = scheduled - time.perf_counter()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            route = rng.choices(routes, weights)[0]
+            pool.submit(send, route, *next_request(route, dataset, rng), scheduled)
+
+    return samples, time.perf_counter() - began
+
+
+# =============================
+# REPORTE
+# =============================
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentil ``p`` (0-100) por rango más cercano; 0 sin valores."""
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> dict:
+    def stats(group: List[Sample]) -> dict:
+        latencies = [s.latency * 1000 for s in group]
+        ok = [s for s in group if s.ok]
+        upstream: Dict[str, int] = {}
+
+        for sample in group:
+            for name, count in sample.upstream.items():
+                upstream[name] = upstream.get(name, 0) + count
+
+        return {
+            "requests": len(group),
+            "errors": len(group) - len(ok),
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies, default=0), 2),
+            "service_p50_ms": round(
+                percentile([s.service_time * 1000 for s in group], 50), 2
+            ),
+            "upstream_calls_per_request": {
+                name: round(count / len(group), 3)
+                for name, count in sorted(upstream.items())
+            },
+        }
+
+    routes = sorted({s.route for s in samples})
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "total": stats(samples),
+        "routes": {
+            route: stats([s for s in samples if s.route == route]) for route in routes
+        },
+    }
+
+
+def compare(base: dict, run: dict):
+    """Imprimir la diferencia de p95 y throughput por ruta entre dos corridas."""
+    print(
+        f"{'ruta':<10} {'p95 base':>10} {'p95':>10} {'Δ%':>8} {'rps base':>10} {'rps':>10}"
+    )
+
+    for route in ["total"] + sorted(run["results"]["routes"]):
+        a = (
+            base["results"]["total"]
+            if route == "total"
+            else base["results"]["routes"].get(route)
+        )
+        b = (
+            run["results"]["total"]
+            if route == "total"
+            else run["results"]["routes"][route]
+        )
+
+        if not a:
+            continue
+
+        change = (b["p95_ms"] - a["p95_ms"]) / a["p95_ms"] * 100 if a["p95_ms"] else 0
+        print(
+            f"{route:<10} {a['p95_ms']:>10.2f} {b['p95_ms']:>10.2f} {change:>+7.1f}% "
+            f"{a['throughput_rps']:>10.2f} {b['throughput_rps']:>10.2f}"
+        )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rps", type=float, default=20, help="peticiones por segundo")
+    parser.add_argument("--duration", type=float, default=20, help="segundos medidos")
+    parser.add_argument("--warmup", type=float, default=5, help="segundos descartados")
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="peticiones en vuelo"
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="ruta=peso,...")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--posts-per-user", type=int, default=5)
+    parser.add_argument("--comments-per-post", type=int, default=5)
+    parser.add_argument("--storage", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="archivo JSON del resultado (si no, stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "RUN"))
+    args = parser.parse_args()
+
+    if args.compare:
+        base, run = (json.load(open(path, encoding="utf-8")) for path in args.compare)
+        compare(base, run)
+        return
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    secret_key = secrets.token_hex(16)
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as log_dir:
+        with Stack(args.storage, secret_key, log_dir) as stack:
+            print("Cargando datos...", file=sys.stderr)
+            dataset = seed(
+                stack.urls, args.users, args.posts_per_user, args.comments_per_post, rng
+            )
+            user_id, username = dataset.users[0]
+            cookies = {"session": session_cookie(secret_key, user_id, username)}
+            load = dict(
+                base_url=stack.urls["monolith"],
+                secret_key=secret_key,
+                cookies=cookies,
+                dataset=dataset,
+                mix=mix,
+                rps=args.rps,
+                concurrency=args.concurrency,
+                rng=rng,
+            )
+
+            if args.warmup:
+                print("Calentando...", file=sys.stderr)
+                run_load(duration=args.warmup, **load)
+
+            print(f"Midiendo {args.duration}s a {args.rps} rps...", file=sys.stderr)
+            samples, elapsed = run_load(duration=args.duration, **load)
+
+    result = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {
+                k: v for k, v in vars(args).items() if k not in ("out", "compare")
+            },
+            "dataset": {
+                "users": len(dataset.users),
+                "posts": len(dataset.post_ids),
+                "comments": dataset.comments,
+            },
+        },
+        "results": summarize(samples, elapsed),
+    }
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Build de los archivos estáticos.
+
+Copia cada archivo de ``static/`` a ``static/dist/`` con el hash de su contenido
+en el nombre (``style.css`` -> ``style.<hash>.css``), agrega versiones
+precomprimidas ``.gz`` (y ``.br`` si brotli está instalado) de los archivos de
+texto y escribe ``static/dist/manifest.json`` con el nombre original -> nombre
+con hash. La app usa el manifiesto para generar las URLs (helpers.compression).
+
+Los CSS/JS no referencian otros estáticos locales por ruta relativa, así que se
+copian sin reescribir su contenido.
+
+Uso:
+    python build_static.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli es opcional
+    brotli = None
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+
+
+def _hashed_name(path: str, data: bytes) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def build(static_dir: str = STATIC_DIR, dist_dir: str = DIST_DIR) -> dict:
+    """
+    Returns:
+        dict: manifiesto (nombre original -> nombre con hash).
+    """
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != dist_dir]
+
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            rel_path = os.path.relpath(source, static_dir).replace(os.sep, "/")
+
+            with open(source, "rb") as f:
+                data = f.read()
+
+            hashed = _hashed_name(rel_path, data)
+            target = os.path.join(dist_dir, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            with open(target, "wb") as f:
+                f.write(data)
+
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                with open(target + ".gz", "wb") as f:
+                    f.write(gzip.compress(data, compresslevel=9))
+
+                if brotli is not None:
+                    with open(target + ".br", "wb") as f:
+                        f.write(brotli.compress(data, quality=11))
+
+            manifest[rel_path] = hashed
+
+    with open(os.path.join(dist_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    manifest = build()
+    print(f"{len(manifest)} archivos en {os.path.relpath(DIST_DIR, BASE_DIR)}")
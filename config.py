@@ -22,7 +22,107 @@ class Config:
         os.path.join(BASE_DIR, "firebase-admin.json"),
     )
 
+    # Pedir post y comentarios en paralelo en el detalle de una publicación
+    CONCURRENT_FETCH = os.environ.get("CONCURRENT_FETCH", "true").lower() == "true"
+
+    # Presupuesto total (segundos) de las llamadas a microservicios por petición
+    REQUEST_BUDGET_SECONDS = float(os.environ.get("REQUEST_BUDGET_SECONDS", 6))
+
+    # Bytes máximos de HTML de markdown ya renderizado por worker (0 la desactiva)
+    MARKDOWN_CACHE_MAX_BYTES = int(
+        os.environ.get("MARKDOWN_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+    )
+
+    # Cargar extensiones de markdown y lexers de Pygments al iniciar cada worker
+    MARKDOWN_WARM_UP = os.environ.get("MARKDOWN_WARM_UP", "true").lower() == "true"
+
+    # Caché de fragmentos de plantillas ({% cache %}) por worker
+    FRAGMENT_CACHE_TTL = float(os.environ.get("FRAGMENT_CACHE_TTL", 60))
+    FRAGMENT_CACHE_MAXSIZE = int(os.environ.get("FRAGMENT_CACHE_MAXSIZE", 512))
+
+    # Se incluye en los ETag de las páginas: cambiarlo en cada despliegue para que
+    # los navegadores no revaliden contra HTML de plantillas viejas
+    ETAG_VERSION = os.environ.get("ETAG_VERSION", "1")
+
+    # Compresión (brotli/gzip) de respuestas dinámicas de al menos N bytes
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 500))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+
+    # Cabecera X-Upstream-Calls (llamadas a microservicios por petición), para
+    # benchmarks/loadtest.py; no activarla en producción
+    UPSTREAM_CALLS_HEADER = (
+        os.environ.get("UPSTREAM_CALLS_HEADER", "false").lower() == "true"
+    )
+
 
 class ServicesConfig:
     USER_SERVICE_URL = os.environ.get("USER_SERVICE_URL", "http://localhost:5002")
     POST_SERVICE_URL = os.environ.get("POST_SERVICE_URL", "http://localhost:5003")
+    COMMENTS_BASE = os.environ.get("COMMENTS_BASE", "http://localhost:8091/v1")
+
+    # Timeouts (segundos) por microservicio
+    USER_SERVICE_TIMEOUT = float(os.environ.get("USER_SERVICE_TIMEOUT", 5))
+    POST_SERVICE_TIMEOUT = float(os.environ.get("POST_SERVICE_TIMEOUT", 5))
+    COMMENTS_SERVICE_TIMEOUT = float(os.environ.get("COMMENTS_SERVICE_TIMEOUT", 5))
+
+    # Pool de conexiones keep-alive por microservicio (por proceso/worker)
+    # - HTTP_POOL_CONNECTIONS: pools de host distintos que se mantienen en caché
+    # - HTTP_POOL_MAXSIZE: conexiones reutilizables por host
+    # - HTTP_POOL_BLOCK: esperar una conexión libre en vez de abrir una extra
+    HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 2))
+    HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+    HTTP_POOL_BLOCK = os.environ.get("HTTP_POOL_BLOCK", "false").lower() == "true"
+
+    # Circuit breaker por microservicio
+    # - se abre si en las últimas BREAKER_WINDOW llamadas (mínimo BREAKER_MIN_CALLS)
+    #   la tasa de errores o de llamadas lentas supera su umbral
+    # - abierto, falla de inmediato durante BREAKER_OPEN_SECONDS
+    BREAKER_WINDOW = int(os.environ.get("BREAKER_WINDOW", 20))
+    BREAKER_MIN_CALLS = int(os.environ.get("BREAKER_MIN_CALLS", 10))
+    BREAKER_ERROR_RATE = float(os.environ.get("BREAKER_ERROR_RATE", 0.5))
+    BREAKER_SLOW_CALL_SECONDS = float(os.environ.get("BREAKER_SLOW_CALL_SECONDS", 2))
+    BREAKER_SLOW_CALL_RATE = float(os.environ.get("BREAKER_SLOW_CALL_RATE", 0.5))
+    BREAKER_OPEN_SECONDS = float(os.environ.get("BREAKER_OPEN_SECONDS", 15))
+    BREAKER_HALF_OPEN_CALLS = int(os.environ.get("BREAKER_HALF_OPEN_CALLS", 1))
+
+    # Formato de las respuestas de los microservicios: "json" o "msgpack"
+    # (MessagePack si el microservicio y este proceso tienen msgpack instalado)
+    WIRE_FORMAT = os.environ.get("WIRE_FORMAT", "json").lower()
+
+    # Pedir el inicio y la búsqueda con el contenido recortado (dtos/wire.py)
+    FEED_SUMMARY_VIEW = os.environ.get("FEED_SUMMARY_VIEW", "true").lower() == "true"
+
+    # Hilos por worker para lanzar llamadas independientes en paralelo
+    FANOUT_MAX_WORKERS = int(os.environ.get("FANOUT_MAX_WORKERS", 8))
+
+    # Hedging (opcional) de lecturas al microservicio de Post
+    # - si no hay respuesta tras el percentil HEDGE_PERCENTILE de la latencia
+    #   reciente (mínimo HEDGE_MIN_DELAY s), se lanza un duplicado
+    # - como mucho HEDGE_MAX_EXTRA_RATIO de las llamadas se duplican
+    POST_HEDGING_ENABLED = (
+        os.environ.get("POST_HEDGING_ENABLED", "false").lower() == "true"
+    )
+    HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", 95))
+    HEDGE_MIN_DELAY = float(os.environ.get("HEDGE_MIN_DELAY", 0.05))
+    HEDGE_MAX_EXTRA_RATIO = float(os.environ.get("HEDGE_MAX_EXTRA_RATIO", 0.05))
+    HEDGE_MAX_WORKERS = int(os.environ.get("HEDGE_MAX_WORKERS", 16))
+
+    # Caché en memoria de posts (PostDto) por worker
+    POST_CACHE_MAXSIZE = int(os.environ.get("POST_CACHE_MAXSIZE", 1024))
+    POST_CACHE_TTL = float(os.environ.get("POST_CACHE_TTL", 30))
+
+    # Caché del inicio (stale-while-revalidate) por (límite, búsqueda)
+    # - FEED_CACHE_FRESH: segundos en que se sirve sin refrescar
+    # - FEED_CACHE_MAX_STALE: segundos extra en que se sirve viejo mientras se refresca
+    FEED_CACHE_FRESH = float(os.environ.get("FEED_CACHE_FRESH", 5))
+    FEED_CACHE_MAX_STALE = float(os.environ.get("FEED_CACHE_MAX_STALE", 60))
+    FEED_CACHE_MAXSIZE = int(os.environ.get("FEED_CACHE_MAXSIZE", 256))
+
+    # Caché en memoria de la cantidad de comentarios por post (inicio), por worker
+    COMMENT_COUNTS_CACHE_MAXSIZE = int(
+        os.environ.get("COMMENT_COUNTS_CACHE_MAXSIZE", 4096)
+    )
+    COMMENT_COUNTS_CACHE_TTL = float(os.environ.get("COMMENT_COUNTS_CACHE_TTL", 10))
+
+    # Comentarios por página en el detalle de un post ("cargar más")
+    COMMENTS_PAGE_SIZE = int(os.environ.get("COMMENTS_PAGE_SIZE", 20))
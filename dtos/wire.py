@@ -0,0 +1,39 @@
+"""
+Esquema de los posts entre el monolito y el microservicio de Post.
+
+El inicio (index.html) solo muestra los primeros 200 caracteres del contenido;
+con ``?view=summary`` el microservicio envía cada post con el contenido
+recortado en lugar del markdown completo. El formato (JSON o MessagePack) se
+negocia aparte, en json_provider.py, igual para los tres microservicios.
+
+Solo los posts tienen esquema aquí: usuarios y comentarios son pocos campos
+cortos, sin una vista reducida que compartir, y viajan tal como los envía
+``to_json`` de cada servicio.
+
+Este archivo es el mismo en el monolito (dtos/wire.py) y en el microservicio de
+Post (dtos/wire.py).
+"""
+
+# campos de cada post, en el orden de Post.to_json y PostDto
+POST_FIELDS = (
+    "id",
+    "title",
+    "content",
+    "created_at",
+    "updated_at",
+    "user_id",
+    "username",
+)
+
+VIEW_PARAM = "view"
+SUMMARY_VIEW = "summary"
+
+# un carácter más que el extracto, para que el inicio sepa si agregar "..."
+SUMMARY_CONTENT_CHARS = 201
+
+
+def summarize_post(post: dict) -> dict:
+    """Un post (``Post.to_json``) con el contenido recortado para el inicio."""
+    summary = {field: post[field] for field in POST_FIELDS}
+    summary["content"] = summary["content"][:SUMMARY_CONTENT_CHARS]
+    return summary
@@ -1 +1,2 @@
 from .auth_helpers import current_user, login_required
+from .http_client import get_client, pool_stats, upstream_calls
@@ -0,0 +1,441 @@
+"""
+Cachés en memoria del proceso (por worker).
+
+- TTLCache: tamaño acotado, expiración por entrada (TTL) y desalojo LRU.
+- SWRCache: stale-while-revalidate, responde con datos viejos mientras un
+  solo hilo en segundo plano los refresca.
+- SizedLRU: LRU acotada por bytes en lugar de por cantidad de entradas.
+- cache_stats() -> contadores de todas las cachés registradas.
+
+Cada worker tiene su propia copia: una escritura invalida la caché del worker
+que la atiende y el TTL acota lo desactualizadas que pueden estar las demás.
+
+Una carga que empezó antes de una escritura puede terminar después: quien carga
+toma ``generation()`` antes de llamar al microservicio y lo pasa al guardar
+(``set(..., since=)``); si la llave se escribió o invalidó entretanto, el valor
+viejo no se guarda.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from helpers.concurrency import get_executor
+from log import logger
+
+_registry: Dict[str, Any] = {}
+
+
+class _Generations:
+    """
+    Generación de la última escritura o invalidación de cada llave.
+
+    Recuerda como máximo ``maxsize`` llaves; al olvidar una, ``floor`` sube a
+    su generación: se descartan cargas de más, nunca de menos. No es seguro
+    entre hilos por sí mismo, se usa bajo el lock de la caché.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(maxsize, 1)
+        self.current = 0
+        self.floor = 0
+        self._changed: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    def bump(self, key: Hashable):
+        self.current += 1
+        self._changed[key] = self.current
+        self._changed.move_to_end(key)
+
+        while len(self._changed) > self.maxsize:
+            _, generation = self._changed.popitem(last=False)
+            self.floor = max(self.floor, generation)
+
+    def bump_all(self):
+        self.current += 1
+        self.floor = self.current
+        self._changed.clear()
+
+    def outdated(self, key: Hashable, since: int) -> bool:
+        """Si ``key`` cambió después de la generación ``since``."""
+        return since < self.floor or since < self._changed.get(key, 0)
+
+
+class TTLCache:
+    """
+    Caché LRU con expiración por entrada.
+
+    Parameters:
+        name (str): Nombre con el que se exponen sus estadísticas.
+        maxsize (int): Máximo de entradas; al superarlo se desaloja la menos usada.
+        ttl (float): Segundos que vive cada entrada. 0 desactiva la caché.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, clock=time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._generations = _Generations(maxsize)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.outdated = 0
+
+        _registry[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        """Tomarla antes de cargar un valor y pasarla a ``set(..., since=)``."""
+        with self._lock:
+            return self._generations.current
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        since: Optional[int] = None,
+    ):
+        """
+        Guardar ``value``. Sin ``since`` es una escritura; con ``since`` es el
+        resultado de una carga y se descarta si ``key`` cambió mientras tanto.
+        """
+        if not self.enabled:
+            return
+
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            if since is None:
+                self._generations.bump(key)
+            elif self._generations.outdated(key, since):
+                self.outdated += 1
+                return
+
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+            self._generations.bump(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generations.bump_all()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "outdated": self.outdated,
+            }
+
+
+class SWRCache:
+    """
+    Caché stale-while-revalidate.
+
+    Parameters:
+        name (str): Nombre con el que se exponen sus estadísticas.
+        fresh_for (float): Segundos en que una entrada se sirve sin refrescar.
+        max_stale (float): Segundos adicionales en que una entrada vieja aún se
+            sirve mientras se refresca en segundo plano. Pasado ese tiempo se
+            carga de forma síncrona.
+        maxsize (int): Máximo de entradas (desalojo LRU).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fresh_for: float,
+        max_stale: float,
+        maxsize: int,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.fresh_for = fresh_for
+        self.max_stale = max_stale
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._refreshing = set()
+        self._generations = _Generations(maxsize)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.outdated = 0
+
+        _registry[name] = self
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Obtener ``key`` de la caché o cargarla con ``loader()``.
+
+        Un resultado None de ``loader`` se considera un error y no se guarda.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            stale = refresh = False
+            # lo que se escriba desde aquí gana sobre esta carga
+            since = self._generations.current
+
+            if entry is not None:
+                stored_at, value = entry
+                age = self._clock() - stored_at
+
+                if age < self.fresh_for:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+                if age < self.fresh_for + self.max_stale:
+                    self._data.move_to_end(key)
+                    self.stale_hits += 1
+                    stale = True
+                    # un solo refresco en curso por llave
+                    refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+
+            if not stale:
+                self.misses += 1
+
+        if stale:
+            if refresh:
+                get_executor("background").submit(self._refresh, key, loader, since)
+
+            return value
+
+        value = loader()
+        self._store(key, value, since)
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], since: int):
+        try:
+            value = loader()
+
+            with self._lock:
+                self.refreshes += 1
+
+                if value is None:
+                    self.refresh_errors += 1
+
+            self._store(key, value, since)
+        except Exception as e:
+            logger.error(f"======== Error refrescando {self.name} ========\n{e}\n")
+
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: Hashable, value: Any, since: int):
+        if value is None:
+            return
+
+        with self._lock:
+            if self._generations.outdated(key, since):
+                # la carga empezó antes de un ``clear``: no pisar con lo viejo
+                self.outdated += 1
+                return
+
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Descartar todas las entradas (p. ej. tras una escritura): la próxima
+        lectura carga de forma síncrona en lugar de recibir la copia vieja.
+        """
+        with self._lock:
+            self._data.clear()
+            self._generations.bump_all()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "fresh_for": self.fresh_for,
+                "max_stale": self.max_stale,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "outdated": self.outdated,
+            }
+
+
+class SizedLRU:
+    """
+    Caché LRU acotada por el tamaño total (en bytes) de sus valores.
+
+    Parameters:
+        name (str): Nombre con el que se exponen sus estadísticas.
+        maxbytes (int): Bytes máximos; al superarlos se desalojan las menos usadas.
+            0 desactiva la caché.
+        sizeof (Callable[[Any], int]): Tamaño en bytes de un valor (por defecto
+            la longitud en UTF-8 de un str).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxbytes: int,
+        sizeof: Callable[[Any], int] = lambda value: len(value.encode("utf-8")),
+    ):
+        self.name = name
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple[int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        size = self.sizeof(value)
+
+        with self._lock:
+            old = self._data.pop(key, None)
+
+            if old is not None:
+                self._bytes -= old[0]
+
+            if size > self.maxbytes:
+                # no cabe: guardarlo desalojaría todo lo demás
+                self.rejected += 1
+                return
+
+            self._data[key] = (size, value)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.maxbytes:
+            _, (evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def resize(self, maxbytes: int):
+        """Cambiar el límite; si baja se desalojan las menos usadas."""
+        with self._lock:
+            self.maxbytes = maxbytes
+            self._evict()
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Obtener ``key`` o calcularla con ``factory()`` y guardarla."""
+        value = self.get(key)
+
+        if value is None:
+            value = factory()
+            self.set(key, value)
+
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            old = self._data.pop(key, None)
+
+            if old is not None:
+                self._bytes -= old[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "bytes": self._bytes,
+                "maxbytes": self.maxbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+            }
+
+
+def cache_stats() -> dict:
+    """Estadísticas de las cachés del proceso actual."""
+    return {name: cache.stats() for name, cache in list(_registry.items())}
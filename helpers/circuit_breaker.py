@@ -0,0 +1,180 @@
+"""
+Circuit breaker por microservicio.
+
+- closed: las llamadas pasan; se registra el resultado en una ventana móvil.
+- open: las llamadas fallan de inmediato con CircuitOpenError, sin tocar la red,
+  y los servicios caen a su respuesta por defecto (None / lista vacía).
+- half_open: pasado ``open_seconds`` se dejan pasar unas pocas llamadas de
+  prueba; si salen bien se cierra, si no se vuelve a abrir.
+
+Se abre cuando, con al menos ``min_calls`` en la ventana, la tasa de errores o
+la tasa de llamadas lentas supera su umbral.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_registry: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(Exception):
+    """El circuito del microservicio está abierto: no se hace la llamada."""
+
+
+class CircuitBreaker:
+    """
+    Parameters:
+        name (str): Nombre del microservicio.
+        window (int): Cantidad de llamadas recientes que se evalúan.
+        min_calls (int): Llamadas mínimas en la ventana antes de poder abrir.
+        error_rate (float): Tasa de errores (0-1) que abre el circuito.
+        slow_call_seconds (float): Latencia a partir de la cual una llamada es lenta.
+        slow_call_rate (float): Tasa de llamadas lentas (0-1) que abre el circuito.
+        open_seconds (float): Tiempo abierto antes de pasar a half_open.
+        half_open_calls (int): Llamadas de prueba exitosas necesarias para cerrar.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 10,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 2.0,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 15.0,
+        half_open_calls: int = 1,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # (falló, lenta) por llamada
+        self._window = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.short_circuited = 0
+        self.times_opened = 0
+
+        _registry[name] = self
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+
+        return self._state
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+
+    def allow_request(self) -> bool:
+        """Indica si la llamada puede hacerse; en half_open reserva una prueba."""
+        with self._lock:
+            state = self._current_state()
+
+            if state == CLOSED:
+                return True
+
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_calls:
+                self._probes_in_flight += 1
+                return True
+
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, latency: float):
+        self._record(failed=False, slow=latency >= self.slow_call_seconds)
+
+    def record_failure(self, latency: float):
+        self._record(failed=True, slow=latency >= self.slow_call_seconds)
+
+    def release(self):
+        """Liberar una llamada permitida cuyo resultado no se debe contar."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def _record(self, failed: bool, slow: bool):
+        with self._lock:
+            state = self._current_state()
+
+            if state == HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+                if failed or slow:
+                    self._open()
+                    return
+
+                self._probe_successes += 1
+
+                if self._probe_successes >= self.half_open_calls:
+                    self._state = CLOSED
+                    self._window.clear()
+
+                return
+
+            if state == OPEN:
+                # respuesta tardía de una llamada hecha antes de abrir
+                return
+
+            self._window.append((failed, slow))
+            calls = len(self._window)
+
+            if calls < self.min_calls:
+                return
+
+            failures = sum(1 for f, _ in self._window if f)
+            slow_calls = sum(1 for _, s in self._window if s)
+
+            if (
+                failures / calls >= self.error_rate
+                or slow_calls / calls >= self.slow_call_rate
+            ):
+                self._open()
+                self._window.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._window)
+            failures = sum(1 for f, _ in self._window if f)
+            slow_calls = sum(1 for _, s in self._window if s)
+
+            return {
+                "state": state,
+                "window_calls": calls,
+                "error_rate": round(failures / calls, 4) if calls else 0.0,
+                "slow_call_rate": round(slow_calls / calls, 4) if calls else 0.0,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+            }
+
+
+def breaker_stats() -> dict:
+    """Estado de los circuit breakers del proceso actual."""
+    return {name: breaker.stats() for name, breaker in list(_registry.items())}
@@ -0,0 +1,137 @@
+"""
+Compresión de respuestas y archivos estáticos con huella (fingerprint).
+
+- Respuestas dinámicas (HTML, JSON, ...) de al menos COMPRESS_MIN_SIZE bytes se
+  comprimen con brotli (si está instalado y el cliente lo acepta) o gzip.
+- ``build_static.py`` copia cada archivo de ``static/`` a ``static/dist/`` con
+  el hash de su contenido en el nombre, con sus versiones ``.br``/``.gz``, y
+  escribe ``manifest.json``. Con el manifiesto presente,
+  ``url_for('static', filename='style.css')`` genera
+  ``/static/dist/style.<hash>.css``, que se sirve precomprimido y con caché
+  inmutable (el nombre cambia cuando cambia el contenido).
+- Sin manifiesto (desarrollo) los estáticos se sirven como siempre.
+"""
+
+import gzip
+import json
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from flask import Flask, Response, request, send_from_directory
+
+from log import logger
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli es opcional
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+# extensión del archivo precomprimido por encoding, en orden de preferencia
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encoding(available=("br", "gzip")) -> Optional[str]:
+    """Mejor encoding de ``available`` que acepta el cliente, o None."""
+    for encoding in available:
+        if encoding == "br" and brotli is None:
+            continue
+
+        if request.accept_encodings[encoding]:
+            return encoding
+
+    return None
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+
+    return gzip.compress(data, compresslevel=level)
+
+
+def load_manifest(path: str) -> Dict[str, str]:
+    """Nombre original -> nombre con hash (vacío si no hay build)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"======== Error leyendo {path} ========\n{e}\n")
+        return {}
+
+
+def init_compression(app: Flask):
+    """Registrar la compresión y los estáticos con huella en ``app``."""
+    min_size = app.config.get("COMPRESS_MIN_SIZE", 500)
+    level = app.config.get("COMPRESS_LEVEL", 6)
+    dist_folder = os.path.join(app.static_folder, "dist")
+    manifest = load_manifest(os.path.join(dist_folder, "manifest.json"))
+
+    @app.url_defaults
+    def fingerprint_static(endpoint, values):
+        if endpoint == "static" and values.get("filename") in manifest:
+            values["filename"] = "dist/" + manifest[values["filename"]]
+
+    @app.get("/static/dist/<path:filename>")
+    def static_dist(filename: str):
+        # la regla es más específica que /static/<path:filename>: tiene prioridad
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = None
+
+        for encoding, suffix in _PRECOMPRESSED:
+            if accepted_encoding((encoding,)) and os.path.exists(
+                os.path.join(dist_folder, filename + suffix)
+            ):
+                response = send_from_directory(
+                    dist_folder, filename + suffix, mimetype=mimetype
+                )
+                response.headers["Content-Encoding"] = encoding
+                break
+
+        if response is None:
+            response = send_from_directory(dist_folder, filename, mimetype=mimetype)
+
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE
+        response.vary.add("Accept-Encoding")
+        return response
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return response
+
+        data = response.get_data()
+
+        if len(data) < min_size:
+            return response
+
+        encoding = accepted_encoding()
+        response.vary.add("Accept-Encoding")
+
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding, level))
+        response.headers["Content-Encoding"] = encoding
+        return response
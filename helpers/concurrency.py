@@ -0,0 +1,73 @@
+"""
+Ejecución concurrente de llamadas a los microservicios.
+
+Pools de hilos acotados (uno por nombre y por proceso/worker) para lanzar en
+paralelo llamadas independientes de una misma petición. Las tareas enviadas con
+``submit`` dentro de una petición corren con una copia del request context
+(sesión, ``current_user``) y con los mismos atributos de ``flask.g``.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from flask import copy_current_request_context, g, has_request_context
+
+from config import ServicesConfig
+
+# hilos por pool; los pools sin entrada usan FANOUT_MAX_WORKERS
+POOL_SIZES = {
+    "fanout": ServicesConfig.FANOUT_MAX_WORKERS,
+    "hedge": ServicesConfig.HEDGE_MAX_WORKERS,
+    "background": 2,
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_pid: Optional[int] = None
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str = "fanout") -> ThreadPoolExecutor:
+    """Pool de hilos acotado para el proceso actual."""
+    global _executors_pid
+
+    pid = os.getpid()
+
+    with _executors_lock:
+        if _executors_pid != pid:
+            # los hilos no sobreviven a un fork: pools nuevos en el hijo
+            _executors.clear()
+            _executors_pid = pid
+
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(
+                max_workers=POOL_SIZES.get(name, ServicesConfig.FANOUT_MAX_WORKERS),
+                thread_name_prefix=name,
+            )
+
+        return _executors[name]
+
+
+def submit(fn, *args, executor: str = "fanout", **kwargs) -> Future:
+    """
+    Ejecutar ``fn(*args, **kwargs)`` en un pool de hilos.
+
+    Returns:
+        Future: resultado (o excepción) de la llamada.
+    """
+    pool = get_executor(executor)
+
+    if not has_request_context():
+        return pool.submit(fn, *args, **kwargs)
+
+    parent_g = dict(vars(g._get_current_object()))
+
+    @copy_current_request_context
+    def run():
+        for key, value in parent_g.items():
+            setattr(g, key, value)
+
+        return fn(*args, **kwargs)
+
+    return pool.submit(run)
@@ -0,0 +1,47 @@
+"""
+Presupuesto de tiempo (deadline) por petición.
+
+Al iniciar cada petición se fija un deadline en ``flask.g``. Cada llamada a un
+microservicio usa como timeout solo el tiempo que queda, y reenvía el deadline
+en la cabecera ``X-Request-Deadline`` (epoch en milisegundos) para que el
+microservicio descarte trabajo que ya llega tarde.
+"""
+
+import time
+from typing import Optional
+
+from flask import current_app, g, has_app_context
+
+DEADLINE_HEADER = "X-Request-Deadline"
+
+_DEADLINE_ATTR = "_deadline"
+
+
+class DeadlineExceeded(Exception):
+    """Se agotó el presupuesto de la petición: no se hace la llamada."""
+
+
+def start_request_deadline():
+    """Fijar el deadline de la petición actual (before_request)."""
+    budget = current_app.config.get("REQUEST_BUDGET_SECONDS")
+
+    if budget:
+        setattr(g, _DEADLINE_ATTR, time.time() + float(budget))
+
+
+def get_deadline() -> Optional[float]:
+    """Deadline (epoch en segundos) de la petición actual, o None."""
+    if not has_app_context():
+        return None
+
+    return getattr(g, _DEADLINE_ATTR, None)
+
+
+def remaining_budget() -> Optional[float]:
+    """Segundos que le quedan a la petición actual, o None si no tiene deadline."""
+    deadline = get_deadline()
+    return None if deadline is None else deadline - time.time()
+
+
+def deadline_header_value(deadline: float) -> str:
+    return str(int(deadline * 1000))
@@ -0,0 +1,84 @@
+"""
+Caché de fragmentos de plantillas Jinja.
+
+    {% cache fragment_key("index", posts, comment_counts), 60 %}
+        ... HTML que solo depende de los posts ...
+    {% endcache %}
+
+El bloque se renderiza una vez por llave y se reutiliza durante ``ttl``
+segundos (o FRAGMENT_CACHE_TTL si se omite). Una llave None desactiva la
+caché para ese render. Lo que depende del usuario debe quedar fuera del bloque.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from config import Config
+from helpers.cache import TTLCache
+
+_fragments = TTLCache(
+    "fragments",
+    maxsize=Config.FRAGMENT_CACHE_MAXSIZE,
+    ttl=Config.FRAGMENT_CACHE_TTL,
+)
+
+
+def _version(item: Any) -> str:
+    updated_at = getattr(item, "updated_at", None)
+
+    if isinstance(updated_at, datetime):
+        updated_at = updated_at.isoformat()
+
+    return f"{getattr(item, 'id', item)}@{updated_at}"
+
+
+def fragment_key(name: str, items: Iterable[Any], *extra: Any) -> str:
+    """
+    Llave de un fragmento a partir de los ids y ``updated_at`` de ``items``.
+
+    ``extra`` agrega otros datos que cambian el HTML (p. ej. los contadores de
+    comentarios).
+    """
+    parts = [_version(item) for item in items]
+
+    for value in extra:
+        parts.append(repr(sorted(value.items()) if isinstance(value, dict) else value))
+
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return f"{name}:{digest}"
+
+
+class FragmentCacheExtension(Extension):
+    """Etiqueta ``{% cache llave[, ttl] %} ... {% endcache %}``."""
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+
+        if parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_render", args), [], [], body
+        ).set_lineno(lineno)
+
+    def _render(self, key: Optional[str], ttl: Optional[float], caller) -> str:
+        if key is None:
+            return caller()
+
+        html = _fragments.get(key)
+
+        if html is None:
+            html = caller()
+            _fragments.set(key, html, ttl)
+
+        return html
@@ -0,0 +1,135 @@
+"""
+Hedged requests para lecturas idempotentes.
+
+Se lanza la llamada; si no responde dentro de un retraso basado en un percentil
+de las latencias recientes, se lanza un duplicado y se usa la primera respuesta
+exitosa. Un presupuesto limita los duplicados a una fracción de las llamadas.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict
+
+from helpers.concurrency import submit
+
+_registry: Dict[str, "Hedger"] = {}
+
+
+class Hedger:
+    """
+    Parameters:
+        name (str): Nombre con el que se exponen sus estadísticas.
+        percentile (float): Percentil (0-100) de la latencia usado como retraso.
+        min_delay (float): Retraso mínimo en segundos (y el usado sin historial).
+        max_extra_ratio (float): Máximo de duplicados / llamadas (ej. 0.05 = 5%).
+        window (int): Latencias recientes usadas para calcular el percentil.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 95,
+        min_delay: float = 0.05,
+        max_extra_ratio: float = 0.05,
+        window: int = 200,
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_extra_ratio = max_extra_ratio
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+        _registry[name] = self
+
+    def delay(self) -> float:
+        """Retraso antes de lanzar el duplicado."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        if not latencies:
+            return self.min_delay
+
+        index = min(int(len(latencies) * self.percentile / 100), len(latencies) - 1)
+        return max(latencies[index], self.min_delay)
+
+    def _record_latency(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.calls * self.max_extra_ratio:
+                self.budget_denied += 1
+                return False
+
+            self.hedged += 1
+            return True
+
+    def _timed(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        def run():
+            start = time.monotonic()
+
+            try:
+                return fn()
+            finally:
+                # también los fallos: un timeout lento debe subir el percentil
+                self._record_latency(time.monotonic() - start)
+
+        return run
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecutar ``fn`` con hedging. ``fn`` debe ser idempotente.
+
+        Si la primera respuesta en llegar falló, se espera la otra; si ambas
+        fallan se propaga la excepción de la original.
+        """
+        with self._lock:
+            self.calls += 1
+
+        primary = submit(self._timed(fn), executor="hedge")
+        done, _ = wait([primary], timeout=self.delay())
+
+        if done or not self._take_hedge():
+            return primary.result()
+
+        backup = submit(self._timed(fn), executor="hedge")
+        pending = {primary, backup}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+
+                    return future.result()
+
+        return primary.result()
+
+    def stats(self) -> dict:
+        delay = self.delay()
+
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "budget_denied": self.budget_denied,
+                "delay": round(delay, 4),
+            }
+
+
+def hedging_stats() -> dict:
+    """Estadísticas de hedging del proceso actual."""
+    return {name: hedger.stats() for name, hedger in list(_registry.items())}
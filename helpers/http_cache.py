@@ -0,0 +1,54 @@
+"""
+GET condicionales (ETag débil / 304).
+
+La vista calcula un ETag con lo que determina el HTML (versiones de los datos
+y el usuario) y, si coincide con ``If-None-Match``, responde 304 sin renderizar.
+
+    etag = compute_etag(post.id, post.updated_at, user_id)
+    if (response := not_modified(etag)) is not None:
+        return response
+    return with_etag(render_template(...), etag)
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from flask import Response, current_app, make_response, request, session
+
+# las páginas dependen de la sesión: el navegador revalida y no se comparte
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(*parts: Any) -> str:
+    """ETag a partir de las versiones de lo que se muestra."""
+    version = current_app.config.get("ETAG_VERSION", "")
+    raw = "|".join(repr(part) for part in (version, *parts))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _set_validators(response: Response, etag: str) -> Response:
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.vary.add("Cookie")
+    return response
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """
+    Respuesta 304 si el cliente ya tiene esta versión, o None.
+
+    Con mensajes flash pendientes siempre se renderiza: están en la sesión y
+    no en el ETag.
+    """
+    if session.get("_flashes"):
+        return None
+
+    if not request.if_none_match.contains_weak(etag):
+        return None
+
+    return _set_validators(Response(status=304), etag)
+
+
+def with_etag(rv, etag: str) -> Response:
+    """Agregar el ETag (débil) y Cache-Control a la respuesta de una vista."""
+    return _set_validators(make_response(rv), etag)
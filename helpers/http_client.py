@@ -0,0 +1,309 @@
+"""
+Cliente HTTP compartido para llamar a los microservicios.
+
+Cada microservicio (post, user, comments) tiene una ``requests.Session``
+persistente por proceso/worker, con su propio pool de conexiones keep-alive y
+su timeout por defecto. Así cada llamada reutiliza una conexión TCP abierta en
+lugar de abrir una nueva por request.
+
+Cada cliente pasa por el circuit breaker de su microservicio: con el circuito
+abierto la llamada falla de inmediato con CircuitOpenError. Dentro de una
+petición el timeout se recorta al presupuesto restante (helpers.deadline).
+
+- get_client(nombre) -> ServiceClient del microservicio
+- pool_stats() -> estadísticas de los pools (reutilizadas, nuevas, esperas)
+- upstream_calls() -> llamadas hechas por la petición actual, por microservicio
+
+Con ``WIRE_FORMAT=msgpack`` los clientes piden MessagePack en ``Accept`` (JSON
+como alternativa); helpers.json_provider.response_json lee ambos.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from flask import g, has_app_context
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import ServicesConfig
+from helpers.circuit_breaker import CircuitBreaker, CircuitOpenError
+from helpers.deadline import (
+    DEADLINE_HEADER,
+    DeadlineExceeded,
+    deadline_header_value,
+    get_deadline,
+)
+from helpers.json_provider import JSON_MIMETYPE, MSGPACK_MIMETYPE, msgpack
+
+# nombre -> (atributo de la URL base, atributo del timeout) en ServicesConfig
+UPSTREAMS = {
+    "post": ("POST_SERVICE_URL", "POST_SERVICE_TIMEOUT"),
+    "user": ("USER_SERVICE_URL", "USER_SERVICE_TIMEOUT"),
+    "comments": ("COMMENTS_BASE", "COMMENTS_SERVICE_TIMEOUT"),
+}
+
+# Accept de las llamadas según ServicesConfig.WIRE_FORMAT
+ACCEPT_MSGPACK = f"{MSGPACK_MIMETYPE}, {JSON_MIMETYPE};q=0.9"
+
+
+_CALLS_ATTR = "_upstream_calls"
+_calls_lock = threading.Lock()
+
+
+def init_upstream_calls():
+    """Empezar a contar las llamadas de la petición actual (before_request)."""
+    # el dict se comparte con los hilos de fan-out (ver helpers.concurrency)
+    setattr(g, _CALLS_ATTR, {})
+
+
+def _record_call(name: str):
+    calls = getattr(g, _CALLS_ATTR, None) if has_app_context() else None
+
+    if calls is not None:
+        with _calls_lock:
+            calls[name] = calls.get(name, 0) + 1
+
+
+def upstream_calls() -> Dict[str, int]:
+    """Llamadas a cada microservicio hechas por la petición actual."""
+    if not has_app_context():
+        return {}
+
+    with _calls_lock:
+        return dict(getattr(g, _CALLS_ATTR, None) or {})
+
+
+class PoolStats:
+    """Contadores de uso del pool de conexiones de un microservicio."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.new_connections = 0
+        self.waits = 0
+
+    def record(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_json(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "hits": self.checkouts - self.new_connections,
+                "new_connections": self.new_connections,
+                "waits": self.waits,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Cuenta conexiones reutilizadas, nuevas y esperas por una conexión libre."""
+
+    stats: PoolStats = None
+
+    def _get_conn(self, timeout=None):
+        self.stats.record("checkouts")
+
+        if self.block and self.pool is not None and self.pool.empty():
+            self.stats.record("waits")
+
+        return super()._get_conn(timeout)
+
+    def _new_conn(self):
+        self.stats.record("new_connections")
+        return super()._new_conn()
+
+
+class _InstrumentedAdapter(HTTPAdapter):
+    def __init__(self, stats: PoolStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"stats": self._stats}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "InstrumentedHTTPConnectionPool",
+                (_InstrumentedPoolMixin, HTTPConnectionPool),
+                attrs,
+            ),
+            "https": type(
+                "InstrumentedHTTPSConnectionPool",
+                (_InstrumentedPoolMixin, HTTPSConnectionPool),
+                attrs,
+            ),
+        }
+
+
+class ServiceClient:
+    """
+    Sesión HTTP persistente hacia un microservicio.
+
+    Parameters:
+        name (str): Nombre del microservicio (post, user, comments).
+        base_url (str): URL base del microservicio.
+        timeout (float): Timeout por defecto de cada llamada, en segundos.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: float,
+        pool_connections: int = ServicesConfig.HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = ServicesConfig.HTTP_POOL_MAXSIZE,
+        pool_block: bool = ServicesConfig.HTTP_POOL_BLOCK,
+        wire_format: str = ServicesConfig.WIRE_FORMAT,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.stats = PoolStats()
+        self.breaker = CircuitBreaker(
+            name,
+            window=ServicesConfig.BREAKER_WINDOW,
+            min_calls=ServicesConfig.BREAKER_MIN_CALLS,
+            error_rate=ServicesConfig.BREAKER_ERROR_RATE,
+            slow_call_seconds=ServicesConfig.BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate=ServicesConfig.BREAKER_SLOW_CALL_RATE,
+            open_seconds=ServicesConfig.BREAKER_OPEN_SECONDS,
+            half_open_calls=ServicesConfig.BREAKER_HALF_OPEN_CALLS,
+        )
+
+        adapter = _InstrumentedAdapter(
+            self.stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive"
+
+        if wire_format == "msgpack" and msgpack is not None:
+            self.session.headers["Accept"] = ACCEPT_MSGPACK
+
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Llamar al microservicio.
+
+        Raises:
+            DeadlineExceeded: si la petición ya agotó su presupuesto.
+            CircuitOpenError: si el circuito está abierto (no se hace la llamada).
+            requests.RequestException: errores de red o timeout.
+        """
+        timeout = kwargs.pop("timeout", self.timeout)
+        deadline = get_deadline()
+        truncated = False
+
+        if deadline is not None:
+            budget = deadline - time.time()
+
+            if budget <= 0:
+                raise DeadlineExceeded(f"Sin presupuesto para llamar a {self.name}")
+
+            truncated = budget < timeout
+            timeout = min(timeout, budget)
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                DEADLINE_HEADER: deadline_header_value(deadline),
+            }
+
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Circuito abierto: {self.name}")
+
+        _record_call(self.name)
+        start = time.monotonic()
+
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{path}", timeout=timeout, **kwargs
+            )
+        except requests.Timeout:
+            # un timeout recortado por el deadline no es culpa del microservicio
+            if truncated:
+                self.breaker.release()
+            else:
+                self.breaker.record_failure(time.monotonic() - start)
+            raise
+        except requests.RequestException:
+            self.breaker.record_failure(time.monotonic() - start)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        # 504 de drop_expired_requests: el microservicio descartó la llamada
+        # porque nuestro deadline ya pasó, no es culpa suya
+        expired = response.status_code == 504 and (
+            deadline is not None and time.time() >= deadline
+        )
+
+        if expired:
+            self.breaker.release()
+        elif response.status_code >= 500:
+            self.breaker.record_failure(time.monotonic() - start)
+        else:
+            self.breaker.record_success(time.monotonic() - start)
+
+        return response
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_clients: Dict[str, ServiceClient] = {}
+_clients_pid: Optional[int] = None
+_clients_lock = threading.Lock()
+
+
+def get_client(name: str) -> ServiceClient:
+    """
+    Obtener el cliente HTTP de un microservicio para el proceso actual.
+
+    Los sockets no se comparten entre procesos: si el worker fue creado con
+    fork, se crean sesiones nuevas en el proceso hijo.
+    """
+    global _clients_pid
+
+    pid = os.getpid()
+    client = _clients.get(name)
+
+    if client is not None and _clients_pid == pid:
+        return client
+
+    with _clients_lock:
+        if _clients_pid != pid:
+            _clients.clear()
+            _clients_pid = pid
+
+        if name not in _clients:
+            url_attr, timeout_attr = UPSTREAMS[name]
+            _clients[name] = ServiceClient(
+                name,
+                getattr(ServicesConfig, url_attr),
+                getattr(ServicesConfig, timeout_attr),
+            )
+
+        return _clients[name]
+
+
+def pool_stats() -> dict:
+    """Estadísticas de los pools de conexiones del proceso actual."""
+    return {name: client.stats.to_json() for name, client in list(_clients.items())}
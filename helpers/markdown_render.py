@@ -0,0 +1,120 @@
+"""
+Render de markdown a HTML con caché.
+
+Renderizar (sobre todo ``codehilite`` con Pygments) es lo más costoso de ver un
+post. El HTML se guarda por (id, updated_at, extensiones): editar el post
+cambia ``updated_at`` y con eso la llave, así no hace falta invalidar.
+
+Cada hilo reutiliza su propia instancia de ``Markdown`` por conjunto de
+extensiones (con ``reset()`` entre usos) en lugar de construir una nueva, con
+sus extensiones y expresiones regulares, en cada render. ``warm_up()`` carga
+al iniciar los lexers de Pygments que si no se cargarían en la primera visita.
+
+``init_markdown(app)`` ajusta la caché a ``MARKDOWN_CACHE_MAX_BYTES`` de la
+configuración de la app; sin app (scripts, benchmarks) se usa el valor de
+``Config``.
+"""
+
+import threading
+from typing import Hashable, Optional, Sequence
+
+import markdown
+from flask import Flask
+
+from config import Config
+from helpers.cache import SizedLRU
+
+POST_EXTENSIONS = ("extra", "codehilite", "tables")
+
+_rendered = SizedLRU("markdown", maxbytes=Config.MARKDOWN_CACHE_MAX_BYTES)
+
+_local = threading.local()
+
+# bloques con y sin lenguaje: sin lenguaje, codehilite adivina probando todos
+# los lexers, lo que los importa todos la primera vez
+_WARM_UP_TEXT = """
+# Título
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+```python
+def f(x):
+    return x
+```
+
+```javascript
+const f = (x) => x
+```
+
+```bash
+echo "hola"
+```
+
+```
+SELECT * FROM posts;
+```
+"""
+
+
+def _renderer(extensions: Sequence[str]) -> markdown.Markdown:
+    """Instancia de ``Markdown`` del hilo actual para ``extensions``."""
+    renderers = getattr(_local, "renderers", None)
+
+    if renderers is None:
+        renderers = _local.renderers = {}
+
+    key = tuple(extensions)
+    md = renderers.get(key)
+
+    if md is None:
+        md = renderers[key] = markdown.Markdown(extensions=list(key))
+
+    return md
+
+
+def _convert(text: str, extensions: Sequence[str]) -> str:
+    md = _renderer(extensions)
+
+    try:
+        return md.convert(text)
+    finally:
+        # limpia el estado del documento (notas al pie, abreviaturas, etc.)
+        md.reset()
+
+
+def render_markdown(
+    text: str,
+    extensions: Sequence[str] = POST_EXTENSIONS,
+    cache_key: Optional[Hashable] = None,
+) -> str:
+    """
+    Renderizar ``text``; con ``cache_key`` se reutiliza el HTML ya generado.
+    """
+    if cache_key is None:
+        return _convert(text, extensions)
+
+    return _rendered.get_or_set(
+        (cache_key, tuple(extensions)), lambda: _convert(text, extensions)
+    )
+
+
+def render_post(post, extensions: Sequence[str] = POST_EXTENSIONS) -> str:
+    """HTML del contenido de un post (PostDto)."""
+    updated_at = post.updated_at.isoformat() if post.updated_at else None
+    return render_markdown(post.content, extensions, (str(post.id), updated_at))
+
+
+def warm_up(extensions: Sequence[str] = POST_EXTENSIONS):
+    """Cargar extensiones y lexers antes de la primera petición."""
+    _convert(_WARM_UP_TEXT, extensions)
+
+
+def init_markdown(app: Flask):
+    """Ajustar la caché del HTML a la configuración de ``app`` y precalentar."""
+    _rendered.resize(app.config["MARKDOWN_CACHE_MAX_BYTES"])
+
+    if app.config.get("MARKDOWN_WARM_UP"):
+        # que la primera visita a un post no pague la carga de los lexers
+        warm_up()
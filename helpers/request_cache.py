@@ -0,0 +1,93 @@
+"""
+Memo por petición (identity map) de las entidades obtenidas de los microservicios.
+
+Vive en ``flask.g`` y se descarta al terminar la petición. Las llaves son
+``(tipo de entidad, id)``, por ejemplo ``("post", "abc123")``; así varias
+funciones de servicio que necesitan el mismo post dentro de una petición
+hacen una sola llamada HTTP.
+"""
+
+from functools import wraps
+from typing import Any, Optional
+
+from flask import g, has_app_context
+
+_MEMO_ATTR = "_upstream_memo"
+
+
+def _memo() -> Optional[dict]:
+    if not has_app_context():
+        return None
+
+    memo = getattr(g, _MEMO_ATTR, None)
+
+    if memo is None:
+        memo = {}
+        setattr(g, _MEMO_ATTR, memo)
+
+    return memo
+
+
+def init_request_memo():
+    """Crear el memo al iniciar la petición (antes de repartir trabajo en hilos)."""
+    _memo()
+
+
+def memo_get(entity: str, key) -> Any:
+    memo = _memo()
+    return None if memo is None else memo.get((entity, str(key)))
+
+
+def memo_set(entity: str, key, value):
+    memo = _memo()
+
+    if memo is not None and value is not None:
+        memo[(entity, str(key))] = value
+
+
+def memo_invalidate(entity: str, key):
+    """Descartar ``(entity, key)`` y sus variantes con otros argumentos."""
+    memo = _memo()
+
+    if memo is not None:
+        for memo_key in [k for k in list(memo) if k[:2] == (entity, str(key))]:
+            memo.pop(memo_key, None)
+
+
+def request_memoized(entity: str):
+    """
+    Decorador: memoriza ``fn(key, ...)`` por petición bajo ``(entity, key)``.
+
+    Si hay más argumentos también forman parte de la llave, p. ej.
+    ``(entity, post_id, cursor)`` para una página. Solo se guardan resultados
+    distintos de None, un fallo se reintenta.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(key, *args, **kwargs):
+            memo = _memo()
+
+            if memo is None:
+                return fn(key, *args, **kwargs)
+
+            memo_key = (
+                entity,
+                str(key),
+                *(str(arg) for arg in args),
+                *(f"{k}={v}" for k, v in sorted(kwargs.items())),
+            )
+
+            if memo_key in memo:
+                return memo[memo_key]
+
+            value = fn(key, *args, **kwargs)
+
+            if value is not None:
+                memo[memo_key] = value
+
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,118 @@
+"""
+Single-flight: agrupar lecturas idénticas y concurrentes a un microservicio.
+
+Si varias peticiones piden la misma llave al mismo tiempo, solo la primera
+(líder) llama al microservicio; las demás esperan y reciben su mismo resultado
+(o su misma excepción).
+
+- SingleFlight(nombre).do(llave, fn)
+- @grupo.coalesced_call("entidad") para funciones de servicio
+- grupo.forget("entidad") tras una escritura
+- singleflight_stats() -> llamadas reales y agrupadas por grupo
+"""
+
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable
+
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Grupo de llamadas en vuelo, normalmente uno por microservicio."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.coalesced = 0
+
+        _registry[name] = self
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # ``forget`` pudo haberla soltado y otra llamada ocupar la llave
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    def coalesced_call(self, entity: str):
+        """
+        Decorador: agrupa llamadas concurrentes con los mismos argumentos.
+
+        La llave es ``(entity, *args, *kwargs)`` convertidos a str.
+        """
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = (
+                    entity,
+                    *(str(arg) for arg in args),
+                    *(f"{k}={v}" for k, v in sorted(kwargs.items())),
+                )
+                return self.do(key, lambda: fn(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def forget(self, entity: str):
+        """
+        Soltar las llamadas en vuelo de ``entity``: las siguientes no se unen a
+        ellas (tras una escritura, que esas llamadas pueden no ver).
+        """
+        with self._lock:
+            for key in [k for k in self._calls if isinstance(k, tuple)]:
+                if key[0] == entity:
+                    del self._calls[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+def singleflight_stats() -> dict:
+    """Estadísticas de los grupos single-flight del proceso actual."""
+    return {name: group.stats() for name, group in list(_registry.items())}
@@ -1,23 +1,45 @@
-from flask import Flask
+import os
+import time
+
+from flask import Flask, jsonify, request
 from routes.comment_route import bp
-from db_connector import get_db
+from db_connector import get_db, get_storage, init_storage
+from json_provider import JSONProvider
 from dotenv import load_dotenv
 
 load_dotenv()
 
+DEADLINE_HEADER = "X-Request-Deadline"
+
 
 def create_app():
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     app.config["JSON_SORT_KEYS"] = False
 
+    # firestore | memory | sqlite (ver db_connector/storage.py); el cliente de
+    # Firestore se sigue creando en el primer uso
+    init_storage(
+        os.getenv("STORAGE_ENGINE", "firestore"),
+        firestore_client=get_db,
+        sqlite_path=os.getenv("STORAGE_SQLITE_PATH", "comments.sqlite3"),
+    )
+
     # Registrar rutas
     app.register_blueprint(bp, url_prefix="/v1")
 
+    @app.before_request
+    def drop_expired_requests():
+        # deadline del monolito (epoch ms): si ya pasó, nadie espera la respuesta
+        deadline = request.headers.get(DEADLINE_HEADER, "")
+
+        if deadline.isdigit() and int(deadline) <= time.time() * 1000:
+            return jsonify({"error": "Deadline exceeded"}), 504
+
     @app.get("/health")
     def health():
         try:
-            db = get_db()
-            list(db.collections())
+            get_storage().ping()
             return {"status": "ok"}
         except Exception as e:
             return {"status": "degraded", "error": str(e)}, 503
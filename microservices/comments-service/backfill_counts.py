@@ -0,0 +1,42 @@
+"""
+Inicializar los contadores de comentarios (comment_counters) desde los comentarios.
+
+Los posts con comentarios anteriores a los contadores mostraban 0 comentarios.
+
+Uso (con la misma configuración de almacenamiento que el servicio):
+    python backfill_counts.py
+    python backfill_counts.py --post-id abc123 --post-id def456
+"""
+
+import argparse
+import os
+
+from db_connector import get_db, init_storage
+from dotenv import load_dotenv
+from services import comment_counter
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--post-id",
+        action="append",
+        dest="post_ids",
+        help="solo estos posts (se puede repetir); por defecto, todos",
+    )
+    args = parser.parse_args()
+
+    init_storage(
+        os.getenv("STORAGE_ENGINE", "firestore"),
+        firestore_client=get_db,
+        sqlite_path=os.getenv("STORAGE_SQLITE_PATH", "comments.sqlite3"),
+    )
+    counts = comment_counter.backfill(args.post_ids)
+
+    print(f"{len(counts)} posts, {sum(counts.values())} comentarios")
+
+
+if __name__ == "__main__":
+    main()
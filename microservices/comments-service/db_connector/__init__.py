@@ -1 +1,10 @@
 from .firestore_client import get_db
+from .storage import (
+    DESC,
+    ID_FIELD,
+    SERVER_TIMESTAMP,
+    Increment,
+    Transaction,
+    get_storage,
+    init_storage,
+)
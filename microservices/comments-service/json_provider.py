@@ -0,0 +1,148 @@
+"""
+JSON rápido (y MessagePack) para Flask y para leer las respuestas de los
+microservicios.
+
+Con orjson instalado se codifica directo a bytes y se parsea varias veces más
+rápido que con ``json``; si no está, se usa la biblioteca estándar. El formato
+es el de Flask: fechas como fecha HTTP (``Sun, 21 Sep 2025 10:00:00 GMT``),
+dataclasses como dict y Decimal/UUID como texto, así las respuestas no cambian.
+
+MessagePack es opcional: si la petición lo prefiere en ``Accept`` (el monolito
+lo pide con ``WIRE_FORMAT=msgpack``) y msgpack está instalado, ``jsonify``
+responde con ``application/msgpack``, con los mismos valores que en JSON.
+
+- JSONProvider: ``app.json = JSONProvider(app)`` (jsonify, request.get_json)
+- response_json(respuesta de requests): el cuerpo (JSON o MessagePack según
+  Content-Type) parseado una sola vez
+
+Este archivo es el mismo en el monolito (helpers/json_provider.py) y en cada
+microservicio (json_provider.py).
+"""
+
+import json
+from typing import Any
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack es opcional
+    msgpack = None
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# las fechas pasan por ``default`` para conservar el formato de Flask
+_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_PARSED_ATTR = "_parsed_json"
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        option = _OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+
+        try:
+            return orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+        except orjson.JSONEncodeError:
+            # p. ej. enteros de más de 64 bits: la biblioteca estándar sí los acepta
+            pass
+
+    return json.dumps(
+        obj,
+        default=DefaultJSONProvider.default,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode()
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def packb(obj: Any) -> bytes:
+    """MessagePack con los mismos valores que el JSON (fechas como fecha HTTP)."""
+    return msgpack.packb(obj, default=DefaultJSONProvider.default)
+
+
+def wants_msgpack() -> bool:
+    """Si la petición actual prefiere MessagePack a JSON en ``Accept``."""
+    if msgpack is None or not has_request_context():
+        return False
+
+    best = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+
+def response_json(response) -> Any:
+    """Cuerpo de una respuesta de ``requests``, parseado una sola vez."""
+    try:
+        return response.__dict__[_PARSED_ATTR]
+    except KeyError:
+        content_type = response.headers.get("Content-Type", "")
+
+        if content_type.startswith(MSGPACK_MIMETYPE):
+            data = msgpack.unpackb(response.content)
+        else:
+            data = loads(response.content)
+
+        response.__dict__[_PARSED_ATTR] = data
+        return data
+
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    ``DefaultJSONProvider`` de Flask con orjson cuando está instalado; responde
+    en MessagePack a las peticiones que lo prefieren.
+    """
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        response = self._response(*args, **kwargs)
+
+        if msgpack is not None and has_request_context():
+            # el formato depende de ``Accept``: un caché intermedio no debe
+            # entregar el JSON a quien pidió MessagePack (ni al revés)
+            response.vary.add("Accept")
+
+        return response
+
+    def _response(self, *args, **kwargs):
+        if wants_msgpack():
+            obj = self._prepare_response_obj(args, kwargs)
+
+            try:
+                return self._app.response_class(packb(obj), mimetype=MSGPACK_MIMETYPE)
+            except (TypeError, ValueError, OverflowError):
+                # p. ej. enteros de más de 64 bits: se responde en JSON
+                pass
+
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype
+        )
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from services import comment_service
+from services import comment_counter, comment_service
 
 bp = Blueprint("comments", __name__)
 
@@ -36,6 +36,19 @@ def create_comment():
     }, 201
 
 
+@bp.get("/comments/counts")
+def comment_counts():
+    post_ids = [
+        p.strip() for p in (request.args.get("post_ids") or "").split(",") if p.strip()
+    ]
+    if not post_ids:
+        return jsonify({"error": "post_ids es requerido"}), 400
+    if len(post_ids) > 100:
+        return jsonify({"error": "Máximo 100 post_ids"}), 400
+
+    return {"counts": comment_counter.get_counts(post_ids)}
+
+
 @bp.get("/comments/<string:comment_id>")
 def get_comment(comment_id: str):
     c = comment_service.get_comment(comment_id)
@@ -105,6 +118,7 @@ def list_comments():
         per_page = min(int(request.args.get("per_page", 10)), 100)
     except Exception:
         per_page = 10
+    cursor = (request.args.get("cursor") or "").strip()
 
     res = comment_service.list_comments(
         post_id=post_id or None,
@@ -112,6 +126,7 @@ def list_comments():
         include_deleted=include_deleted,
         page=page,
         per_page=per_page,
+        cursor=cursor or None,
     )
 
     return res
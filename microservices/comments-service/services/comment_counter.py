@@ -0,0 +1,101 @@
+"""
+Contadores de comentarios por post (distribuidos en shards).
+
+Cada post tiene COMMENT_COUNTER_SHARDS documentos en la colección
+``comment_counters`` (id ``{post_id}__{shard}``); cada escritura incrementa un
+shard al azar dentro de la misma transacción que crea o elimina el comentario,
+así las escrituras concurrentes sobre un post popular no compiten por un solo
+documento. El total es la suma de los shards: O(shards) en lugar de O(comentarios).
+
+Los contadores solo ven los comentarios creados o eliminados desde que existen;
+``backfill`` (backfill_counts.py) los calcula para los comentarios anteriores.
+"""
+
+import os
+import random
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from db_connector import Increment, Transaction, get_storage
+
+COUNTERS_COLL = "comment_counters"
+COMMENTS_COLL = "comments"  # services.comment_service.COLL
+NUM_SHARDS = int(os.getenv("COMMENT_COUNTER_SHARDS", 10))
+
+
+def _shard_id(post_id: str, shard: int) -> str:
+    return f"{post_id}__{shard}"
+
+
+def increment_count(transaction: Transaction, post_id: str, delta: int):
+    """Sumar ``delta`` al contador del post dentro de ``transaction``."""
+    shard = random.randrange(NUM_SHARDS)
+    transaction.set(
+        COUNTERS_COLL,
+        _shard_id(post_id, shard),
+        {
+            "post_id": str(post_id),
+            "shard": shard,
+            "count": Increment(delta),
+        },
+        merge=True,
+    )
+
+
+def get_counts(post_ids: Iterable[str]) -> Dict[str, int]:
+    """Cantidad de comentarios (no eliminados) de cada post, en una sola lectura."""
+    post_ids = list(dict.fromkeys(str(post_id) for post_id in post_ids))
+    counts = {post_id: 0 for post_id in post_ids}
+    shard_ids = [
+        _shard_id(post_id, shard) for post_id in post_ids for shard in range(NUM_SHARDS)
+    ]
+
+    if not shard_ids:
+        return counts
+
+    for d in get_storage().collection(COUNTERS_COLL).get_many(shard_ids).values():
+        counts[d["post_id"]] = counts.get(d["post_id"], 0) + d.get("count", 0)
+
+    return counts
+
+
+def backfill(post_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Recalcular los contadores contando los comentarios no eliminados.
+
+    Sin ``post_ids`` recorre todos los comentarios. Cada post queda con el total
+    en el shard 0 y los demás en 0; un comentario creado o eliminado mientras
+    se recorre puede quedar fuera, así que conviene correrlo sin tráfico (o
+    repetirlo para los posts afectados).
+    """
+    storage = get_storage()
+    where = [("is_deleted", "==", False)]
+    counts = Counter()
+
+    if post_ids is None:
+        for doc in storage.collection(COMMENTS_COLL).find(where=where):
+            counts[str(doc.data["post_id"])] += 1
+    else:
+        for post_id in dict.fromkeys(str(post_id) for post_id in post_ids):
+            docs = storage.collection(COMMENTS_COLL).find(
+                where=[("post_id", "==", post_id), *where]
+            )
+            counts[post_id] = len(docs)
+
+    for post_id, count in counts.items():
+
+        def _reset(transaction, post_id=post_id, count=count):
+            for shard in range(NUM_SHARDS):
+                transaction.set(
+                    COUNTERS_COLL,
+                    _shard_id(post_id, shard),
+                    {
+                        "post_id": post_id,
+                        "shard": shard,
+                        "count": count if shard == 0 else 0,
+                    },
+                )
+
+        storage.run_transaction(_reset)
+
+    return dict(counts)
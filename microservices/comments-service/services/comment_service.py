@@ -1,33 +1,60 @@
+import base64
+import json
 from typing import Optional, Tuple
 from datetime import datetime
 from flask import abort
-from db_connector import get_db
-from google.cloud import firestore
+from db_connector import DESC, ID_FIELD, SERVER_TIMESTAMP, get_storage
+from services.comment_counter import get_counts, increment_count
 
 COLL = "comments"
 
 
+def _comments():
+    return get_storage().collection(COLL)
+
+
+def encode_cursor(created_at: datetime, comment_id: str) -> str:
+    """Cursor opaco con la posición (created_at, id) del último comentario."""
+    raw = json.dumps({"t": created_at.isoformat(), "id": comment_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), str(data["id"])
+    except Exception:
+        abort(400, "Cursor inválido")
+
+
 def create_comment(user_id: str, post_id: str, content: str, username: str):
     content = (content or "").strip()
     if not content:
         abort(400, "Comentario vacío")
 
-    db = get_db()
-    doc_ref = db.collection(COLL).document()
-    doc_ref.set(
-        {
-            "user_id": str(user_id),
-            "post_id": str(post_id),
-            "content": content,
-            "created_at": firestore.SERVER_TIMESTAMP,
-            "is_deleted": False,
-            "username": username,
-        }
-    )
+    storage = get_storage()
+    comment_id = _comments().new_id()
+
+    def _create(transaction):
+        transaction.set(
+            COLL,
+            comment_id,
+            {
+                "user_id": str(user_id),
+                "post_id": str(post_id),
+                "content": content,
+                "created_at": SERVER_TIMESTAMP,
+                "is_deleted": False,
+                "username": username,
+            },
+        )
+        increment_count(transaction, post_id, 1)
+
+    storage.run_transaction(_create)
 
-    snap = doc_ref.get()
-    data = snap.to_dict()
-    return {"id": doc_ref.id, **data}
+    data = _comments().get(comment_id)
+    return {"id": comment_id, **data}
 
 
 def list_comments(
@@ -36,52 +63,73 @@ def list_comments(
     include_deleted: bool,
     page: int,
     per_page: int,
+    cursor: Optional[str] = None,
 ):
-    db = get_db()
-    q = db.collection(COLL)
+    """
+    Paginación por keyset: orden (created_at, id) descendente y ``start_after``
+    con la posición del último comentario de la página anterior, así el costo
+    de cada página no crece con su posición.
+
+    ``total`` sale del contador por shards (comentarios no eliminados de un
+    post); es None cuando el contador no aplica (por usuario o con eliminados).
+    """
+    per_page = max(per_page, 1)
+    where = []
 
     if post_id:
-        q = q.where("post_id", "==", str(post_id))
+        where.append(("post_id", "==", str(post_id)))
     if user_id:
-        q = q.where("user_id", "==", str(user_id))
+        where.append(("user_id", "==", str(user_id)))
     if not include_deleted:
-        q = q.where("is_deleted", "==", False)
+        where.append(("is_deleted", "==", False))
+
+    # un elemento de más indica si hay otra página
+    docs = _comments().find(
+        where=where,
+        order_by=[("created_at", DESC), (ID_FIELD, DESC)],
+        start_after=decode_cursor(cursor) if cursor else None,
+        limit=per_page + 1,
+    )
+    items = [{"id": doc.id, **doc.data} for doc in docs]
+
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    next_cursor = None
 
-    q = q.order_by("created_at", direction=firestore.Query.DESCENDING)
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
 
-    snaps = q.limit(per_page).stream()
-    items = []
-    for s in snaps:
-        d = s.to_dict()
-        items.append({"id": s.id, **d})
+    total = None
+
+    if post_id and not user_id and not include_deleted:
+        total = get_counts([post_id])[str(post_id)]
 
     return {
         "items": items,
         "page": page,
         "per_page": per_page,
-        "total": len(items),
+        "total": total,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
     }
 
 
 def get_comment(comment_id: str):
-    db = get_db()
-    snap = db.collection(COLL).document(str(comment_id)).get()
-    if not snap.exists:
+    d = _comments().get(comment_id)
+    if d is None:
         abort(404, "Comentario no encontrado")
-    d = snap.to_dict()
-    return {"id": snap.id, **d}
+    return {"id": str(comment_id), **d}
 
 
 def update_comment(
     comment_id: str, user_id: str, content: Optional[str]
 ) -> Tuple[Optional[dict], Optional[str]]:
-    db = get_db()
-    doc_ref = db.collection(COLL).document(str(comment_id))
-    snap = doc_ref.get()
-    if not snap.exists:
+    comments = _comments()
+    data = comments.get(comment_id)
+    if data is None:
         abort(404)
 
-    data = snap.to_dict()
     if data["user_id"] != str(user_id):
         return None, "forbidden"
 
@@ -89,24 +137,31 @@ def update_comment(
         content = content.strip()
         if not content:
             return None, "invalid"
-        doc_ref.update({"content": content})
+        comments.update(comment_id, {"content": content})
 
-    snap = doc_ref.get()
-    return {"id": snap.id, **snap.to_dict()}, None
+    return {"id": str(comment_id), **comments.get(comment_id)}, None
 
 
 def delete_comment(comment_id: str, requester_id: str, role: Optional[str]):
-    db = get_db()
-    doc_ref = db.collection(COLL).document(str(comment_id))
-    snap = doc_ref.get()
-    if not snap.exists:
-        abort(404)
+    comment_id = str(comment_id)
 
-    data = snap.to_dict()
-    if data["user_id"] != str(requester_id) and role != "moderator":
-        return None, "forbidden"
+    def _soft_delete(transaction):
+        data = transaction.get(COLL, comment_id)
+        if data is None:
+            abort(404)
+
+        if data["user_id"] != str(requester_id) and role != "moderator":
+            return "forbidden"
+
+        # borrar dos veces no descuenta dos veces
+        if not data.get("is_deleted"):
+            transaction.update(COLL, comment_id, {"is_deleted": True})
+            increment_count(transaction, data["post_id"], -1)
+
+        return None
 
-    doc_ref.update({"is_deleted": True})
+    err = get_storage().run_transaction(_soft_delete)
+    if err:
+        return None, err
 
-    snap = doc_ref.get()
-    return {"id": snap.id, **snap.to_dict()}, None
+    return {"id": comment_id, **_comments().get(comment_id)}, None
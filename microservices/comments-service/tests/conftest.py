@@ -1,8 +1,20 @@
 import pytest
 from app import create_app
+from db_connector import get_storage
 
 
 @pytest.fixture()
-def client():
-    app = create_app()
-    return app.test_client()
\ No newline at end of file
+def app(monkeypatch):
+    # motor en memoria, vacío en cada prueba
+    monkeypatch.setenv("STORAGE_ENGINE", "memory")
+    return create_app()
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def storage(app):
+    return get_storage()
@@ -0,0 +1,66 @@
+def create(client, post_id="p1", user_id="u1", content="Hola"):
+    return client.post(
+        "/v1/comments",
+        json={"post_id": post_id, "content": content, "username": "juan"},
+        headers={"X-User-Id": user_id},
+    )
+
+
+def test_create_list_delete_and_counts(client):
+    r = create(client)
+    assert r.status_code == 201
+    comment = r.get_json()
+    assert comment["post_id"] == "p1"
+    assert comment["user_id"] == "u1"
+    create(client, content="Segundo")
+
+    r = client.get(f"/v1/comments/{comment['id']}")
+    assert r.status_code == 200
+    assert r.get_json()["content"] == "Hola"
+
+    r = client.get("/v1/comments?post_id=p1")
+    assert [c["content"] for c in r.get_json()["items"]] == ["Segundo", "Hola"]
+    r = client.get("/v1/comments?post_id=p1&per_page=1")
+    assert [c["content"] for c in r.get_json()["items"]] == ["Segundo"]
+    assert r.get_json()["total"] == 2  # todos los del post, no los de la página
+    assert client.get("/v1/comments/counts?post_ids=p1").get_json() == {
+        "counts": {"p1": 2}
+    }
+
+    r = client.delete(f"/v1/comments/{comment['id']}", headers={"X-User-Id": "u1"})
+    assert r.status_code == 200
+
+    assert client.get(f"/v1/comments/{comment['id']}").status_code == 404
+    r = client.get("/v1/comments?post_id=p1")
+    assert [c["content"] for c in r.get_json()["items"]] == ["Segundo"]
+    assert r.get_json()["total"] == 1
+    r = client.get("/v1/comments?post_id=p1&include_deleted=true")
+    assert len(r.get_json()["items"]) == 2
+    assert r.get_json()["total"] is None  # el contador no cuenta los eliminados
+    assert client.get("/v1/comments/counts?post_ids=p1").get_json() == {
+        "counts": {"p1": 1}
+    }
+
+
+def test_create_requires_user_and_fields(client):
+    assert create(client, user_id="").status_code == 401
+    assert create(client, content=" ").status_code == 400
+
+
+def test_delete_checks_owner_unless_moderator(client):
+    comment_id = create(client).get_json()["id"]
+    url = f"/v1/comments/{comment_id}"
+
+    assert client.delete(url).status_code == 401
+    assert client.delete(url, headers={"X-User-Id": "u2"}).status_code == 403
+
+    r = client.delete(url, headers={"X-User-Id": "u2", "X-User-Role": "moderator"})
+    assert r.status_code == 200
+
+
+def test_list_by_user(client):
+    create(client, post_id="p1", user_id="u1")
+    create(client, post_id="p2", user_id="u2")
+
+    r = client.get("/v1/comments?user_id=u2")
+    assert [c["post_id"] for c in r.get_json()["items"]] == ["p2"]
@@ -0,0 +1,87 @@
+import pytest
+from werkzeug.exceptions import NotFound
+
+from services import comment_counter, comment_service
+
+
+def create(post_id="p1", user_id="u1"):
+    return comment_service.create_comment(user_id, post_id, "Hola", "juan")
+
+
+def test_create_and_delete_update_the_count(storage):
+    first = create()
+    create()
+    create(post_id="p2")
+
+    assert comment_counter.get_counts(["p1", "p2", "p3"]) == {
+        "p1": 2,
+        "p2": 1,
+        "p3": 0,
+    }
+
+    deleted, err = comment_service.delete_comment(first["id"], "u1", None)
+    assert err is None
+    assert deleted["is_deleted"] is True
+    assert comment_counter.get_counts(["p1"]) == {"p1": 1}
+
+
+def test_deleting_twice_does_not_decrement_twice(storage):
+    comment = create()
+    create()
+
+    comment_service.delete_comment(comment["id"], "u1", None)
+    comment_service.delete_comment(comment["id"], "u1", None)
+
+    assert comment_counter.get_counts(["p1"]) == {"p1": 1}
+
+
+def test_delete_by_other_user_is_forbidden_and_keeps_count(storage):
+    comment = create()
+
+    assert comment_service.delete_comment(comment["id"], "u2", None) == (
+        None,
+        "forbidden",
+    )
+    assert comment_counter.get_counts(["p1"]) == {"p1": 1}
+
+    with pytest.raises(NotFound):
+        comment_service.delete_comment("no-existe", "u1", None)
+
+
+def test_counts_are_spread_over_shards(storage, monkeypatch):
+    monkeypatch.setattr(comment_counter, "NUM_SHARDS", 3)
+
+    for _ in range(20):
+        create()
+
+    shards = storage.collection(comment_counter.COUNTERS_COLL).find()
+    assert sum(doc.data["count"] for doc in shards) == 20
+    assert comment_counter.get_counts(["p1"]) == {"p1": 20}
+
+
+def test_backfill_counts_existing_comments(storage):
+    for post_id, is_deleted in [("p1", False), ("p1", False), ("p1", True)]:
+        storage.collection("comments").set(
+            storage.collection("comments").new_id(),
+            {"post_id": post_id, "user_id": "u1", "is_deleted": is_deleted},
+        )
+
+    assert comment_counter.get_counts(["p1"]) == {"p1": 0}
+    assert comment_counter.backfill() == {"p1": 2}
+    assert comment_counter.get_counts(["p1"]) == {"p1": 2}
+
+    # repetirlo no duplica
+    assert comment_counter.backfill(["p1", "p2"]) == {"p1": 2, "p2": 0}
+    assert comment_counter.get_counts(["p1", "p2"]) == {"p1": 2, "p2": 0}
+
+
+def test_counts_route(client, storage):
+    create()
+
+    r = client.get("/v1/comments/counts?post_ids=p1,p2")
+    assert r.status_code == 200
+    assert r.get_json() == {"counts": {"p1": 1, "p2": 0}}
+
+    assert client.get("/v1/comments/counts").status_code == 400
+    many = ",".join(f"p{i}" for i in range(101))
+    assert client.get(f"/v1/comments/counts?post_ids={many}").status_code == 400
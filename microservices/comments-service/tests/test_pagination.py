@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+from services.comment_service import decode_cursor, encode_cursor, list_comments
+
+
+def add_comment(storage, comment_id, created_at, post_id="p1", is_deleted=False):
+    storage.collection("comments").set(
+        comment_id,
+        {
+            "user_id": "u1",
+            "post_id": post_id,
+            "content": f"comentario {comment_id}",
+            "created_at": datetime.fromisoformat(created_at),
+            "is_deleted": is_deleted,
+            "username": "juan",
+        },
+    )
+
+
+def page(cursor=None, per_page=2, post_id="p1"):
+    return list_comments(
+        post_id=post_id,
+        user_id=None,
+        include_deleted=False,
+        page=1,
+        per_page=per_page,
+        cursor=cursor,
+    )
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2025, 9, 21, 14, 0, 0)
+    assert decode_cursor(encode_cursor(created_at, "c1")) == (created_at, "c1")
+
+
+def test_invalid_cursor_is_bad_request():
+    with pytest.raises(BadRequest):
+        decode_cursor("no-es-un-cursor")
+
+
+def test_pages_follow_cursor_until_has_more_is_false(storage):
+    add_comment(storage, "c1", "2025-09-21T10:00:00")
+    add_comment(storage, "c2", "2025-09-22T10:00:00")
+    add_comment(storage, "c3", "2025-09-23T10:00:00")
+    add_comment(storage, "c4", "2025-09-24T10:00:00", post_id="otro")
+    add_comment(storage, "c5", "2025-09-25T10:00:00", is_deleted=True)
+
+    first = page()
+    assert [c["id"] for c in first["items"]] == ["c3", "c2"]
+    assert first["has_more"] is True
+
+    second = page(first["next_cursor"])
+    assert [c["id"] for c in second["items"]] == ["c1"]
+    assert second["has_more"] is False
+    assert second["next_cursor"] is None
+
+
+def test_same_created_at_breaks_tie_by_id(storage):
+    for comment_id in ["a", "b", "c"]:
+        add_comment(storage, comment_id, "2025-09-21T10:00:00")
+
+    first = page()
+    assert [c["id"] for c in first["items"]] == ["c", "b"]
+
+    second = page(first["next_cursor"])
+    assert [c["id"] for c in second["items"]] == ["a"]
+
+
+def test_list_route_rejects_invalid_cursor(client):
+    r = client.get("/v1/comments?post_id=p1&cursor=xyz")
+    assert r.status_code == 400
@@ -1,3 +1,5 @@
 from .fire_connection import db_init_post_firestore, db_check_post_firestore_connection
 from .post_repository import PostRepository
 from .post_model import Post
+from .cursor import encode_cursor, decode_cursor
+from .storage import init_storage, get_storage
@@ -0,0 +1,33 @@
+"""
+Cursores opacos para paginar por keyset.
+
+El cursor guarda la posición (created_at, id) del último post de una página;
+la siguiente página empieza justo después con ``start_after``, así cada página
+lee solo sus documentos sin importar qué tan profunda sea.
+"""
+
+import base64
+import json
+from typing import Tuple
+
+
+def encode_cursor(created_at: str, post_id: str) -> str:
+    """Codificar la posición de un post (created_at tal como está guardado)."""
+    raw = json.dumps({"t": created_at, "id": str(post_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Returns:
+        (created_at, id) del último post de la página anterior.
+
+    Raises:
+        ValueError: si el cursor no es válido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return str(data["t"]), str(data["id"])
+    except Exception as e:
+        raise ValueError("Cursor inválido") from e
@@ -9,6 +9,7 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 
 from log import logger
+from .storage import get_storage, init_storage
 
 FIREBASE_POSTS_COLLECTION_collection = "posts"
 
@@ -16,6 +17,12 @@ _db = None
 _db_post_collection = None
 
 
+def get_post_db():
+    if _db is None:
+        raise RuntimeError("Firestore no ha sido inicializado")
+    return _db
+
+
 def get_post_collection():
     if _db_post_collection is None:
         raise RuntimeError("Firestore no ha sido inicializado")
@@ -26,8 +33,7 @@ def db_check_post_firestore_connection() -> bool:
     global _db_post_collection
 
     try:
-        _db_post_collection.get()
-        return True
+        return get_storage().ping()
     except Exception as e:
         logger.error(f"======== Error al verificar la conexión ========\n{e}\n")
         return False
@@ -40,3 +46,4 @@ def db_init_post_firestore(credentials_path):
     firebase_admin.initialize_app(cred)
     _db = firestore.client()
     _db_post_collection = _db.collection(FIREBASE_POSTS_COLLECTION_collection)
+    init_storage("firestore", firestore_client=_db)
@@ -7,7 +7,7 @@ Este archivo contiene la configuración de la base de datos y modelos en Firesto
 """
 
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 # =============================
@@ -23,8 +23,8 @@ class Post:
     id: str | None = None
     title: str = ""
     content: str = ""
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
     user_id: str = ""
     # redundancia de datos pero permite no hacer llamadas a la API de usuario
     username: str = ""
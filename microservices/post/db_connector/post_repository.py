@@ -1,18 +1,23 @@
-from typing import List
+from typing import List, Optional
 
 """
-Este archivo contiene los llamados a Firestore.
+Este archivo contiene los llamados al almacenamiento (ver storage.py).
 
 - Operaciones sobre la base de datos para el microservicio de Usuarios
 - Agregar, obtener, actualizar
 """
 
-from google.cloud.firestore_v1 import FieldFilter
-from firebase_admin import firestore
+import os
+from datetime import datetime
+
 from functools import wraps
 
-from .fire_connection import get_post_collection
+from .cursor import decode_cursor, encode_cursor
+from .fire_connection import FIREBASE_POSTS_COLLECTION_collection
 from .post_model import Post
+from .prefix_index import PrefixIndex, normalize
+from .search_index import search_index
+from .storage import DESC, ID_FIELD, Collection, get_storage
 from dtos import ApiRes
 from log import logger
 
@@ -35,53 +40,95 @@ def safe_firestore_call(context: str = None):
     return decorator
 
 
+def _posts() -> Collection:
+    return get_storage().collection(FIREBASE_POSTS_COLLECTION_collection)
+
+
+def _load_all_posts() -> List[Post]:
+    return [Post.from_json(doc.data) for doc in _posts().find()]
+
+
+def _title_keys(title: str) -> List[str]:
+    # se autocompleta desde el inicio de cada palabra del título
+    words = normalize(title).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+title_index = PrefixIndex(
+    "titles",
+    loader=lambda: [
+        (post.id, post.title, _title_keys(post.title)) for post in _load_all_posts()
+    ],
+    refresh_seconds=float(os.environ.get("PREFIX_INDEX_REFRESH_SECONDS", 300)),
+)
+
+
+def _index_post(post: Post):
+    # cada índice decide: lo aplica, lo guarda para repetirlo tras una
+    # reconstrucción en curso o lo ignora si aún no se cargó
+    search_index.add(post)
+    title_index.add(post.id, post.title, _title_keys(post.title))
+
+
 class PostRepository:
     @staticmethod
     @safe_firestore_call()
     def save(post: Post) -> ApiRes[Post]:
-        collection = get_post_collection()
+        posts = _posts()
 
         if post.id:
-            doc_ref = collection.document(str(post.id))
-            doc = doc_ref.get()
-
-            if not doc.exists:
+            if posts.get(post.id) is None:
                 return ApiRes.not_found("El post no existe para editar")
 
-            doc_ref.set(post.to_json())
+            # cambia la versión del post (p. ej. la llave del HTML ya renderizado)
+            post.updated_at = datetime.now()
+            posts.set(post.id, post.to_json())
+            _index_post(post)
             return ApiRes.success("Post actualizado correctamente", data=post)
 
-        doc_ref = collection.document()
-        post.id = doc_ref.id
-        doc_ref.set(post.to_json())
-        post = Post.from_json(doc_ref.get().to_dict())
+        post.id = posts.new_id()
+        posts.set(post.id, post.to_json())
+        post = Post.from_json(posts.get(post.id))
+        _index_post(post)
         return ApiRes.created("Post creado correctamente", data=post)
 
     @staticmethod
     @safe_firestore_call()
     def delete(post_id: str) -> ApiRes:
-        doc_ref = get_post_collection().document(str(post_id))
-        doc = doc_ref.get()
+        posts = _posts()
 
-        if not doc.exists:
+        if posts.get(post_id) is None:
             return ApiRes.not_found("El post no existe")
 
-        doc_ref.delete()
+        posts.delete(post_id)
+        search_index.remove(post_id)
+        title_index.remove(post_id)
         return ApiRes.success("Post eliminado correctamente")
 
     @staticmethod
     @safe_firestore_call()
     def get_by_id(post_id: str) -> ApiRes[Post]:
-        doc = get_post_collection().document(str(post_id)).get()
+        data = _posts().get(post_id)
 
-        if not doc.exists:
+        if data is None:
             return ApiRes.not_found("El post no existe")
 
         return ApiRes.success(
             "Post encontrado",
-            data=Post.from_json(doc.to_dict()),
+            data=Post.from_json(data),
         )
 
+    @staticmethod
+    @safe_firestore_call()
+    def get_by_ids(post_ids: List[str]) -> ApiRes[List[Post]]:
+        """Obtener varios posts en una sola lectura (get_many), en el orden pedido."""
+        post_ids = list(dict.fromkeys(str(post_id) for post_id in post_ids))
+        docs = _posts().get_many(post_ids)
+        posts = [
+            Post.from_json(docs[post_id]) for post_id in post_ids if post_id in docs
+        ]
+        return ApiRes.success("Posts obtenidas", data=posts)
+
     @staticmethod
     @safe_firestore_call()
     def exists(post_id: str) -> ApiRes[bool]:
@@ -98,34 +145,82 @@ class PostRepository:
         if limit < 1:
             return ApiRes.error("El limite debe ser mayor a 0")
 
-        if not title:
-            query = (
-                get_post_collection()
-                .order_by("created_at", direction=firestore.Query.DESCENDING)
-                .limit(limit)
-            )
-        else:
-            query = (
-                get_post_collection()
-                .order_by("title")
-                .start_at(title.split(" "))
-                .end_at(
-                    [t + "\uf8ff" for t in title.split(" ")]
-                )  # \uf8ff es el último carácter unicode
-                .limit(limit)
-            )
-
-        posts = [Post.from_json(doc.to_dict()) for doc in query.get()]
+        if title:
+            return PostRepository.search(title, limit)
+
+        docs = _posts().find(order_by=[("created_at", DESC)], limit=limit)
+        posts = [Post.from_json(doc.data) for doc in docs]
         return ApiRes.success("Posts obtenidas", data=posts)
 
     @staticmethod
     @safe_firestore_call()
-    def get_user_posts(user_id: str) -> ApiRes[List[Post]]:
-        query = (
-            get_post_collection()
-            .where(filter=FieldFilter("user_id", "==", user_id))
-            .get()
+    def search(query: str, limit: int = 25) -> ApiRes[List[Post]]:
+        """Buscar en título y contenido con el índice invertido (ranking BM25)."""
+        if limit < 1:
+            return ApiRes.error("El limite debe ser mayor a 0")
+
+        search_index.ensure_loaded(_load_all_posts)
+        post_ids = [post_id for post_id, _ in search_index.search(query, limit)]
+
+        if not post_ids:
+            return ApiRes.success("Posts obtenidas", data=[])
+
+        return PostRepository.get_by_ids(post_ids)
+
+    @staticmethod
+    @safe_firestore_call()
+    def autocomplete(prefix: str, limit: int = 10) -> ApiRes[List[dict]]:
+        """Títulos con alguna palabra que empieza por ``prefix`` (sin leer Firestore)."""
+        data = [
+            {"id": post_id, "title": title}
+            for post_id, title in title_index.complete(prefix, limit)
+        ]
+        return ApiRes.success("Sugerencias obtenidas", data=data)
+
+    @staticmethod
+    @safe_firestore_call()
+    def get_feed(limit: int, after: Optional[str] = None) -> ApiRes[dict]:
+        """
+        Página del inicio ordenada por (created_at, id) descendente.
+
+        ``after`` es el ``next_cursor`` de la página anterior; se continúa con
+        ``start_after`` en lugar de releer los posts ya vistos.
+        """
+        if limit < 1:
+            return ApiRes.error("El limite debe ser mayor a 0")
+
+        start_after = None
+
+        if after:
+            try:
+                start_after = decode_cursor(after)
+            except ValueError as e:
+                return ApiRes.error(str(e))
+
+        # un post de más indica si hay otra página
+        docs = _posts().find(
+            order_by=[("created_at", DESC), (ID_FIELD, DESC)],
+            start_after=start_after,
+            limit=limit + 1,
+        )
+        posts = [Post.from_json(doc.data) for doc in docs[:limit]]
+        next_cursor = None
+
+        if len(docs) > limit:
+            last = docs[limit - 1]
+            next_cursor = encode_cursor(last.data["created_at"], last.id)
+
+        return ApiRes.success(
+            "Posts obtenidas",
+            data={
+                "items": [post.to_json() for post in posts],
+                "next_cursor": next_cursor,
+            },
         )
-        print("=================", query)
-        posts = [Post.from_json(doc.to_dict()) for doc in query]
+
+    @staticmethod
+    @safe_firestore_call()
+    def get_user_posts(user_id: str) -> ApiRes[List[Post]]:
+        docs = _posts().find(where=[("user_id", "==", user_id)])
+        posts = [Post.from_json(doc.data) for doc in docs]
         return ApiRes.success("Posts obtenidas", data=posts)
@@ -0,0 +1,203 @@
+"""
+Índice de prefijos en memoria para autocompletar.
+
+Un arreglo ordenado de (clave normalizada, id) consultado con ``bisect``: buscar
+un prefijo cuesta O(log n + resultados) y no toca Firestore. Se carga con
+``loader`` en el primer uso, se actualiza en cada escritura del repositorio y se
+reconstruye completo en segundo plano cada ``refresh_seconds`` para incluir
+cambios hechos por otras instancias. Las escrituras que llegan mientras se
+reconstruye se repiten sobre el índice nuevo.
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (id, texto a mostrar, claves)
+Entry = Tuple[str, str, Iterable[str]]
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin tildes y sin espacios repetidos."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+class PrefixIndex:
+    """
+    Parameters:
+        name (str): Nombre con el que se exponen sus estadísticas.
+        loader (Callable[[], Iterable[Entry]]): Recorrido completo de la colección.
+        refresh_seconds (float): Cada cuánto se reconstruye; 0 para nunca.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Iterable[Entry]],
+        refresh_seconds: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.RLock()
+        self._entries: List[Tuple[str, str]] = []
+        self._display: Dict[str, str] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._built_at: Optional[float] = None
+        self._refreshing = False
+        # escrituras recibidas durante una reconstrucción: (id, texto o None, claves)
+        self._pending: Optional[List[Tuple[str, Optional[str], List[str]]]] = None
+
+        self.rebuilds = 0
+        self.queries = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._built_at is not None
+
+    def _remove(self, item_id: str):
+        for key in self._keys.pop(item_id, []):
+            index = bisect_left(self._entries, (key, item_id))
+
+            if index < len(self._entries) and self._entries[index] == (key, item_id):
+                del self._entries[index]
+
+        self._display.pop(item_id, None)
+
+    def _put(self, item_id: str, display: Optional[str], keys: List[str]):
+        self._remove(item_id)
+
+        if display is None:
+            return
+
+        self._display[item_id] = display
+        self._keys[item_id] = keys
+
+        for key in keys:
+            insort(self._entries, (key, item_id))
+
+    def _write(self, item_id: str, display: Optional[str], keys: List[str]):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((item_id, display, keys))
+
+            # sin cargar, el recorrido completo del primer uso ya lo incluirá
+            if self.loaded:
+                self._put(item_id, display, keys)
+
+    def add(self, item_id: str, display: str, keys: Iterable[str]):
+        """Agregar o reemplazar un elemento."""
+        keys = sorted({normalize(key) for key in keys if normalize(key)})
+        self._write(str(item_id), display, keys)
+
+    def remove(self, item_id: str):
+        self._write(str(item_id), None, [])
+
+    def rebuild(self, entries: Optional[Iterable[Entry]] = None):
+        """Reconstruir todo el índice (con ``loader()`` si no se pasan entradas)."""
+        with self._rebuild_lock:
+            with self._lock:
+                self._pending = []
+
+            try:
+                entries = self.loader() if entries is None else entries
+                sorted_entries, display, keys_by_id = [], {}, {}
+
+                for item_id, text, keys in entries:
+                    item_id = str(item_id)
+                    keys = sorted({normalize(key) for key in keys if normalize(key)})
+                    display[item_id] = text
+                    keys_by_id[item_id] = keys
+                    sorted_entries.extend((key, item_id) for key in keys)
+
+                sorted_entries.sort()
+
+                with self._lock:
+                    self._entries = sorted_entries
+                    self._display = display
+                    self._keys = keys_by_id
+
+                    # lo escrito durante la carga puede no estar en ``loader()``
+                    for item_id, text, keys in self._pending:
+                        self._put(item_id, text, keys)
+
+                    self._built_at = self.clock()
+                    self.rebuilds += 1
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def _refresh_in_background(self):
+        try:
+            self.rebuild()
+        finally:
+            self._refreshing = False
+
+    def _ensure_fresh(self):
+        if not self.loaded:
+            with self._rebuild_lock:
+                if not self.loaded:
+                    self.rebuild()
+            return
+
+        if (
+            not self.refresh_seconds
+            or self.clock() - self._built_at < self.refresh_seconds
+        ):
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+
+            self._refreshing = True
+
+        # se sigue respondiendo con la copia actual mientras se reconstruye
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Returns:
+            List[Tuple[str, str]]: (id, texto) de los elementos con alguna clave
+            que empieza por ``prefix``, en orden alfabético de la clave.
+        """
+        prefix = normalize(prefix)
+
+        if not prefix or limit < 1:
+            return []
+
+        self._ensure_fresh()
+        results: Dict[str, str] = {}
+
+        with self._lock:
+            self.queries += 1
+            index = bisect_left(self._entries, (prefix,))
+
+            while index < len(self._entries) and len(results) < limit:
+                key, item_id = self._entries[index]
+
+                if not key.startswith(prefix):
+                    break
+
+                results.setdefault(item_id, self._display[item_id])
+                index += 1
+
+        return list(results.items())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "items": len(self._display),
+                "keys": len(self._entries),
+                "rebuilds": self.rebuilds,
+                "queries": self.queries,
+            }
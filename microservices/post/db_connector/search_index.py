@@ -0,0 +1,236 @@
+"""
+Índice invertido en memoria para la búsqueda de posts.
+
+- Tokeniza título y contenido (minúsculas, sin tildes)
+- término -> {post_id: frecuencia}, así una búsqueda solo recorre las listas de
+  los términos de la consulta y no todos los posts
+- Ranking BM25; los términos del título pesan TITLE_WEIGHT veces más
+- Se carga con un recorrido completo de la colección en el primer uso, se
+  actualiza en cada ``save``/``delete`` del repositorio y se reconstruye en
+  segundo plano cada ``refresh_seconds``
+
+Cada instancia del microservicio tiene su propio índice: la reconstrucción
+periódica incluye los posts creados o editados en otras instancias. Las
+escrituras que llegan mientras se reconstruye se repiten sobre el índice nuevo.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .post_model import Post
+
+TITLE_WEIGHT = 3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin tildes ("Canción" -> "cancion")."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """
+    Parameters:
+        k1 (float): Saturación de la frecuencia de un término (BM25).
+        b (float): Normalización por longitud del documento (BM25).
+        refresh_seconds (float): Cada cuánto se reconstruye; 0 para nunca.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        refresh_seconds: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self._built_at: Optional[float] = None
+        self._refreshing = False
+        # escrituras recibidas durante una reconstrucción: (id, términos o None)
+        self._pending: Optional[List[Tuple[str, Optional[Counter]]]] = None
+        self.loaded = False
+
+    def _terms(self, post: Post) -> Counter:
+        terms = Counter(tokenize(post.content))
+
+        for token in tokenize(post.title):
+            terms[token] += TITLE_WEIGHT
+
+        return terms
+
+    def _remove(self, post_id: str):
+        terms = self._doc_terms.pop(post_id, None)
+
+        if terms is None:
+            return
+
+        self._total_len -= self._doc_len.pop(post_id)
+
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(post_id, None)
+
+            if not postings:
+                del self._postings[term]
+
+    def _put(self, post_id: str, terms: Optional[Counter]):
+        self._remove(post_id)
+
+        if terms is None:
+            return
+
+        self._doc_terms[post_id] = terms
+        self._doc_len[post_id] = sum(terms.values())
+        self._total_len += self._doc_len[post_id]
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[post_id] = tf
+
+    def _write(self, post_id: str, terms: Optional[Counter]):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((post_id, terms))
+
+            # sin cargar, el recorrido completo del primer uso ya lo incluirá
+            if self.loaded:
+                self._put(post_id, terms)
+
+    def add(self, post: Post):
+        """Agregar o reemplazar un post."""
+        self._write(str(post.id), self._terms(post))
+
+    def remove(self, post_id: str):
+        self._write(str(post_id), None)
+
+    def rebuild(self, posts: Iterable[Post]):
+        """Reemplazar todo el contenido del índice."""
+        self._rebuild(lambda: posts)
+
+    def _rebuild(self, loader: Callable[[], Iterable[Post]]):
+        with self._rebuild_lock:
+            with self._lock:
+                self._pending = []
+
+            try:
+                fresh = SearchIndex(self.k1, self.b)
+
+                for post in loader():
+                    fresh._put(str(post.id), fresh._terms(post))
+
+                with self._lock:
+                    # lo escrito durante la carga puede no estar en ``loader()``
+                    for post_id, terms in self._pending:
+                        fresh._put(post_id, terms)
+
+                    self._postings = fresh._postings
+                    self._doc_terms = fresh._doc_terms
+                    self._doc_len = fresh._doc_len
+                    self._total_len = fresh._total_len
+                    self._built_at = self.clock()
+                    self.loaded = True
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def _refresh_in_background(self, loader: Callable[[], Iterable[Post]]):
+        try:
+            self._rebuild(loader)
+        finally:
+            self._refreshing = False
+
+    def ensure_loaded(self, loader: Callable[[], Iterable[Post]]):
+        """
+        Cargar el índice con ``loader()`` si aún no se ha cargado y reconstruirlo
+        en segundo plano cada ``refresh_seconds``.
+        """
+        if not self.loaded:
+            with self._rebuild_lock:
+                if not self.loaded:
+                    self._rebuild(loader)
+            return
+
+        if (
+            not self.refresh_seconds
+            or self.clock() - self._built_at < self.refresh_seconds
+        ):
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+
+            self._refreshing = True
+
+        # se sigue respondiendo con la copia actual mientras se reconstruye
+        threading.Thread(
+            target=self._refresh_in_background, args=(loader,), daemon=True
+        ).start()
+
+    def search(self, query: str, limit: int = 25) -> List[Tuple[str, float]]:
+        """
+        Returns:
+            List[Tuple[str, float]]: (post_id, puntaje) de mayor a menor puntaje.
+        """
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+
+        with self._lock:
+            n_docs = len(self._doc_terms)
+
+            if not terms or not n_docs:
+                return []
+
+            avg_len = self._total_len / n_docs
+
+            for term in terms:
+                postings = self._postings.get(term)
+
+                if not postings:
+                    continue
+
+                idf = math.log(
+                    1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+
+                for post_id, tf in postings.items():
+                    doc_len = self._doc_len[post_id]
+                    norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+                    score = idf * tf * (self.k1 + 1) / (tf + norm)
+                    scores[post_id] = scores.get(post_id, 0.0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "posts": len(self._doc_terms),
+                "terms": len(self._postings),
+            }
+
+
+search_index = SearchIndex(
+    refresh_seconds=float(os.environ.get("SEARCH_INDEX_REFRESH_SECONDS", 300))
+)
@@ -0,0 +1,876 @@
+"""
+Almacenamiento de documentos con motor intercambiable.
+
+Los repositorios usan esta interfaz en lugar de Firestore directamente; el
+motor se elige con STORAGE_ENGINE:
+
+- firestore: Firestore (producción)
+- memory: en memoria del proceso, con índices por igualdad (pruebas,
+  benchmarks, load tests)
+- sqlite: un archivo SQLite en modo WAL (STORAGE_SQLITE_PATH), para un entorno
+  local barato y persistente
+
+Los tres motores tienen la misma semántica en lo que usan los repositorios:
+filtros de igualdad, orden por campos y por id (ID_FIELD), ``start_after``,
+``limit``, SERVER_TIMESTAMP, Increment y transacciones. Como en Firestore,
+``find`` excluye los documentos a los que les falta un campo del orden, y sin
+orden explícito ordena por id.
+
+Este archivo es el mismo en cada microservicio (db_connector/storage.py).
+"""
+
+import json
+import os
+import secrets
+import sqlite3
+import string
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cmp_to_key
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ID_FIELD = "__id__"
+
+ASC = "asc"
+DESC = "desc"
+
+# (campo, "==", valor)
+Where = Tuple[str, str, Any]
+# (campo, ASC | DESC)
+OrderBy = Tuple[str, str]
+
+_ID_ALPHABET = string.ascii_letters + string.digits
+
+
+class _ServerTimestamp:
+    def __repr__(self):
+        return "SERVER_TIMESTAMP"
+
+
+# se reemplaza por la hora (UTC) del servidor al escribir
+SERVER_TIMESTAMP = _ServerTimestamp()
+
+
+@dataclass(frozen=True)
+class Increment:
+    """Suma ``value`` al valor guardado del campo (0 si no existe)."""
+
+    value: float
+
+
+@dataclass
+class Document:
+    id: str
+    data: dict
+
+
+class DocumentNotFound(KeyError):
+    """``update`` sobre un documento que no existe."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _resolve(data: dict, existing: Optional[dict]) -> dict:
+    """Reemplazar SERVER_TIMESTAMP e Increment por sus valores."""
+    resolved = {}
+
+    for field, value in data.items():
+        if value is SERVER_TIMESTAMP:
+            value = _now()
+        elif isinstance(value, Increment):
+            value = ((existing or {}).get(field) or 0) + value.value
+
+        resolved[field] = value
+
+    return resolved
+
+
+def _new_id() -> str:
+    return "".join(secrets.choice(_ID_ALPHABET) for _ in range(20))
+
+
+def _check_where(where: Sequence[Where]):
+    for field, op, _ in where:
+        if op != "==":
+            raise ValueError(f"Operador no soportado: {field} {op}")
+
+
+# =============================
+# INTERFAZ
+# =============================
+
+
+class Collection:
+    """Colección de documentos (dict) identificados por id."""
+
+    name: str
+
+    def new_id(self) -> str:
+        return _new_id()
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def get_many(self, doc_ids: Iterable[str]) -> Dict[str, dict]:
+        """Documentos existentes de ``doc_ids`` (id -> datos) en una sola lectura."""
+        raise NotImplementedError
+
+    def set(self, doc_id: str, data: dict, merge: bool = False):
+        """Crear o reemplazar (``merge``: combinar con los campos existentes)."""
+        raise NotImplementedError
+
+    def update(self, doc_id: str, data: dict):
+        """Actualizar campos de un documento existente (DocumentNotFound si no)."""
+        raise NotImplementedError
+
+    def delete(self, doc_id: str):
+        raise NotImplementedError
+
+    def find(
+        self,
+        where: Sequence[Where] = (),
+        order_by: Sequence[OrderBy] = (),
+        start_after: Optional[Sequence[Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Document]:
+        """
+        Parameters:
+            where: filtros de igualdad ``(campo, "==", valor)``.
+            order_by: ``(campo, ASC|DESC)``; ID_FIELD ordena por id.
+            start_after: valores de ``order_by`` del último documento ya visto.
+            limit: máximo de documentos.
+        """
+        raise NotImplementedError
+
+    def increment(self, doc_id: str, field: str, delta: float, defaults: dict = None):
+        """Sumar ``delta`` a ``field`` (creando el documento con ``defaults``)."""
+        self.set(doc_id, {**(defaults or {}), field: Increment(delta)}, merge=True)
+
+
+class Transaction:
+    """Lecturas y escrituras atómicas; las lecturas van antes que las escrituras."""
+
+    def get(self, collection: str, doc_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def set(self, collection: str, doc_id: str, data: dict, merge: bool = False):
+        raise NotImplementedError
+
+    def update(self, collection: str, doc_id: str, data: dict):
+        raise NotImplementedError
+
+
+class Storage:
+    engine: str
+
+    def collection(self, name: str) -> Collection:
+        raise NotImplementedError
+
+    def run_transaction(self, fn: Callable[[Transaction], Any]) -> Any:
+        """Ejecutar ``fn(transaction)`` de forma atómica y devolver su resultado."""
+        raise NotImplementedError
+
+    def ping(self) -> bool:
+        return True
+
+
+class _DirectTransaction(Transaction):
+    """Transacción de los motores locales: el aislamiento lo da el motor."""
+
+    def __init__(self, storage: Storage):
+        self._storage = storage
+
+    def get(self, collection, doc_id):
+        return self._storage.collection(collection).get(doc_id)
+
+    def set(self, collection, doc_id, data, merge=False):
+        self._storage.collection(collection).set(doc_id, data, merge)
+
+    def update(self, collection, doc_id, data):
+        self._storage.collection(collection).update(doc_id, data)
+
+
+# =============================
+# ORDEN (motores locales)
+# =============================
+
+
+def _sort_value(data: dict, doc_id: str, field: str) -> Any:
+    return doc_id if field == ID_FIELD else data.get(field)
+
+
+def _compare_values(a: Any, b: Any) -> int:
+    # None va primero, como null en Firestore
+    if a is None or b is None:
+        return (a is not None) - (b is not None)
+
+    return (a > b) - (a < b)
+
+
+def _compare(a: Sequence[Any], b: Sequence[Any], order_by: Sequence[OrderBy]) -> int:
+    for (_, direction), value_a, value_b in zip(order_by, a, b):
+        result = _compare_values(value_a, value_b)
+
+        if result:
+            return -result if direction == DESC else result
+
+    return 0
+
+
+# =============================
+# MEMORIA
+# =============================
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+
+    return value
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+class MemoryCollection(Collection):
+    """
+    Documentos en un dict. Cada campo usado en un filtro obtiene un índice
+    valor -> ids (creado en su primer uso y mantenido en cada escritura).
+    """
+
+    def __init__(self, storage: "MemoryStorage", name: str):
+        self.name = name
+        self._storage = storage
+        self._lock = storage._lock
+        self._docs: Dict[str, dict] = {}
+        self._indexes: Dict[str, Dict[Any, set]] = {}
+
+    def _index_add(self, doc_id: str, data: dict):
+        for field, index in self._indexes.items():
+            value = data.get(field)
+
+            if _hashable(value):
+                index.setdefault(value, set()).add(doc_id)
+
+    def _index_remove(self, doc_id: str, data: dict):
+        for field, index in self._indexes.items():
+            value = data.get(field)
+
+            if _hashable(value) and value in index:
+                index[value].discard(doc_id)
+
+                if not index[value]:
+                    del index[value]
+
+    def _index(self, field: str) -> Dict[Any, set]:
+        index = self._indexes.get(field)
+
+        if index is None:
+            index = self._indexes[field] = {}
+
+            for doc_id, data in self._docs.items():
+                value = data.get(field)
+
+                if _hashable(value):
+                    index.setdefault(value, set()).add(doc_id)
+
+        return index
+
+    def _write(self, doc_id: str, data: Optional[dict]):
+        """Guardar ``data`` (None borra); en una transacción se guarda el anterior."""
+        old = self._docs.pop(doc_id, None)
+
+        if old is not None:
+            self._index_remove(doc_id, old)
+
+        if self._storage._undo is not None:
+            self._storage._undo.append((self, doc_id, old))
+
+        if data is not None:
+            self._docs[doc_id] = data
+            self._index_add(doc_id, data)
+
+    def get(self, doc_id):
+        with self._lock:
+            data = self._docs.get(str(doc_id))
+            return None if data is None else _copy(data)
+
+    def get_many(self, doc_ids):
+        with self._lock:
+            return {
+                str(doc_id): _copy(self._docs[str(doc_id)])
+                for doc_id in doc_ids
+                if str(doc_id) in self._docs
+            }
+
+    def set(self, doc_id, data, merge=False):
+        doc_id = str(doc_id)
+
+        with self._lock:
+            existing = self._docs.get(doc_id)
+            data = _copy(_resolve(data, existing))
+
+            if merge and existing is not None:
+                data = {**existing, **data}
+
+            self._write(doc_id, data)
+
+    def update(self, doc_id, data):
+        doc_id = str(doc_id)
+
+        with self._lock:
+            existing = self._docs.get(doc_id)
+
+            if existing is None:
+                raise DocumentNotFound(doc_id)
+
+            self._write(doc_id, {**existing, **_copy(_resolve(data, existing))})
+
+    def delete(self, doc_id):
+        with self._lock:
+            if str(doc_id) in self._docs:
+                self._write(str(doc_id), None)
+
+    def find(self, where=(), order_by=(), start_after=None, limit=None):
+        _check_where(where)
+        order_by = list(order_by) or [(ID_FIELD, ASC)]
+
+        with self._lock:
+            candidates = None
+            pending = []
+
+            for field, _, value in where:
+                if not _hashable(value):
+                    pending.append((field, value))
+                    continue
+
+                ids = self._index(field).get(value, set())
+                candidates = ids if candidates is None else candidates & ids
+
+            ids = self._docs.keys() if candidates is None else candidates
+            docs = [
+                (doc_id, self._docs[doc_id])
+                for doc_id in ids
+                if all(self._docs[doc_id].get(f) == v for f, v in pending)
+                and all(
+                    field == ID_FIELD or field in self._docs[doc_id]
+                    for field, _ in order_by
+                )
+            ]
+
+            def values(doc):
+                return [_sort_value(doc[1], doc[0], field) for field, _ in order_by]
+
+            docs.sort(
+                key=cmp_to_key(lambda a, b: _compare(values(a), values(b), order_by))
+            )
+
+            if start_after is not None:
+                docs = [
+                    doc
+                    for doc in docs
+                    if _compare(values(doc), start_after, order_by) > 0
+                ]
+
+            if limit is not None:
+                docs = docs[:limit]
+
+            return [Document(doc_id, _copy(data)) for doc_id, data in docs]
+
+
+class MemoryStorage(Storage):
+    engine = "memory"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._collections: Dict[str, MemoryCollection] = {}
+        # (colección, id, valor anterior) de cada escritura de la transacción en curso
+        self._undo: Optional[list] = None
+
+    def collection(self, name):
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = MemoryCollection(self, name)
+
+            return self._collections[name]
+
+    def run_transaction(self, fn):
+        # un solo lock para todo el almacenamiento: las transacciones se serializan
+        with self._lock:
+            if self._undo is not None:
+                return fn(_DirectTransaction(self))
+
+            self._undo = []
+
+            try:
+                return fn(_DirectTransaction(self))
+            except BaseException:
+                undo, self._undo = self._undo, None
+
+                for collection, doc_id, old in reversed(undo):
+                    collection._write(doc_id, old)
+
+                raise
+            finally:
+                self._undo = None
+
+
+# =============================
+# SQLITE
+# =============================
+
+# los datetime se guardan como texto con este prefijo: se ordenan y comparan
+# correctamente entre sí y se reconocen al leer
+_DATETIME_PREFIX = "\x01dt:"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _DATETIME_PREFIX + value.isoformat(timespec="microseconds")
+
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(_DATETIME_PREFIX):
+        return datetime.fromisoformat(value[len(_DATETIME_PREFIX) :])
+
+    if isinstance(value, dict):
+        return {k: _decode(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+
+    return value
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _field_expr(field: str) -> str:
+    if field == ID_FIELD:
+        return "id"
+
+    return f"json_extract(data, '$.\"{field}\"')"
+
+
+class SqliteCollection(Collection):
+    """Una tabla (id, data JSON) por colección, con índices por expresión."""
+
+    def __init__(self, storage: "SqliteStorage", name: str):
+        self.name = name
+        self._storage = storage
+        self._table = _quote(name)
+        self._indexed = set()
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._storage.connection()
+
+    def _ensure_index(self, field: str):
+        if field == ID_FIELD or field in self._indexed:
+            return
+
+        index_name = _quote(f"ix_{self.name}_{field}")
+        self._conn().execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {self._table}({_field_expr(field)})"
+        )
+        self._indexed.add(field)
+
+    def _read(self, doc_id: str) -> Optional[dict]:
+        row = (
+            self._conn()
+            .execute(f"SELECT data FROM {self._table} WHERE id = ?", (doc_id,))
+            .fetchone()
+        )
+        return None if row is None else _decode(json.loads(row[0]))
+
+    def _write(self, doc_id: str, data: dict):
+        self._conn().execute(
+            f"INSERT OR REPLACE INTO {self._table} (id, data) VALUES (?, ?)",
+            (doc_id, json.dumps(_encode(data))),
+        )
+
+    def get(self, doc_id):
+        return self._read(str(doc_id))
+
+    def get_many(self, doc_ids):
+        doc_ids = list(dict.fromkeys(str(doc_id) for doc_id in doc_ids))
+
+        if not doc_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in doc_ids)
+        rows = self._conn().execute(
+            f"SELECT id, data FROM {self._table} WHERE id IN ({placeholders})",
+            doc_ids,
+        )
+        return {doc_id: _decode(json.loads(data)) for doc_id, data in rows}
+
+    def set(self, doc_id, data, merge=False):
+        doc_id = str(doc_id)
+
+        with self._storage.atomic():
+            existing = self._read(doc_id)
+            data = _resolve(data, existing)
+
+            if merge and existing is not None:
+                data = {**existing, **data}
+
+            self._write(doc_id, data)
+
+    def update(self, doc_id, data):
+        doc_id = str(doc_id)
+
+        with self._storage.atomic():
+            existing = self._read(doc_id)
+
+            if existing is None:
+                raise DocumentNotFound(doc_id)
+
+            self._write(doc_id, {**existing, **_resolve(data, existing)})
+
+    def delete(self, doc_id):
+        self._conn().execute(f"DELETE FROM {self._table} WHERE id = ?", (str(doc_id),))
+
+    def find(self, where=(), order_by=(), start_after=None, limit=None):
+        _check_where(where)
+        order_by = list(order_by) or [(ID_FIELD, ASC)]
+        conditions, params = [], []
+
+        for field, _, value in where:
+            self._ensure_index(field)
+
+            if value is None:
+                conditions.append(f"{_field_expr(field)} IS NULL")
+            else:
+                conditions.append(f"{_field_expr(field)} = ?")
+                params.append(_encode(value))
+
+        for field, _ in order_by:
+            self._ensure_index(field)
+
+            if field != ID_FIELD:
+                conditions.append(f"{_field_expr(field)} IS NOT NULL")
+
+        if start_after is not None:
+            # keyset: (a > x) OR (a = x AND b > y) ... según la dirección
+            alternatives = []
+
+            for i, (field, direction) in enumerate(order_by[: len(start_after)]):
+                parts = [f"{_field_expr(f)} = ?" for f, _ in order_by[:i]]
+                parts.append(
+                    f"{_field_expr(field)} {'<' if direction == DESC else '>'} ?"
+                )
+                alternatives.append("(" + " AND ".join(parts) + ")")
+                params.extend(_encode(v) for v in start_after[: i + 1])
+
+            conditions.append("(" + " OR ".join(alternatives) + ")")
+
+        sql = f"SELECT id, data FROM {self._table}"
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        sql += " ORDER BY " + ", ".join(
+            f"{_field_expr(field)} {'DESC' if direction == DESC else 'ASC'}"
+            for field, direction in order_by
+        )
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._conn().execute(sql, params)
+        return [Document(doc_id, _decode(json.loads(data))) for doc_id, data in rows]
+
+
+class SqliteStorage(Storage):
+    """
+    Parameters:
+        path (str): Archivo de la base de datos.
+
+    Una conexión por hilo (autocommit); las escrituras de varios pasos y las
+    transacciones usan BEGIN IMMEDIATE.
+    """
+
+    engine = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._collections: Dict[str, SqliteCollection] = {}
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False, timeout=30
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        return conn
+
+    def atomic(self):
+        storage = self
+
+        class _Atomic:
+            def __enter__(self):
+                self.conn = storage.connection()
+                self.owner = not self.conn.in_transaction
+
+                if self.owner:
+                    self.conn.execute("BEGIN IMMEDIATE")
+
+            def __exit__(self, exc_type, exc, tb):
+                if self.owner:
+                    self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+        return _Atomic()
+
+    def collection(self, name):
+        with self._lock:
+            if name not in self._collections:
+                self.connection().execute(
+                    f"CREATE TABLE IF NOT EXISTS {_quote(name)} "
+                    "(id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+                )
+                self._collections[name] = SqliteCollection(self, name)
+
+            return self._collections[name]
+
+    def run_transaction(self, fn):
+        with self.atomic():
+            return fn(_DirectTransaction(self))
+
+    def ping(self):
+        self.connection().execute("SELECT 1").fetchone()
+        return True
+
+
+# =============================
+# FIRESTORE
+# =============================
+
+
+def _to_firestore(data: dict) -> dict:
+    from google.cloud import firestore
+
+    converted = {}
+
+    for field, value in data.items():
+        if value is SERVER_TIMESTAMP:
+            value = firestore.SERVER_TIMESTAMP
+        elif isinstance(value, Increment):
+            value = firestore.Increment(value.value)
+
+        converted[field] = value
+
+    return converted
+
+
+def _firestore_field(field: str) -> str:
+    return "__name__" if field == ID_FIELD else field
+
+
+class FirestoreCollection(Collection):
+    def __init__(self, storage: "FirestoreStorage", name: str):
+        self.name = name
+        self._storage = storage
+
+    @property
+    def _ref(self):
+        return self._storage.client.collection(self.name)
+
+    def new_id(self):
+        return self._ref.document().id
+
+    def get(self, doc_id):
+        snap = self._ref.document(str(doc_id)).get()
+        return snap.to_dict() if snap.exists else None
+
+    def get_many(self, doc_ids):
+        refs = [self._ref.document(str(doc_id)) for doc_id in dict.fromkeys(doc_ids)]
+
+        if not refs:
+            return {}
+
+        return {
+            snap.id: snap.to_dict()
+            for snap in self._storage.client.get_all(refs)
+            if snap.exists
+        }
+
+    def set(self, doc_id, data, merge=False):
+        self._ref.document(str(doc_id)).set(_to_firestore(data), merge=merge)
+
+    def update(self, doc_id, data):
+        from google.api_core.exceptions import NotFound
+
+        try:
+            self._ref.document(str(doc_id)).update(_to_firestore(data))
+        except NotFound as e:
+            raise DocumentNotFound(doc_id) from e
+
+    def delete(self, doc_id):
+        self._ref.document(str(doc_id)).delete()
+
+    def find(self, where=(), order_by=(), start_after=None, limit=None):
+        from google.cloud import firestore
+        from google.cloud.firestore_v1 import FieldFilter
+
+        _check_where(where)
+        query = self._ref
+
+        for field, op, value in where:
+            query = query.where(filter=FieldFilter(_firestore_field(field), op, value))
+
+        for field, direction in order_by:
+            query = query.order_by(
+                _firestore_field(field),
+                direction=(
+                    firestore.Query.DESCENDING
+                    if direction == DESC
+                    else firestore.Query.ASCENDING
+                ),
+            )
+
+        if start_after is not None:
+            query = query.start_after(
+                {
+                    _firestore_field(field): value
+                    for (field, _), value in zip(order_by, start_after)
+                }
+            )
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return [Document(snap.id, snap.to_dict()) for snap in query.stream()]
+
+
+class _FirestoreTransaction(Transaction):
+    def __init__(self, storage: "FirestoreStorage", transaction):
+        self._storage = storage
+        self._transaction = transaction
+
+    def _doc(self, collection, doc_id):
+        return self._storage.client.collection(collection).document(str(doc_id))
+
+    def get(self, collection, doc_id):
+        snap = self._doc(collection, doc_id).get(transaction=self._transaction)
+        return snap.to_dict() if snap.exists else None
+
+    def set(self, collection, doc_id, data, merge=False):
+        self._transaction.set(
+            self._doc(collection, doc_id), _to_firestore(data), merge=merge
+        )
+
+    def update(self, collection, doc_id, data):
+        self._transaction.update(self._doc(collection, doc_id), _to_firestore(data))
+
+
+class FirestoreStorage(Storage):
+    """
+    Parameters:
+        client: ``firestore.Client`` o una función que lo crea (en el primer uso).
+    """
+
+    engine = "firestore"
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if callable(self._client) and not hasattr(self._client, "collection"):
+            with self._lock:
+                if callable(self._client) and not hasattr(self._client, "collection"):
+                    self._client = self._client()
+
+        return self._client
+
+    def collection(self, name):
+        return FirestoreCollection(self, name)
+
+    def run_transaction(self, fn):
+        from google.cloud import firestore
+
+        @firestore.transactional
+        def run(transaction):
+            return fn(_FirestoreTransaction(self, transaction))
+
+        return run(self.client.transaction())
+
+    def ping(self):
+        list(self.client.collections())
+        return True
+
+
+# =============================
+# CONFIGURACIÓN
+# =============================
+
+_storage: Optional[Storage] = None
+
+
+def init_storage(
+    engine: Optional[str] = None, firestore_client=None, sqlite_path: str = None
+) -> Storage:
+    """
+    Elegir el motor de almacenamiento del proceso.
+
+    Parameters:
+        engine (str): firestore | memory | sqlite (por defecto STORAGE_ENGINE).
+        firestore_client: cliente de Firestore (o función que lo crea).
+        sqlite_path (str): archivo SQLite (por defecto STORAGE_SQLITE_PATH).
+    """
+    global _storage
+
+    engine = (engine or os.environ.get("STORAGE_ENGINE") or "firestore").lower()
+
+    if engine == "memory":
+        _storage = MemoryStorage()
+    elif engine == "sqlite":
+        _storage = SqliteStorage(
+            sqlite_path or os.environ.get("STORAGE_SQLITE_PATH", "storage.sqlite3")
+        )
+    elif engine == "firestore":
+        if firestore_client is None:
+            raise ValueError("El motor firestore necesita un cliente")
+
+        _storage = FirestoreStorage(firestore_client)
+    else:
+        raise ValueError(f"Motor de almacenamiento desconocido: {engine}")
+
+    return _storage
+
+
+def get_storage() -> Storage:
+    if _storage is None:
+        raise RuntimeError("El almacenamiento no ha sido inicializado")
+
+    return _storage
@@ -1,10 +1,27 @@
-from flask import Blueprint, request, abort, jsonify
+import hashlib
+
+from flask import Blueprint, request, abort, jsonify, make_response
 
 from db_connector import PostRepository, Post
-from dtos import ApiRes
+from dtos import ApiRes, wire
 
 post_api = Blueprint("post", __name__)
 
+
+def _with_view(res: ApiRes) -> ApiRes:
+    """Con ``?view=summary`` (dtos/wire.py), los posts con el contenido recortado."""
+    if not res.success or request.args.get(wire.VIEW_PARAM) != wire.SUMMARY_VIEW:
+        return res
+
+    if isinstance(res.data, dict):
+        items = [wire.summarize_post(post) for post in res.data["items"]]
+        res.data = {**res.data, "items": items}
+    else:
+        res.data = [wire.summarize_post(post.to_json()) for post in res.data]
+
+    return res
+
+
 # =============================
 # RUTAS PRINCIPALES DE POSTS
 # =============================
@@ -19,6 +36,69 @@ def get_posts_limit(limit: int):
 
     title = request.args.get("title", "").strip()
     res = PostRepository.get_posts(limit, title)
+    return _with_view(res).flask_response()
+
+
+@post_api.route("/post/search")
+def search_posts():
+    q = request.args.get("q", "").strip()
+
+    try:
+        limit = int(request.args.get("limit", 25))
+    except ValueError:
+        return ApiRes.error("Limite no valido").flask_response()
+
+    if not q:
+        return ApiRes.error("q requerido").flask_response()
+    elif limit < 1:
+        return ApiRes.error("Limite < 1 no valido").flask_response()
+    elif limit > 100:
+        return ApiRes.error("Limite > 100 no valido").flask_response()
+
+    res = PostRepository.search(q, limit)
+    return _with_view(res).flask_response()
+
+
+@post_api.route("/post/autocomplete")
+def autocomplete_posts():
+    prefix = request.args.get("prefix", "").strip()
+
+    try:
+        limit = min(int(request.args.get("limit", 10)), 50)
+    except ValueError:
+        limit = 10
+
+    res = PostRepository.autocomplete(prefix, limit)
+    return res.flask_response()
+
+
+@post_api.route("/post/feed")
+def get_posts_feed():
+    try:
+        limit = int(request.args.get("limit", 25))
+    except ValueError:
+        return ApiRes.error("Limite no valido").flask_response()
+
+    if limit < 1:
+        return ApiRes.error("Limite < 1 no valido").flask_response()
+    elif limit > 100:
+        return ApiRes.error("Limite > 100 no valido").flask_response()
+
+    after = request.args.get("after", "").strip()
+    res = PostRepository.get_feed(limit, after or None)
+    return _with_view(res).flask_response()
+
+
+@post_api.route("/post/batch")
+def get_posts_batch():
+    ids = [i.strip() for i in request.args.get("ids", "").split(",") if i.strip()]
+
+    if not ids:
+        return ApiRes.error("ids requeridos").flask_response()
+    elif len(ids) > 100:
+        return ApiRes.error("Máximo 100 ids").flask_response()
+
+    res = PostRepository.get_by_ids(ids)
     return res.flask_response()
 
 
@@ -51,7 +131,16 @@ def create_post():
 @post_api.route("/post/<string:post_id>")
 def post_detail(post_id: str):
     res = PostRepository.get_by_id(post_id)
-    return res.flask_response()
+
+    if not res.success:
+        return res.flask_response()
+
+    # ETag débil por versión del post: con If-None-Match igual se responde 304
+    post = res.data
+    version = f"{post.id}|{post.updated_at.isoformat()}"
+    response = make_response(res.flask_response())
+    response.set_etag(hashlib.sha1(version.encode()).hexdigest()[:20], weak=True)
+    return response.make_conditional(request)
 
 
 @post_api.route("/post/<string:post_id>/edit", methods=["GET", "POST"])
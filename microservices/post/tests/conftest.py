@@ -1,5 +1,6 @@
 import pytest
 from app import create_app
+from db_connector import init_storage
 
 
 @pytest.fixture
@@ -22,3 +23,9 @@ def client(app):
 @pytest.fixture
 def runner(app):
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def storage():
+    # motor en memoria, vacío en cada prueba
+    return init_storage("memory")
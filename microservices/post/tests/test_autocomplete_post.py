@@ -0,0 +1,56 @@
+from unittest.mock import patch
+from db_connector import Post, PostRepository
+from db_connector.post_repository import _title_keys, title_index
+
+
+def test_title_keys_start_at_each_word():
+    assert _title_keys("Intro a  Flask") == ["intro a flask", "a flask", "flask"]
+
+
+def test_autocomplete_matches_any_word_of_the_title():
+    posts = [
+        Post(id="1", title="Intro a Flask"),
+        Post(id="2", title="Flujos de trabajo"),
+        Post(id="3", title="Python"),
+    ]
+
+    with patch("db_connector.post_repository._load_all_posts", return_value=posts):
+        title_index.rebuild()
+
+    res = PostRepository.autocomplete("fl")
+    assert res.success
+    assert res.data == [
+        {"id": "1", "title": "Intro a Flask"},
+        {"id": "2", "title": "Flujos de trabajo"},
+    ]
+    assert PostRepository.autocomplete("intro a").data[0]["id"] == "1"
+
+    title_index.rebuild([])
+
+
+def test_autocomplete_route(client):
+    with patch(
+        "db_connector.post_repository.title_index.complete",
+        return_value=[("1", "Intro a Flask")],
+    ) as mock_complete:
+        response = client.get("/post/autocomplete?prefix=intro")
+
+    assert response.status_code == 200
+    assert response.json["data"] == [{"id": "1", "title": "Intro a Flask"}]
+    mock_complete.assert_called_once_with("intro", 10)
+
+
+def test_post_deleted_during_rebuild_does_not_reappear():
+    def load_all_posts():
+        # el recorrido ya leyó el post cuando se elimina
+        title_index.remove("1")
+        return [Post(id="1", title="Intro a Flask")]
+
+    with patch(
+        "db_connector.post_repository._load_all_posts", side_effect=load_all_posts
+    ):
+        title_index.rebuild()
+
+    assert PostRepository.autocomplete("intro").data == []
+
+    title_index.rebuild([])
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+from datetime import datetime
+from db_connector import Post
+from dtos import ApiRes
+
+
+def post_test(id="p1", title="Nuevo post"):
+    return Post(
+        id=id,
+        title=title,
+        content="Contenido",
+        user_id="1",
+        username="juan",
+        created_at=datetime(2025, 9, 21),
+        updated_at=datetime(2025, 9, 21),
+    )
+
+
+def test_batch_success(client):
+    posts = [post_test("p2"), post_test("p1")]
+
+    with patch(
+        "db_connector.PostRepository.get_by_ids",
+        return_value=ApiRes.success("OK", posts),
+    ) as mock_batch:
+        response = client.get("/post/batch?ids=p2,p1, ,p3")
+        assert response.status_code == 200
+        assert [p["id"] for p in response.json["data"]] == ["p2", "p1"]
+        mock_batch.assert_called_once_with(["p2", "p1", "p3"])
+
+
+def test_batch_missing_ids(client):
+    response = client.get("/post/batch")
+    assert response.status_code == 400
+    assert response.json["message"] == "ids requeridos"
+
+
+def test_batch_too_many_ids(client):
+    ids = ",".join(f"p{i}" for i in range(101))
+    response = client.get(f"/post/batch?ids={ids}")
+    assert response.status_code == 400
+    assert response.json["message"] == "Máximo 100 ids"
+
+
+def test_get_by_ids_keeps_order_and_skips_missing(storage):
+    from db_connector import PostRepository
+
+    posts = storage.collection("posts")
+
+    for post_id in ("p1", "p2"):
+        posts.set(post_id, post_test(post_id).to_json())
+
+    res = PostRepository.get_by_ids(["p2", "p1", "p3", "p1"])
+
+    assert res.success
+    assert [p.id for p in res.data] == ["p2", "p1"]
@@ -0,0 +1,30 @@
+import time
+from unittest.mock import patch
+
+from dtos import ApiRes
+
+
+def test_expired_deadline_is_dropped(client):
+    with patch("db_connector.PostRepository.exists") as mock_exists:
+        response = client.get(
+            "/post/abc123/exists",
+            headers={"X-Request-Deadline": str(int((time.time() - 1) * 1000))},
+        )
+
+        assert response.status_code == 504
+        assert response.json["message"] == "Deadline excedido"
+        mock_exists.assert_not_called()
+
+
+def test_future_deadline_is_served(client):
+    with patch(
+        "db_connector.PostRepository.exists",
+        return_value=ApiRes.success("Existe", data=True),
+    ):
+        response = client.get(
+            "/post/abc123/exists",
+            headers={"X-Request-Deadline": str(int((time.time() + 5) * 1000))},
+        )
+
+        assert response.status_code == 200
+        assert response.json["data"] is True
@@ -57,3 +57,26 @@ def test_post_detail_not_found(client):
         assert response.status_code == 404
         assert response.json["success"] is False
         assert response.json["message"] == "Publicación no encontrada"
+
+
+def test_post_detail_etag_not_modified(client):
+    mock_post = post_test(updated_at=datetime(2025, 1, 1))
+    with patch(
+        "db_connector.PostRepository.get_by_id",
+        return_value=ApiRes.success("OK", mock_post),
+    ):
+        response = client.get("/post/123")
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        response = client.get("/post/123", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    mock_post.updated_at = datetime(2025, 1, 2)
+    with patch(
+        "db_connector.PostRepository.get_by_id",
+        return_value=ApiRes.success("OK", mock_post),
+    ):
+        response = client.get("/post/123", headers={"If-None-Match": etag})
+        assert response.status_code == 200
@@ -109,3 +109,27 @@ def test_edit_post_success(client):
         assert response.status_code == 200
         assert response.json["success"] is True
         assert response.json["data"]["title"] == "Nuevo título"
+
+
+def test_save_existing_post_bumps_updated_at(storage):
+    from db_connector import PostRepository
+
+    post = Post(id="123", title="Título", content="Contenido", user_id="1")
+    post.updated_at = datetime(2025, 1, 1)
+    storage.collection("posts").set("123", post.to_json())
+
+    res = PostRepository.save(post)
+
+    assert res.success
+    assert res.data.updated_at > datetime(2025, 1, 1)
+    saved = storage.collection("posts").get("123")
+    assert saved["updated_at"] == res.data.updated_at.isoformat()
+
+
+def test_post_defaults_use_creation_time():
+    import time
+
+    first = Post()
+    time.sleep(0.001)
+    second = Post()
+    assert second.created_at > first.created_at
@@ -0,0 +1,112 @@
+import msgpack
+from unittest.mock import patch
+from datetime import datetime
+from db_connector import Post, PostRepository, decode_cursor, encode_cursor
+from dtos import ApiRes
+
+
+def add_post(storage, post_id, created_at):
+    post = Post(
+        id=post_id,
+        title="Título",
+        content="Contenido",
+        user_id="1",
+        username="juan",
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(created_at),
+    )
+    storage.collection("posts").set(post_id, post.to_json())
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor("2025-09-21T14:00:00", "abc")
+    assert decode_cursor(cursor) == ("2025-09-21T14:00:00", "abc")
+
+
+def test_get_feed_returns_next_cursor(storage):
+    add_post(storage, "p1", "2025-09-21T10:00:00")
+    add_post(storage, "p2", "2025-09-22T10:00:00")
+    add_post(storage, "p3", "2025-09-23T10:00:00")
+
+    res = PostRepository.get_feed(2)
+
+    assert res.success
+    assert [p["id"] for p in res.data["items"]] == ["p3", "p2"]
+    assert decode_cursor(res.data["next_cursor"]) == ("2025-09-22T10:00:00", "p2")
+
+
+def test_get_feed_after_cursor_last_page(storage):
+    add_post(storage, "p1", "2025-09-21T10:00:00")
+    add_post(storage, "p2", "2025-09-22T10:00:00")
+    add_post(storage, "p3", "2025-09-22T10:00:00")
+    cursor = encode_cursor("2025-09-22T10:00:00", "p3")
+
+    res = PostRepository.get_feed(2, cursor)
+
+    # mismo created_at: el desempate por id continúa con p2
+    assert [p["id"] for p in res.data["items"]] == ["p2", "p1"]
+    assert res.data["next_cursor"] is None
+
+
+def test_get_feed_invalid_cursor(storage):
+    res = PostRepository.get_feed(2, "no-es-un-cursor")
+
+    assert not res.success
+    assert res.status_code == 400
+
+
+def test_feed_route(client):
+    data = {"items": [{"id": "p1"}], "next_cursor": "abc"}
+
+    with patch(
+        "db_connector.PostRepository.get_feed",
+        return_value=ApiRes.success("OK", data),
+    ) as mock_feed:
+        response = client.get("/post/feed?limit=10&after=xyz")
+        assert response.status_code == 200
+        assert response.json["data"] == data
+        mock_feed.assert_called_once_with(10, "xyz")
+
+
+def test_feed_route_limit_too_large(client):
+    response = client.get("/post/feed?limit=101")
+    assert response.status_code == 400
+
+
+def test_feed_route_summary_view_in_msgpack(client, storage):
+    add_post(storage, "p1", "2025-09-21T10:00:00")
+    storage.collection("posts").update("p1", {"content": "x" * 5000})
+
+    response = client.get(
+        "/post/feed?limit=10&view=summary",
+        headers={"Accept": "application/msgpack, application/json;q=0.9"},
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/msgpack"
+    item = msgpack.unpackb(response.get_data())["data"]["items"][0]
+    assert item["id"] == "p1"
+    assert item["content"] == "x" * 201
+    assert item["created_at"] == "2025-09-21T10:00:00"
+
+
+def test_search_route_summary_view_keeps_json_by_default(client):
+    post = Post(
+        id="abc123",
+        title="Hola",
+        content="y" * 500,
+        user_id="1",
+        username="juan",
+        created_at=datetime(2025, 9, 21, 10, 0),
+        updated_at=datetime(2025, 9, 21, 10, 0),
+    )
+
+    with patch(
+        "db_connector.PostRepository.search",
+        return_value=ApiRes.success("OK", [post]),
+    ):
+        response = client.get("/post/search?q=hola&view=summary")
+
+    assert response.mimetype == "application/json"
+    assert response.json["data"][0]["content"] == "y" * 201
+    assert response.json["data"][0]["title"] == "Hola"
@@ -0,0 +1,120 @@
+import time
+from unittest.mock import patch
+from db_connector import Post, PostRepository
+from db_connector.search_index import SearchIndex, search_index, tokenize
+from dtos import ApiRes
+
+
+def post(id, title, content="Contenido"):
+    return Post(id=id, title=title, content=content, user_id="1", username="juan")
+
+
+def test_tokenize_lowercase_without_accents():
+    assert tokenize("Canción de ÁRBOLES, 2025!") == ["cancion", "de", "arboles", "2025"]
+
+
+def test_bm25_ranks_title_and_frequency():
+    index = SearchIndex()
+    index.rebuild(
+        [
+            post("1", "Recetas de cocina", "pasta pasta pasta"),
+            post("2", "Viajes", "una pasta en Roma"),
+            post("3", "Pasta fresca", "harina y huevo"),
+            post("4", "Jardín", "plantas"),
+        ]
+    )
+
+    ranked = [post_id for post_id, _ in index.search("PASTA")]
+    assert ranked[0] in ("1", "3")
+    assert set(ranked) == {"1", "2", "3"}
+    assert index.search("plantas jardin")[0][0] == "4"
+    assert index.search("inexistente") == []
+
+
+def test_incremental_add_and_remove():
+    index = SearchIndex()
+    index.rebuild([post("1", "Python rápido")])
+
+    index.add(post("2", "Python lento"))
+    assert {post_id for post_id, _ in index.search("python")} == {"1", "2"}
+
+    index.add(post("1", "Go rápido"))  # edición: se reemplazan sus términos
+    assert [post_id for post_id, _ in index.search("python")] == ["2"]
+
+    index.remove("2")
+    assert index.search("python") == []
+    assert index.stats() == {"loaded": True, "posts": 1, "terms": 3}
+
+
+def test_repository_search_loads_index_and_fetches_in_order():
+    posts = [post("1", "Flask y Python"), post("2", "Python")]
+
+    with (
+        patch(
+            "db_connector.post_repository._load_all_posts", return_value=posts
+        ) as mock_load,
+        patch(
+            "db_connector.PostRepository.get_by_ids",
+            return_value=ApiRes.success("OK", posts),
+        ) as mock_batch,
+    ):
+        search_index.loaded = False
+        res = PostRepository.search("python")
+        PostRepository.search("flask")
+
+    search_index.rebuild([])
+    search_index.loaded = False
+
+    assert res.success
+    mock_load.assert_called_once()
+    assert mock_batch.call_args_list[0].args[0] == ["2", "1"]
+    assert mock_batch.call_args_list[1].args[0] == ["1"]
+
+
+def test_search_route(client):
+    with patch(
+        "db_connector.PostRepository.search",
+        return_value=ApiRes.success("OK", [post("1", "Hola")]),
+    ) as mock_search:
+        response = client.get("/post/search?q=hola&limit=5")
+        assert response.status_code == 200
+        assert response.json["data"][0]["id"] == "1"
+        mock_search.assert_called_once_with("hola", 5)
+
+
+def test_search_route_requires_q(client):
+    response = client.get("/post/search")
+    assert response.status_code == 400
+
+
+def test_writes_during_rebuild_are_replayed():
+    index = SearchIndex()
+
+    def loader():
+        # llegan mientras se recorre la colección y el recorrido no las ve
+        index.add(post("2", "Python nuevo"))
+        index.remove("1")
+        return [post("1", "Python viejo")]
+
+    index.ensure_loaded(loader)
+
+    assert [post_id for post_id, _ in index.search("python")] == ["2"]
+    assert index.stats()["posts"] == 1
+
+
+def test_index_rebuilds_periodically():
+    now = [0.0]
+    data = [[post("1", "Python")]]
+    index = SearchIndex(refresh_seconds=10, clock=lambda: now[0])
+
+    index.ensure_loaded(lambda: data[0])
+    data[0] = [post("1", "Python"), post("2", "Python en otra instancia")]
+    now[0] = 11
+    index.ensure_loaded(lambda: data[0])  # dispara la reconstrucción
+
+    for _ in range(100):
+        if index.stats()["posts"] == 2:
+            break
+        time.sleep(0.01)
+
+    assert {post_id for post_id, _ in index.search("python")} == {"1", "2"}
@@ -0,0 +1,139 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from db_connector.storage import (
+    DESC,
+    ID_FIELD,
+    SERVER_TIMESTAMP,
+    DocumentNotFound,
+    Increment,
+    init_storage,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def engine(request, tmp_path):
+    return init_storage(request.param, sqlite_path=str(tmp_path / "test.sqlite3"))
+
+
+def day(n):
+    return datetime(2025, 1, n, tzinfo=timezone.utc)
+
+
+def seed(collection):
+    collection.set("c1", {"post_id": "p", "is_deleted": False, "created_at": day(1)})
+    collection.set("c2", {"post_id": "p", "is_deleted": False, "created_at": day(2)})
+    collection.set("c3", {"post_id": "p", "is_deleted": True, "created_at": day(2)})
+    collection.set("c4", {"post_id": "q", "is_deleted": False, "created_at": day(3)})
+    collection.set("c5", {"post_id": "p", "is_deleted": False})
+
+
+def ids(docs):
+    return [doc.id for doc in docs]
+
+
+def test_get_set_update_delete(engine):
+    posts = engine.collection("posts")
+    posts.set("a", {"title": "Hola", "tags": ["x"]})
+    posts.update("a", {"title": "Chao"})
+
+    assert posts.get("a") == {"title": "Chao", "tags": ["x"]}
+    assert posts.get("b") is None
+    assert posts.get_many(["b", "a"]) == {"a": {"title": "Chao", "tags": ["x"]}}
+
+    with pytest.raises(DocumentNotFound):
+        posts.update("b", {"title": "x"})
+
+    posts.delete("a")
+    assert posts.get("a") is None
+
+
+def test_equality_filters_and_order(engine):
+    comments = engine.collection("comments")
+    seed(comments)
+
+    docs = comments.find(
+        where=[("post_id", "==", "p"), ("is_deleted", "==", False)],
+        order_by=[("created_at", DESC), (ID_FIELD, DESC)],
+    )
+
+    # c5 no tiene created_at: queda fuera, como en Firestore
+    assert ids(docs) == ["c2", "c1"]
+
+
+def test_start_after_and_limit(engine):
+    comments = engine.collection("comments")
+    seed(comments)
+    order_by = [("created_at", DESC), (ID_FIELD, DESC)]
+
+    first = comments.find(order_by=order_by, limit=2)
+    last = first[-1]
+    rest = comments.find(
+        order_by=order_by, start_after=(last.data["created_at"], last.id)
+    )
+
+    assert ids(first) == ["c4", "c3"]
+    assert ids(rest) == ["c2", "c1"]
+
+
+def test_default_order_is_by_id(engine):
+    comments = engine.collection("comments")
+    seed(comments)
+
+    assert ids(comments.find(limit=3)) == ["c1", "c2", "c3"]
+
+
+def test_filter_index_follows_updates(engine):
+    comments = engine.collection("comments")
+    seed(comments)
+    assert ids(comments.find(where=[("post_id", "==", "q")])) == ["c4"]
+
+    comments.update("c4", {"post_id": "p"})
+
+    assert comments.find(where=[("post_id", "==", "q")]) == []
+
+
+def test_server_timestamp_and_increment(engine):
+    counters = engine.collection("counters")
+    counters.set("k", {"count": Increment(2), "at": SERVER_TIMESTAMP})
+    counters.set("k", {"count": Increment(-1)}, merge=True)
+    counters.increment("k", "count", 5)
+
+    data = counters.get("k")
+    assert data["count"] == 6
+    assert isinstance(data["at"], datetime)
+
+
+def test_transaction_rolls_back_on_error(engine):
+    engine.collection("counters").set("k", {"count": 1})
+
+    def fail(transaction):
+        transaction.set("counters", "k", {"count": Increment(1)}, merge=True)
+        raise ValueError("falla")
+
+    with pytest.raises(ValueError):
+        engine.run_transaction(fail)
+
+    assert engine.collection("counters").get("k") == {"count": 1}
+
+
+def test_concurrent_increments(engine):
+    counters = engine.collection("counters")
+
+    def work():
+        for _ in range(50):
+            engine.run_transaction(
+                lambda t: t.set("counters", "k", {"count": Increment(1)}, merge=True)
+            )
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert counters.get("k")["count"] == 200
@@ -8,37 +8,65 @@ Micro Servicio de Usuarios
 
 import sys
 import os
+import time
 from datetime import datetime
 
-from flask import Flask
+from flask import Flask, request
 
-from db_connector import db_check_user_firestore_connection, db_init_user_firestore
+from db_connector import (
+    db_check_user_firestore_connection,
+    db_init_user_firestore,
+    init_storage,
+)
+from db_connector.user_repository import username_index
 from config import Config
+from json_provider import JSONProvider
+from dtos import ApiRes
 from log import logger
 from dotenv import load_dotenv
 
 load_dotenv()
 
+DEADLINE_HEADER = "X-Request-Deadline"
+
 
 def create_app(config_override=None, init_db=True):
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     app.config.from_object(Config)
 
     if config_override:
         app.config.update(config_override)
 
-    if init_db:
+    if init_db and app.config["STORAGE_ENGINE"] == "firestore":
         # desde app para mantener actualizada la credencial sin necesidad de reiniciar
         db_init_user_firestore(app.config["FIREBASE_ADMIN_CREDENTIALS"])
+    elif init_db:
+        init_storage(
+            app.config["STORAGE_ENGINE"], sqlite_path=app.config["STORAGE_SQLITE_PATH"]
+        )
 
     # registrar Blueprints
     from routes import user_api
 
     app.register_blueprint(user_api)
+
+    @app.before_request
+    def drop_expired_requests():
+        # deadline del monolito (epoch ms): si ya pasó, nadie espera la respuesta
+        deadline = request.headers.get(DEADLINE_HEADER, "")
+
+        if deadline.isdigit() and int(deadline) <= time.time() * 1000:
+            logger.info(f"======== Deadline excedido ========\n{request.path=}\n")
+            return ApiRes.error("Deadline excedido", status_code=504).flask_response()
     
     @app.get("/health")
     def health():
-        return {"status": "ok"}
+        # estado de los índices en memoria de esta instancia
+        return {
+            "status": "ok",
+            "indexes": {username_index.name: username_index.stats()},
+        }
     
 
     @app.get("/live")
@@ -12,3 +12,6 @@ class Config:
     FIREBASE_ADMIN_CREDENTIALS = (
         os.environ.get("FIREBASE_ADMIN_CREDENTIALS") or "super-secret-key"
     )
+    # firestore | memory | sqlite (ver db_connector/storage.py)
+    STORAGE_ENGINE = os.environ.get("STORAGE_ENGINE", "firestore")
+    STORAGE_SQLITE_PATH = os.environ.get("STORAGE_SQLITE_PATH", "users.sqlite3")
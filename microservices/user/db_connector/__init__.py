@@ -1,3 +1,4 @@
 from .fire_connection import db_init_user_firestore, db_check_user_firestore_connection
 from .user_repository import UserRepository
 from .user_model import User
+from .storage import init_storage, get_storage
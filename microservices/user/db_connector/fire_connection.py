@@ -11,6 +11,7 @@ from firebase_admin import credentials, firestore
 from datetime import datetime
 from dataclasses import dataclass
 from log import logger
+from .storage import get_storage, init_storage
 
 FIREBASE_USERS_COLLECTION = "users"
 
@@ -28,8 +29,7 @@ def db_check_user_firestore_connection() -> bool:
     global _db_user_collection
 
     try:
-        _db_user_collection.get()
-        return True
+        return get_storage().ping()
     except Exception as e:
         logger.error(f"======== Error al verificar la conexión ========\n{e}\n")
         return False
@@ -42,3 +42,4 @@ def db_init_user_firestore(credentials_path):
     firebase_admin.initialize_app(cred)
     _db = firestore.client()
     _db_user_collection = _db.collection(FIREBASE_USERS_COLLECTION)
+    init_storage("firestore", firestore_client=_db)
@@ -1,14 +1,18 @@
 """
-Este archivo contiene los llamados a Firestore.
+Este archivo contiene los llamados al almacenamiento (ver storage.py).
 
 - Operaciones sobre la base de datos para el microservicio de Usuarios
 - Agregar, obtener, actualizar
 """
 
-from google.cloud.firestore_v1 import FieldFilter
+import os
+from typing import List
+
 from functools import wraps
 
-from .fire_connection import get_user_collection
+from .fire_connection import FIREBASE_USERS_COLLECTION
+from .prefix_index import PrefixIndex
+from .storage import Collection, get_storage
 from .user_model import User
 from dtos import ApiRes
 from log import logger
@@ -32,17 +36,33 @@ def safe_firestore_call(context: str = None):
     return decorator
 
 
+def _users() -> Collection:
+    return get_storage().collection(FIREBASE_USERS_COLLECTION)
+
+
+username_index = PrefixIndex(
+    "usernames",
+    loader=lambda: [
+        (user.id, user.username, [user.username])
+        for user in (User.from_json(doc.data) for doc in _users().find())
+    ],
+    refresh_seconds=float(os.environ.get("PREFIX_INDEX_REFRESH_SECONDS", 300)),
+)
+
+
 class UserRepository:
     @staticmethod
     @safe_firestore_call()
     def save(user: User) -> ApiRes:
         try:
-            get_user_collection().document(str(user.id)).set(user.to_json())
-            doc = get_user_collection().document(str(user.id)).get()
+            _users().set(user.id, user.to_json())
 
-            if not doc.exists:
+            if _users().get(user.id) is None:
                 return ApiRes.internal_error("Error al guardar el usuario")
 
+            # el índice lo ignora si aún no se cargó (el primer recorrido lo verá)
+            username_index.add(user.id, user.username, [user.username])
+
             return ApiRes.created("Usuario guardado correctamente")
         except Exception as e:
             return ApiRes.internal_error("Error al guardar el usuario")
@@ -50,14 +70,10 @@ class UserRepository:
     @staticmethod
     @safe_firestore_call()
     def get_by_username(username: str) -> ApiRes[User]:
-        query_by_username = (
-            get_user_collection()
-            .where(filter=FieldFilter("username", "==", username))
-            .get()
-        )
-
-        if query_by_username:
-            user = User.from_json(query_by_username[0].to_dict())
+        docs = _users().find(where=[("username", "==", username)], limit=1)
+
+        if docs:
+            user = User.from_json(docs[0].data)
             return ApiRes.success("Usuario encontrado", data=user)
         else:
             return ApiRes.not_found("Usuario no encontrado")
@@ -65,12 +81,12 @@ class UserRepository:
     @staticmethod
     @safe_firestore_call()
     def get_by_id(user_id: str) -> ApiRes[User]:
-        doc = get_user_collection().document(str(user_id)).get()
+        data = _users().get(user_id)
 
-        if not doc.exists:
+        if data is None:
             return ApiRes.not_found("Usuario no encontrado")
 
-        user = User.from_json(doc.to_dict())
+        user = User.from_json(data)
         return ApiRes.success("Usuario encontrado", data=user)
 
     @staticmethod
@@ -92,3 +108,13 @@ class UserRepository:
             return ApiRes.success("Usuario encontrado", data=True)
 
         return ApiRes.not_found("Usuario no encontrado", data=False)
+
+    @staticmethod
+    @safe_firestore_call()
+    def autocomplete(prefix: str, limit: int = 10) -> ApiRes[List[dict]]:
+        """Usernames que empiezan por ``prefix`` (sin leer Firestore)."""
+        data = [
+            {"id": user_id, "username": username}
+            for user_id, username in username_index.complete(prefix, limit)
+        ]
+        return ApiRes.success("Sugerencias obtenidas", data=data)
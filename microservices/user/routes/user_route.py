@@ -48,6 +48,19 @@ def profile(username: str):
     return ApiRes.success("Perfil obtenido", data=user).flask_response()
 
 
+@user_api.route("/u/autocomplete", methods=["GET"])
+def autocomplete_users():
+    prefix = request.args.get("prefix", "").strip()
+
+    try:
+        limit = min(int(request.args.get("limit", 10)), 50)
+    except ValueError:
+        limit = 10
+
+    res = UserRepository.autocomplete(prefix, limit)
+    return res.flask_response()
+
+
 @user_api.route("/u/new", methods=["POST"])
 def register_user():
     try:
@@ -0,0 +1,92 @@
+import time
+from unittest.mock import patch
+from db_connector.prefix_index import PrefixIndex
+
+
+def test_prefix_index_matches_normalized_prefix():
+    index = PrefixIndex(
+        "test",
+        loader=lambda: [
+            ("1", "Juan", ["Juan"]),
+            ("2", "júlia", ["júlia"]),
+            ("3", "pedro", ["pedro"]),
+        ],
+        refresh_seconds=0,
+    )
+
+    assert index.complete("JU") == [("1", "Juan"), ("2", "júlia")]
+    assert index.complete("jul") == [("2", "júlia")]
+    assert index.complete("x") == []
+    assert index.complete("") == []
+
+    index.add("2", "maria", ["maria"])
+    index.remove("1")
+    assert index.complete("ju") == []
+    assert index.complete("m") == [("2", "maria")]
+
+
+def test_prefix_index_rebuilds_periodically():
+    now = [0.0]
+    data = [[("1", "ana", ["ana"])]]
+    index = PrefixIndex(
+        "test", lambda: data[0], refresh_seconds=10, clock=lambda: now[0]
+    )
+
+    assert index.complete("a") == [("1", "ana")]
+
+    data[0] = [("1", "ana", ["ana"]), ("2", "andres", ["andres"])]
+    now[0] = 11
+    index.complete("a")  # dispara la reconstrucción en segundo plano
+
+    for _ in range(100):
+        if index.stats()["rebuilds"] == 2:
+            break
+        time.sleep(0.01)
+
+    assert index.complete("and") == [("2", "andres")]
+
+
+def test_writes_during_rebuild_are_replayed():
+    def loader():
+        # llegan mientras se recorre la colección y el recorrido no las ve
+        index.add("2", "andres", ["andres"])
+        index.remove("1")
+        return [("1", "ana", ["ana"])]
+
+    index = PrefixIndex("test", loader, refresh_seconds=0)
+
+    assert index.complete("an") == [("2", "andres")]
+    assert index.stats()["items"] == 1
+
+
+def test_writes_before_load_are_left_to_the_loader():
+    index = PrefixIndex("test", lambda: [("1", "ana", ["ana"])], refresh_seconds=0)
+
+    index.add("2", "andres", ["andres"])  # el recorrido del primer uso manda
+
+    assert index.complete("an") == [("1", "ana")]
+
+
+def test_health_exposes_index_stats(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert set(response.json["indexes"]["usernames"]) == {
+        "loaded",
+        "items",
+        "keys",
+        "rebuilds",
+        "queries",
+    }
+
+
+def test_autocomplete_route(client):
+    with patch(
+        "db_connector.user_repository.username_index.complete",
+        return_value=[("1", "juan")],
+    ) as mock_complete:
+        response = client.get("/u/autocomplete?prefix=ju&limit=5")
+
+    assert response.status_code == 200
+    assert response.json["data"] == [{"id": "1", "username": "juan"}]
+    mock_complete.assert_called_once_with("ju", 5)
@@ -0,0 +1,17 @@
+import time
+from unittest.mock import patch
+
+
+@patch("db_connector.UserRepository.get_by_username")
+def test_expired_deadline_is_dropped(mock_get_user, client):
+    response = client.get(
+        "/u/juan",
+        headers={
+            "X-User-ID": "1",
+            "X-Request-Deadline": str(int((time.time() - 1) * 1000)),
+        },
+    )
+
+    assert response.status_code == 504
+    assert response.json["message"] == "Deadline excedido"
+    mock_get_user.assert_not_called()
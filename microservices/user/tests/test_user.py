@@ -68,3 +68,16 @@ def test_update_user_bio_not_found(mock_get_user, client):
 
     response = client.post("/u/juan", headers={"X-User-ID": "1"}, json={"bio": "Hola"})
     assert response.status_code == 404
+
+
+def test_repository_save_and_find_by_username(storage):
+    from db_connector import UserRepository
+
+    assert UserRepository.save(mock_user(id="u1", username="ana")).success
+    assert UserRepository.save(mock_user(id="u2", username="juan")).success
+
+    res = UserRepository.get_by_username("juan")
+    assert res.success
+    assert res.data.id == "u2"
+    assert UserRepository.get_by_id("u1").data.username == "ana"
+    assert not UserRepository.get_by_username("pedro").success
@@ -6,10 +6,9 @@ from flask import (
     url_for,
     flash,
     abort,
+    current_app,
 )
-import markdown
-
-from services.comment_service import list_comments
+from services.comment_service import list_comments_page
 from services.post_service import (
     create_post as create_post_service,
     get_post,
@@ -17,6 +16,9 @@ from services.post_service import (
     delete_post_by_id,
 )
 from helpers import current_user, login_required
+from helpers.concurrency import submit
+from helpers.http_cache import compute_etag, not_modified, with_etag
+from helpers.markdown_render import render_post
 
 
 post_api = Blueprint("post", __name__)
@@ -48,6 +50,13 @@ def create_post():
 @post_api.route("/post/<string:post_id>")
 @login_required
 def post_detail(post_id: str):
+    cursor = request.args.get("cursor") or None
+    comments_future = None
+
+    if current_app.config.get("CONCURRENT_FETCH"):
+        # los comentarios solo necesitan el id de la URL: se piden en paralelo
+        comments_future = submit(list_comments_page, post_id, cursor)
+
     post = get_post(post_id)
 
     if not post:
@@ -55,26 +64,45 @@ def post_detail(post_id: str):
         abort(400)
 
     comments = []
+    next_cursor = None
 
     try:
-        comments = list_comments(post.id)
+        if comments_future is not None:
+            page = comments_future.result()
+        else:
+            page = list_comments_page(post.id, cursor)
 
-        if comments is None:
-            comments = []
+        if page is None:
             flash("Error al obtener los comentarios", "danger")
+        else:
+            comments, next_cursor = page
     except:
         flash("Error al obtener los comentarios", "danger")
 
-    markdown_content = markdown.markdown(
-        post.content, extensions=["extra", "codehilite", "tables"]
+    user = current_user()
+    etag = compute_etag(
+        post.id,
+        post.updated_at,
+        [(c.id, c.created_at) for c in comments],
+        next_cursor,
+        user.id if user else None,
     )
-    return render_template(
+    response = not_modified(etag)
+
+    if response is not None:
+        return response
+
+    markdown_content = render_post(post)
+    html = render_template(
         "post_detail.html",
         post=post,
-        user=current_user(),
+        user=user,
         comments=comments,
+        cursor=cursor,
+        next_cursor=next_cursor,
         markdown_content=markdown_content,
     )
+    return with_etag(html, etag)
 
 
 @post_api.route("/post/<string:post_id>/edit", methods=["GET", "POST"])
@@ -9,6 +9,7 @@ from flask import (
 )
 
 from helpers import current_user, login_required
+from services.comment_service import get_comment_counts
 from services.post_service import get_user_posts
 from services.user_service import get_user_profile, update_user_profile
 
@@ -36,10 +37,13 @@ def profile(username: str):
             flash("Error al obtener las publicaciones", "error")
             posts = []
 
+        comment_counts = get_comment_counts([p.id for p in posts]) if posts else {}
+
         return render_template(
             "profile.html",
             profile_user=user,
             posts=posts,
+            comment_counts=comment_counts,
             user=current_user(),
         )
     elif request.method == "POST":
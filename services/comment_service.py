@@ -1,12 +1,23 @@
 # services/comment_service.py (MONOLITO) — llama por HTTP al microservicio
-import os
-import requests
 from flask import abort
-from helpers import current_user
+from config import ServicesConfig
+from helpers import current_user, get_client
+from helpers.cache import TTLCache
+from helpers.json_provider import response_json
+from helpers.request_cache import memo_invalidate, memo_set, request_memoized
+from helpers.singleflight import SingleFlight
 from services.post_service import get_post
 from log import logger
 
-COMMENTS_BASE = os.getenv("COMMENTS_BASE", "http://localhost:8091/v1")
+# lecturas idénticas y concurrentes comparten una sola llamada al microservicio
+_flights = SingleFlight("comments")
+
+# post_id -> cantidad de comentarios; el inicio la pide en cada petición
+_counts_cache = TTLCache(
+    "comment_counts",
+    maxsize=ServicesConfig.COMMENT_COUNTS_CACHE_MAXSIZE,
+    ttl=ServicesConfig.COMMENT_COUNTS_CACHE_TTL,
+)
 
 
 class CommentDto:
@@ -36,18 +47,17 @@ def create_comment(post_id: str, content: str, username: str) -> CommentDto | No
         return None
 
     try:
-        r = requests.post(
-            f"{COMMENTS_BASE}/comments",
+        r = get_client("comments").post(
+            "/comments",
             json={"post_id": post_id, "content": content, "username": username},
             headers=_headers_for_user(user),
-            timeout=5,
         )
 
         logger.info(f"======== create_comment ========\n{r.status_code=}\n")
 
         if r.status_code == 201:
-            d = r.json()
-            return CommentDto(
+            d = response_json(r)
+            comment = CommentDto(
                 d["id"],
                 d["post_id"],
                 d["user_id"],
@@ -55,9 +65,14 @@ def create_comment(post_id: str, content: str, username: str) -> CommentDto | No
                 d["created_at"],
                 d["username"],
             )
+            memo_invalidate("comments", post_id)
+            memo_set("comment", comment.id, comment)
+            _counts_cache.invalidate(str(post_id))
+            return comment
 
             logger.error(
-                f"======== create_comment ========\n{r.status_code=} {r.json()}\n"
+                "======== create_comment ========\n"
+                f"{r.status_code=} {response_json(r)}\n"
             )
         elif r.status_code == 401:
             return None
@@ -66,14 +81,16 @@ def create_comment(post_id: str, content: str, username: str) -> CommentDto | No
         return None
 
 
+@request_memoized("comment")
+@_flights.coalesced_call("comment")
 def get_comment_or_404(comment_id: int) -> CommentDto | None:
     try:
-        r = requests.get(f"{COMMENTS_BASE}/comments/{comment_id}", timeout=5)
+        r = get_client("comments").get(f"/comments/{comment_id}")
 
         logger.info(f"======== get_comment_or_404 ========\n{r.status_code=}\n")
 
         if r.status_code == 200:
-            d = r.json()
+            d = response_json(r)
             return CommentDto(
                 d["id"],
                 d["post_id"],
@@ -84,7 +101,8 @@ def get_comment_or_404(comment_id: int) -> CommentDto | None:
             )
 
             logger.error(
-                f"======== get_comment_or_404 ========\n{r.status_code=} {r.json()}\n"
+                "======== get_comment_or_404 ========\n"
+                f"{r.status_code=} {response_json(r)}\n"
             )
         elif r.status_code == 404:
             return None
@@ -115,15 +133,17 @@ def delete_comment(comment: CommentDto) -> bool:
         headers["X-User-Role"] = "moderator"
 
     try:
-        r = requests.delete(
-            f"{COMMENTS_BASE}/comments/{comment.id}", headers=headers, timeout=5
-        )
+        r = get_client("comments").delete(f"/comments/{comment.id}", headers=headers)
     except Exception as e:
         logger.error(f"======== Error delete_comment ========\n{e}\n")
         return False
 
     logger.info(f"======== delete_comment ========\n{r.status_code=}\n")
 
+    memo_invalidate("comment", comment.id)
+    memo_invalidate("comments", comment.post_id)
+    _counts_cache.invalidate(str(comment.post_id))
+
     if r.status_code in (200, 204):
         return True
     else:
@@ -149,15 +169,53 @@ def is_comment_owner_or_post_owner(comment: CommentDto) -> bool:
     return (post is not None) and (str(post.user_id) == str(user.id))
 
 
-def list_comments(post_id: str) -> list[CommentDto] | None:
-    url = f"{COMMENTS_BASE}/comments"
+def _to_dto(d: dict) -> CommentDto:
+    return CommentDto(
+        d["id"],
+        d["post_id"],
+        d["user_id"],
+        d["content"],
+        d["created_at"],
+        d["username"],
+    )
+
+
+def list_comments_page(
+    post_id: str,
+    cursor: str | None = None,
+    per_page: int = ServicesConfig.COMMENTS_PAGE_SIZE,
+) -> tuple[list[CommentDto], str | None] | None:
+    """
+    Página de comentarios de un post (del más nuevo al más viejo).
+
+    Parameters:
+        post_id (str): El ID del post.
+        cursor (str | None): ``next_cursor`` de la página anterior; None para la primera.
+        per_page (int): Comentarios por página.
+
+    Returns:
+        (comentarios, next_cursor): next_cursor es None si no hay más páginas.
+        None si no se pudo obtener la página.
+    """
+    # misma llave con o sin argumentos por defecto
+    return _fetch_comments_page(str(post_id), cursor or None, per_page)
+
+
+@request_memoized("comments")
+@_flights.coalesced_call("comments")
+def _fetch_comments_page(
+    post_id: str, cursor: str | None, per_page: int
+) -> tuple[list[CommentDto], str | None] | None:
+    url = "/comments"
+    params = {"post_id": post_id, "per_page": per_page}
+
+    if cursor:
+        params["cursor"] = cursor
 
     logger.info(f"======== list_comments ========\n{url=}\n{post_id=}\n")
 
     try:
-        r = requests.get(
-            f"{COMMENTS_BASE}/comments", params={"post_id": post_id}, timeout=5
-        )
+        r = get_client("comments").get(url, params=params)
     except Exception as e:
         logger.error(f"======== Error list_comments ========\n{e}\n")
         return None
@@ -167,16 +225,54 @@ def list_comments(post_id: str) -> list[CommentDto] | None:
     if r.status_code != 200:
         return None
 
-    data = r.json()
+    data = response_json(r)
     items = data.get("items", [])
-    return [
-        CommentDto(
-            d["id"],
-            d["post_id"],
-            d["user_id"],
-            d["content"],
-            d["created_at"],
-            d["username"],
-        )
-        for d in items
-    ]
+    return [_to_dto(d) for d in items], data.get("next_cursor")
+
+
+def get_comment_counts(post_ids: list[str]) -> dict[str, int]:
+    """
+    Cantidad de comentarios de varios posts, desde la caché o en llamadas de
+    hasta 100 posts.
+
+    Returns:
+        dict[str, int]: post_id -> cantidad; vacío si no se pudo obtener.
+    """
+    post_ids = list(dict.fromkeys(str(post_id) for post_id in post_ids))
+    counts = {}
+    missing = []
+
+    for post_id in post_ids:
+        count = _counts_cache.get(post_id)
+
+        if count is None:
+            missing.append(post_id)
+        else:
+            counts[post_id] = count
+
+    since = _counts_cache.generation()
+
+    try:
+        for i in range(0, len(missing), 100):
+            r = get_client("comments").get(
+                "/comments/counts",
+                params={"post_ids": ",".join(missing[i : i + 100])},
+            )
+
+            if r.status_code != 200:
+                logger.error(
+                    f"======== get_comment_counts ========\n{r.status_code=}\n"
+                )
+                return {}
+
+            fetched = response_json(r)["counts"]
+
+            for post_id, count in fetched.items():
+                _counts_cache.set(post_id, count, since=since)
+
+            counts.update(fetched)
+    except Exception as e:
+        logger.error(f"======== Error get_comment_counts ========\n{e}\n")
+        return {}
+
+    return counts
@@ -14,15 +14,55 @@ Desacoplar la lógica de autenticación de usuarios de la aplicación con los en
 Llamar al microservicio de Post
 """
 
-from typing import Optional, List
-import requests
+from typing import Optional, List, Tuple
 
 from config import ServicesConfig
-from helpers import current_user
-from dtos import PostDto
+from helpers import current_user, get_client
+from helpers.cache import SWRCache, TTLCache
+from helpers.hedging import Hedger
+from helpers.json_provider import response_json
+from helpers.request_cache import (
+    memo_get,
+    memo_invalidate,
+    memo_set,
+    request_memoized,
+)
+from helpers.singleflight import SingleFlight
+from dtos import PostDto, wire
 from log import logger
 
-_TIMEOUT = 5
+# lecturas idénticas y concurrentes comparten una sola llamada al microservicio
+_flights = SingleFlight("post")
+
+# máximo de ids por llamada a /post/batch
+BATCH_MAX_IDS = 100
+
+# hedging opcional de las lecturas (GET idempotentes)
+_hedger = (
+    Hedger(
+        "post",
+        percentile=ServicesConfig.HEDGE_PERCENTILE,
+        min_delay=ServicesConfig.HEDGE_MIN_DELAY,
+        max_extra_ratio=ServicesConfig.HEDGE_MAX_EXTRA_RATIO,
+    )
+    if ServicesConfig.POST_HEDGING_ENABLED
+    else None
+)
+
+# read-through: get_post consulta aquí antes de llamar al microservicio
+_post_cache = TTLCache(
+    "posts",
+    maxsize=ServicesConfig.POST_CACHE_MAXSIZE,
+    ttl=ServicesConfig.POST_CACHE_TTL,
+)
+
+# inicio: se sirve viejo mientras un hilo en segundo plano lo refresca
+_feed_cache = SWRCache(
+    "feed",
+    fresh_for=ServicesConfig.FEED_CACHE_FRESH,
+    max_stale=ServicesConfig.FEED_CACHE_MAX_STALE,
+    maxsize=ServicesConfig.FEED_CACHE_MAXSIZE,
+)
 
 
 def _headers_for_user(user_id: str = None):
@@ -34,6 +74,37 @@ def _headers_for_user(user_id: str = None):
     return {"X-User-Id": str(header_id)}
 
 
+def _feed_changed():
+    """
+    Tras crear, editar o eliminar un post: el inicio y la búsqueda se vuelven a
+    pedir en la próxima lectura, sin la copia vieja ni las llamadas en vuelo.
+    """
+    _feed_cache.clear()
+    _flights.forget("feed_page")
+    _flights.forget("search")
+
+
+def _summary_params(params: dict) -> dict:
+    """
+    Pedir los posts del inicio y de la búsqueda con el contenido recortado
+    (dtos/wire.py); esos PostDto no se guardan en ``_post_cache``.
+    """
+    if ServicesConfig.FEED_SUMMARY_VIEW:
+        params[wire.VIEW_PARAM] = wire.SUMMARY_VIEW
+
+    return params
+
+
+def _read(path: str, **kwargs):
+    """GET idempotente al microservicio de Post, con hedging si está activo."""
+    client = get_client("post")
+
+    if _hedger is None:
+        return client.get(path, **kwargs)
+
+    return _hedger.call(lambda: client.get(path, **kwargs))
+
+
 def create_post(username: str, title: str, content: str) -> Optional[PostDto]:
     """
     Crear un nuevo post en el microservicio de Post.
@@ -47,23 +118,26 @@ def create_post(username: str, title: str, content: str) -> Optional[PostDto]:
         Optional[PostDto]: El post creado, o None si no se pudo crear el post.
     """
     try:
-        post_rq = requests.post(
-            f"{ServicesConfig.POST_SERVICE_URL}/post/new",
+        post_rq = get_client("post").post(
+            "/post/new",
             headers=_headers_for_user(),
             json={
                 "title": title.strip(),
                 "content": content.strip(),
                 "username": username,
             },
-            timeout=_TIMEOUT,
         )
 
-        post = PostDto.from_json(post_rq.json()["data"])
+        post = PostDto.from_json(response_json(post_rq)["data"])
+        _post_cache.set(post.id, post)
+        _feed_changed()
+        memo_set("post", post.id, post)
         return post
     except:
         return None
 
 
+@request_memoized("post")
 def get_post(post_id: str) -> Optional[PostDto]:
     """
     Obtener un post por su ID en el microservicio de Post.
@@ -74,17 +148,72 @@ def get_post(post_id: str) -> Optional[PostDto]:
     Returns:
         Optional[PostDto]: El post obtenido, o None si no se pudo obtener el post.
     """
+    post = _post_cache.get(str(post_id))
+
+    if post is not None:
+        return post
+
+    return _fetch_post(post_id)
+
+
+@_flights.coalesced_call("post")
+def _fetch_post(post_id: str) -> Optional[PostDto]:
+    since = _post_cache.generation()
+
     try:
-        post_rq = requests.get(
-            f"{ServicesConfig.POST_SERVICE_URL}/post/{post_id}",
-            headers=_headers_for_user(),
-            timeout=_TIMEOUT,
-        )
-        return PostDto.from_json(post_rq.json()["data"])
+        post_rq = _read(f"/post/{post_id}", headers=_headers_for_user())
+        post = PostDto.from_json(response_json(post_rq)["data"])
+        _post_cache.set(post.id, post, since=since)
+        return post
     except:
         return None
 
 
+def get_posts(post_ids: List[str]) -> Optional[List[PostDto]]:
+    """
+    Obtener varios posts por ID, en el orden pedido.
+
+    Primero se consulta la memo de la petición y la caché; los que faltan se
+    piden al microservicio en una sola llamada a /post/batch (por bloques de
+    BATCH_MAX_IDS). Los posts que no existen se omiten.
+
+    Parameters:
+        post_ids (List[str]): Los IDs de los posts a obtener.
+
+    Returns:
+        Optional[List[PostDto]]: Los posts encontrados, o None si falló la llamada.
+    """
+    post_ids = list(dict.fromkeys(str(post_id) for post_id in post_ids))
+    found = {}
+
+    for post_id in post_ids:
+        post = memo_get("post", post_id) or _post_cache.get(post_id)
+
+        if post is not None:
+            found[post_id] = post
+
+    missing = [post_id for post_id in post_ids if post_id not in found]
+    since = _post_cache.generation()
+
+    try:
+        for i in range(0, len(missing), BATCH_MAX_IDS):
+            chunk = missing[i : i + BATCH_MAX_IDS]
+            post_req = _read("/post/batch", params={"ids": ",".join(chunk)})
+
+            for data in response_json(post_req)["data"]:
+                post = PostDto.from_json(data)
+                _post_cache.set(post.id, post, since=since)
+                found[post.id] = post
+    except Exception as e:
+        logger.error(f"======== Error al obtener los posts ========\n{e}\n")
+        return None
+
+    for post_id, post in found.items():
+        memo_set("post", post_id, post)
+
+    return [found[post_id] for post_id in post_ids if post_id in found]
+
+
 def update_post(post_id: str, title: str, content: str) -> Optional[PostDto]:
     """
     Actualizar un post en el microservicio de Post.
@@ -98,17 +227,20 @@ def update_post(post_id: str, title: str, content: str) -> Optional[PostDto]:
         Optional[PostDto]: El post actualizado, o None si no se pudo actualizar el post.
     """
     try:
-        post_req = requests.post(
-            f"{ServicesConfig.POST_SERVICE_URL}/post/{post_id}/edit",
+        post_req = get_client("post").post(
+            f"/post/{post_id}/edit",
             headers=_headers_for_user(),
             json={
                 "title": title.strip(),
                 "content": content.strip(),
             },
-            timeout=_TIMEOUT,
         )
 
-        return PostDto.from_json(post_req.json()["data"])
+        post = PostDto.from_json(response_json(post_req)["data"])
+        _post_cache.set(post.id, post)
+        _feed_changed()
+        memo_set("post", post.id, post)
+        return post
     except:
         return None
 
@@ -124,17 +256,20 @@ def delete_post_by_id(post_id: str) -> bool:
         bool: True si se pudo eliminar el post, False en caso contrario.
     """
     try:
-        post_req = requests.post(
-            f"{ServicesConfig.POST_SERVICE_URL}/post/{post_id}/delete",
+        post_req = get_client("post").post(
+            f"/post/{post_id}/delete",
             headers=_headers_for_user(),
-            timeout=_TIMEOUT,
         )
 
+        _post_cache.invalidate(str(post_id))
+        _feed_changed()
+        memo_invalidate("post", post_id)
         return post_req.status_code >= 200 and post_req.status_code < 300
     except:
         return False
 
 
+@_flights.coalesced_call("user_posts")
 def get_user_posts(user_id) -> Optional[List[PostDto]]:
     """
     Obtener los posts de un usuario en el microservicio de Post.
@@ -146,12 +281,11 @@ def get_user_posts(user_id) -> Optional[List[PostDto]]:
         Optional[List[PostDto]]: La lista de posts del usuario, o None si no se pudo obtener los posts.
     """
     try:
-        post_req = requests.get(
-            f"{ServicesConfig.POST_SERVICE_URL}/post/user/{user_id}",
-            timeout=_TIMEOUT,
+        post_req = get_client("post").get(
+            f"/post/user/{user_id}",
         )
 
-        data = post_req.json()["data"]
+        data = response_json(post_req)["data"]
 
         if len(data) == 0:
             return []
@@ -161,31 +295,100 @@ def get_user_posts(user_id) -> Optional[List[PostDto]]:
         return None
 
 
-def get_post_limit(limit: int, title: str) -> Optional[List[PostDto]]:
+@_flights.coalesced_call("feed_page")
+def get_post_page(
+    limit: int, after: Optional[str] = None
+) -> Optional[Tuple[List[PostDto], Optional[str]]]:
     """
-    Obtener los posts de un usuario en el microservicio de Post.
+    Obtener una página del inicio paginada por cursor.
 
     Parameters:
-        user_id (str): El ID del usuario a obtener los posts.
+        limit (int): Cantidad máxima de posts.
+        after (Optional[str]): ``next_cursor`` de la página anterior.
 
     Returns:
-        Optional[List[PostDto]]: La lista de posts del usuario, o None si no se pudo obtener los posts.
+        Optional[Tuple[List[PostDto], Optional[str]]]: Los posts y el cursor de la
+        siguiente página (None si no hay más), o None si no se pudo obtener.
     """
     try:
-        url = f"{ServicesConfig.POST_SERVICE_URL}/post/limit/{limit}?title={title}"
-        logger.info(f"======== Obteniendo posts ========\n{url=}\n")
+        params = {"limit": limit}
 
-        post_req = requests.get(
-            url,
-            timeout=_TIMEOUT,
-        )
-
-        data = post_req.json()["data"]
+        if after:
+            params["after"] = after
 
-        if len(post_req.json()["data"]) == 0:
-            return []
+        post_req = _read("/post/feed", params=_summary_params(params))
+        data = response_json(post_req)["data"]
 
-        return [PostDto.from_json(post) for post in post_req.json()["data"]]
+        return [PostDto.from_json(post) for post in data["items"]], data["next_cursor"]
     except Exception as e:
         logger.error(f"======== Error al obtener los posts ========\n{e}\n")
         return None
+
+
+def get_feed_page(
+    limit: int, after: Optional[str] = None
+) -> Optional[Tuple[List[PostDto], Optional[str]]]:
+    """
+    Obtener una página del inicio (scroll infinito) desde la caché
+    stale-while-revalidate.
+
+    Parameters:
+        limit (int): Cantidad máxima de posts.
+        after (Optional[str]): ``next_cursor`` de la página anterior.
+
+    Returns:
+        Optional[Tuple[List[PostDto], Optional[str]]]: Los posts y el cursor de la
+        siguiente página, o None si no se pudo obtener.
+    """
+    return _feed_cache.get_or_load(
+        ("page", limit, after or None), lambda: get_post_page(limit, after)
+    )
+
+
+@_flights.coalesced_call("search")
+def _fetch_search(query: str, limit: int) -> Optional[List[PostDto]]:
+    try:
+        params = _summary_params({"q": query, "limit": limit})
+        post_req = _read("/post/search", params=params)
+        return [PostDto.from_json(post) for post in response_json(post_req)["data"]]
+    except Exception as e:
+        logger.error(f"======== Error al buscar los posts ========\n{e}\n")
+        return None
+
+
+def search_posts(query: str, limit: int = 25) -> Optional[List[PostDto]]:
+    """
+    Buscar posts por título y contenido (ordenados por relevancia).
+
+    Parameters:
+        query (str): Texto a buscar.
+        limit (int): Cantidad máxima de posts.
+
+    Returns:
+        Optional[List[PostDto]]: Los posts encontrados, o None si no se pudo buscar.
+    """
+    query = " ".join(query.split())
+
+    if not query:
+        return []
+
+    return _feed_cache.get_or_load(
+        ("search", limit, query), lambda: _fetch_search(query, limit)
+    )
+
+
+def autocomplete_posts(prefix: str, limit: int = 5) -> List[dict]:
+    """
+    Sugerencias de títulos para buscar mientras se escribe.
+
+    Returns:
+        List[dict]: ``{"id", "title"}`` por sugerencia; vacía si falló la llamada.
+    """
+    try:
+        post_req = _read(
+            "/post/autocomplete", params={"prefix": prefix, "limit": limit}
+        )
+        return response_json(post_req)["data"]
+    except Exception as e:
+        logger.error(f"======== Error autocomplete_posts ========\n{e}\n")
+        return []
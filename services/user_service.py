@@ -15,14 +15,16 @@ Llamar al microservicio de Post
 """
 
 from typing import Optional, List
-import requests
 
-from config import ServicesConfig
-from helpers import current_user
+from helpers import current_user, get_client
+from helpers.json_provider import response_json
+from helpers.request_cache import memo_invalidate, request_memoized
+from helpers.singleflight import SingleFlight
 from dtos import UserDto
 from log import logger
 
-_TIMEOUT = 5
+# lecturas idénticas y concurrentes comparten una sola llamada al microservicio
+_flights = SingleFlight("user")
 
 
 def _headers_for_user(user_id: str = None):
@@ -46,17 +48,18 @@ def create_user_profile(user_id: str, username: str) -> Optional[UserDto]:
         Optional[UserDto]: El perfil del usuario creado, o None si no se pudo crear el perfil.
     """
     try:
-        req = requests.post(
-            f"{ServicesConfig.USER_SERVICE_URL}/u/new",
+        req = get_client("user").post(
+            "/u/new",
             json={"id": str(user_id), "username": username.strip()},
-            timeout=_TIMEOUT,
         )
 
-        return UserDto.from_json(req.json()["data"])
+        return UserDto.from_json(response_json(req)["data"])
     except:
         return None
 
 
+@request_memoized("user")
+@_flights.coalesced_call("user")
 def get_user_profile(username: str) -> Optional[UserDto]:
     """
     Obtener el perfil de un usuario en el microservicio de Usuario.
@@ -68,13 +71,12 @@ def get_user_profile(username: str) -> Optional[UserDto]:
         Optional[UserDto]: El perfil del usuario, o None si no se pudo obtener el perfil.
     """
     try:
-        req = requests.get(
-            f"{ServicesConfig.USER_SERVICE_URL}/u/{username}",
+        req = get_client("user").get(
+            f"/u/{username}",
             headers=_headers_for_user(),
-            timeout=_TIMEOUT,
         )
 
-        return UserDto.from_json(req.json()["data"])
+        return UserDto.from_json(response_json(req)["data"])
     except:
         return None
 
@@ -91,13 +93,13 @@ def update_user_profile(username: str, bio: str) -> bool:
         Optional[UserDto]: El perfil del usuario actualizado, o None si no se pudo actualizar el perfil.
     """
     try:
-        req = requests.post(
-            f"{ServicesConfig.USER_SERVICE_URL}/u/{username}",
+        req = get_client("user").post(
+            f"/u/{username}",
             headers=_headers_for_user(),
             json={"bio": bio.strip()},
-            timeout=_TIMEOUT,
         )
 
+        memo_invalidate("user", username)
         return req.status_code >= 200 and req.status_code < 300
     except:
         return False
@@ -105,14 +107,13 @@ def update_user_profile(username: str, bio: str) -> bool:
 
 def exist_user(user_id: str, username) -> bool:
     try:
-        url = f"{ServicesConfig.USER_SERVICE_URL}/u/exists"
+        url = "/u/exists"
 
         logger.info(f"======== Buscando usuario ========\n{user_id=}\n{username=}\n")
 
-        req = requests.get(
+        req = get_client("user").get(
             url,
             json={"id": user_id, "username": username},
-            timeout=_TIMEOUT,
         )
 
         logger.info(f"======== Buscando usuario ========\n{req.status_code=}\n")
@@ -121,3 +122,20 @@ def exist_user(user_id: str, username) -> bool:
     except Exception as e:
         logger.error(f"======== Error al buscar el usuario ========\n{e}\n")
         return False
+
+
+def autocomplete_users(prefix: str, limit: int = 5) -> List[dict]:
+    """
+    Sugerencias de usernames para buscar mientras se escribe.
+
+    Returns:
+        List[dict]: ``{"id", "username"}`` por sugerencia; vacía si falló la llamada.
+    """
+    try:
+        user_req = get_client("user").get(
+            "/u/autocomplete", params={"prefix": prefix, "limit": limit}
+        )
+        return response_json(user_req)["data"]
+    except Exception as e:
+        logger.error(f"======== Error autocomplete_users ========\n{e}\n")
+        return []
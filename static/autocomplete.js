@@ -0,0 +1,49 @@
+// Sugerencias del buscador mientras se escribe (títulos y usernames)
+;(function () {
+  const input = document.getElementById('input-search')
+  const list = document.getElementById('search-suggestions')
+
+  if (!input || !list) return
+
+  let timer = null
+  let lastPrefix = ''
+
+  async function suggest(prefix) {
+    try {
+      const res = await fetch('/autocomplete?prefix=' + encodeURIComponent(prefix))
+      if (!res.ok || prefix !== lastPrefix) return
+
+      const data = await res.json()
+      const values = [
+        ...data.posts.map((p) => p.title),
+        ...data.users.map((u) => u.username),
+      ]
+
+      list.replaceChildren(
+        ...[...new Set(values)].map((value) => {
+          const option = document.createElement('option')
+          option.value = value
+          return option
+        })
+      )
+    } catch (e) {
+      console.error(e)
+    }
+  }
+
+  input.addEventListener('input', () => {
+    const prefix = input.value.trim()
+    clearTimeout(timer)
+
+    if (prefix.length < 2) {
+      list.replaceChildren()
+      return
+    }
+
+    // esperar a que se deje de escribir para no llamar en cada tecla
+    timer = setTimeout(() => {
+      lastPrefix = prefix
+      suggest(prefix)
+    }, 150)
+  })
+})()
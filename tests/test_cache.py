@@ -0,0 +1,163 @@
+from helpers.cache import TTLCache, cache_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiration():
+    clock = FakeClock()
+    cache = TTLCache("test-ttl", maxsize=10, ttl=5, clock=clock)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.now = 5
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_lru_eviction():
+    cache = TTLCache("test-lru", maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" pasa a ser el menos usado
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert "test-lru" in cache_stats()
+
+
+def test_invalidate_and_disabled():
+    cache = TTLCache("test-off", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    disabled = TTLCache("test-disabled", maxsize=2, ttl=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+
+def test_swr_serves_stale_and_refreshes_once():
+    import threading
+
+    from helpers.cache import SWRCache
+
+    clock = FakeClock()
+    cache = SWRCache("test-swr", fresh_for=5, max_stale=10, maxsize=4, clock=clock)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(clock.now)
+
+        if len(calls) > 1:
+            release.wait(2)
+
+        return len(calls)
+
+    assert cache.get_or_load("feed", loader) == 1
+    assert cache.get_or_load("feed", loader) == 1
+
+    clock.now = 6  # vieja pero servible: un solo refresco en segundo plano
+    assert cache.get_or_load("feed", loader) == 1
+    assert cache.get_or_load("feed", loader) == 1
+    release.set()
+
+    for _ in range(100):
+        if cache.stats()["refreshes"]:
+            break
+        threading.Event().wait(0.01)
+
+    assert cache.get_or_load("feed", loader) == 2
+    assert len(calls) == 2
+
+    clock.now = 100  # demasiado vieja: carga síncrona
+    assert cache.get_or_load("feed", loader) == 3
+
+
+def test_load_started_before_a_write_is_not_stored():
+    cache = TTLCache("test-generations", maxsize=2, ttl=60)
+
+    since = cache.generation()
+    cache.set("p1", "editado")  # escritura mientras la carga estaba en vuelo
+    cache.set("p1", "viejo", since=since)
+    assert cache.get("p1") == "editado"
+
+    since = cache.generation()
+    cache.invalidate("p1")
+    cache.set("p1", "viejo", since=since)
+    assert cache.get("p1") is None
+
+    cache.set("p2", "nuevo", since=cache.generation())
+    assert cache.get("p2") == "nuevo"
+
+    # al olvidar llaves se descartan cargas de más, nunca de menos
+    since = cache.generation()
+    cache.invalidate("p1")
+    cache.invalidate("p3")
+    cache.invalidate("p4")
+    cache.set("p1", "viejo", since=since)
+    assert cache.get("p1") is None
+    assert cache.stats()["outdated"] == 3
+
+
+def test_swr_load_started_before_clear_is_not_stored():
+    from helpers.cache import SWRCache
+
+    cache = SWRCache("test-swr-clear", fresh_for=5, max_stale=10, maxsize=4)
+    calls = []
+
+    def loader():
+        calls.append(1)
+
+        if len(calls) == 1:
+            cache.clear()  # una escritura llega durante la carga
+            return "viejo"
+
+        return "nuevo"
+
+    assert cache.get_or_load("feed", loader) == "viejo"
+    assert cache.get_or_load("feed", loader) == "nuevo"
+    assert cache.get_or_load("feed", loader) == "nuevo"
+    assert cache.stats()["outdated"] == 1
+
+
+def test_sized_lru_evicts_by_bytes():
+    from helpers.cache import SizedLRU
+
+    cache = SizedLRU("test-sized", maxbytes=10)
+
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache.get("a")  # "b" pasa a ser el menos usado
+    cache.set("c", "cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get_or_set("c", lambda: "otro") == "cccc"
+
+    cache.set("big", "x" * 11)  # no cabe: no desaloja a los demás
+    assert cache.get("big") is None
+
+    stats = cache.stats()
+    assert stats["bytes"] == 8
+    assert stats["evictions"] == 1
+    assert stats["rejected"] == 1
+
+    cache.resize(4)  # queda solo la más usada
+    assert cache.get("a") is None
+    assert cache.get("c") == "cccc"
@@ -0,0 +1,78 @@
+from helpers.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    breaker_stats,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **kwargs):
+    options = dict(
+        window=4,
+        min_calls=4,
+        error_rate=0.5,
+        slow_call_seconds=1.0,
+        slow_call_rate=0.75,
+        open_seconds=10,
+        half_open_calls=1,
+    )
+    options.update(kwargs)
+    return CircuitBreaker("test", clock=clock, **options)
+
+
+def test_opens_on_error_rate_and_short_circuits():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for failed in (False, True, False, True):
+        assert breaker.allow_request()
+        if failed:
+            breaker.record_failure(0.1)
+        else:
+            breaker.record_success(0.1)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker_stats()["test"]["short_circuited"] == 1
+
+
+def test_opens_on_slow_calls():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(3):
+        breaker.record_success(2.0)
+    breaker.record_success(0.1)
+
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(4):
+        breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # una sola prueba a la vez
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
@@ -0,0 +1,76 @@
+import json
+
+import requests
+from flask import Flask
+
+from services import comment_service
+
+
+class FakeClient:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.calls = []
+
+    def get(self, path, params=None, **kwargs):
+        self.calls.append((path, params))
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = self.body
+        return response
+
+
+def test_comments_page_is_memoized_per_cursor(monkeypatch):
+    client = FakeClient(
+        b'{"items": [{"id": "c1", "post_id": "p1", "user_id": "u1", '
+        b'"content": "hola", "created_at": "x", "username": "juan"}], '
+        b'"next_cursor": "abc"}'
+    )
+    monkeypatch.setattr(comment_service, "get_client", lambda name: client)
+
+    with Flask(__name__).test_request_context():
+        comments, next_cursor = comment_service.list_comments_page("p1")
+        assert [c.id for c in comments] == ["c1"]
+        assert next_cursor == "abc"
+        assert comment_service.list_comments_page("p1", None) is (
+            comment_service.list_comments_page("p1")
+        )
+        comment_service.list_comments_page("p1", "abc")
+
+    assert [params.get("cursor") for _, params in client.calls] == [None, "abc"]
+
+
+class CountsClient:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, path, params=None, **kwargs):
+        post_ids = params["post_ids"].split(",")
+        self.calls.append(post_ids)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        counts = {post_id: int(post_id[1:]) for post_id in post_ids}
+        response._content = json.dumps({"counts": counts}).encode()
+        return response
+
+
+def test_comment_counts_are_chunked_and_cached(monkeypatch):
+    client = CountsClient()
+    monkeypatch.setattr(comment_service, "get_client", lambda name: client)
+    comment_service._counts_cache.clear()
+    post_ids = [f"p{i}" for i in range(150)]
+
+    counts = comment_service.get_comment_counts(post_ids + ["p0"])
+    assert counts == {f"p{i}": i for i in range(150)}
+    assert [len(chunk) for chunk in client.calls] == [100, 50]
+
+    # solo se piden los que no están en la caché
+    comment_service._counts_cache.invalidate("p7")
+    assert comment_service.get_comment_counts(["p1", "p7", "p200"]) == {
+        "p1": 1,
+        "p7": 7,
+        "p200": 200,
+    }
+    assert client.calls[2] == ["p7", "p200"]
+    comment_service._counts_cache.clear()
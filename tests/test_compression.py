@@ -0,0 +1,64 @@
+import gzip
+
+from flask import Flask, url_for
+
+from build_static import build
+from helpers.compression import IMMUTABLE_CACHE, init_compression
+
+
+def make_app(static_dir):
+    app = Flask(__name__, static_folder=str(static_dir))
+    app.config.update(COMPRESS_MIN_SIZE=100)
+
+    @app.get("/big")
+    def big():
+        return "<p>hola</p>" * 100
+
+    @app.get("/small")
+    def small():
+        return "<p>hola</p>"
+
+    init_compression(app)
+    return app
+
+
+def test_dynamic_responses_are_gzipped_above_threshold(tmp_path):
+    client = make_app(tmp_path).test_client()
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b"<p>hola</p>" * 100
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    assert "Content-Encoding" not in client.get("/small").headers
+    assert "Content-Encoding" not in client.get("/big").headers
+
+
+def test_fingerprinted_static_served_precompressed(tmp_path):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (static_dir / "style.css").write_text("body { color: red; }" * 50)
+    (static_dir / "logo.png").write_bytes(b"\x89PNG")
+
+    manifest = build(str(static_dir), str(static_dir / "dist"))
+    app = make_app(static_dir)
+    client = app.test_client()
+
+    with app.test_request_context():
+        css_url = url_for("static", filename="style.css")
+        png_url = url_for("static", filename="logo.png")
+
+    assert css_url == "/static/dist/" + manifest["style.css"]
+
+    response = client.get(css_url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE
+    assert response.mimetype == "text/css"
+    assert gzip.decompress(response.data) == b"body { color: red; }" * 50
+    response.close()
+
+    response = client.get(png_url, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.data == b"\x89PNG"
+    response.close()
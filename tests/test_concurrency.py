@@ -0,0 +1,27 @@
+import threading
+
+from flask import Flask, g, session
+
+from helpers.concurrency import submit
+
+
+def test_submit_runs_with_request_context_and_g():
+    app = Flask(__name__)
+    app.secret_key = "test"
+
+    with app.test_request_context("/post/p1"):
+        session["user_id"] = "u1"
+        g.marker = "parent"
+
+        def work():
+            return session.get("user_id"), g.marker, threading.current_thread()
+
+        user_id, marker, thread = submit(work).result(timeout=2)
+
+    assert user_id == "u1"
+    assert marker == "parent"
+    assert thread is not threading.current_thread()
+
+
+def test_submit_outside_request():
+    assert submit(lambda x: x * 2, 21).result(timeout=2) == 42
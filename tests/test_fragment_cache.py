@@ -0,0 +1,52 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from jinja2 import Environment
+
+from helpers.fragment_cache import FragmentCacheExtension, fragment_key
+
+
+def make_env(calls):
+    env = Environment(extensions=[FragmentCacheExtension], autoescape=True)
+    env.globals["fragment_key"] = fragment_key
+    env.globals["render"] = lambda: calls.append(1) or ""
+    return env
+
+
+def post(id, updated_at):
+    return SimpleNamespace(id=id, updated_at=datetime(2025, 1, updated_at))
+
+
+def test_fragment_is_rendered_once_per_key():
+    calls = []
+    template = make_env(calls).from_string(
+        '{{ user }}|{% cache fragment_key("t", posts), 60 %}'
+        "{{ render() }}{% for p in posts %}<{{ p.id }}>{% endfor %}"
+        "{% endcache %}"
+    )
+    posts = [post("a", 1), post("b", 1)]
+
+    assert template.render(user="ana", posts=posts) == "ana|<a><b>"
+    assert template.render(user="luis", posts=posts) == "luis|<a><b>"
+    assert len(calls) == 1
+
+    # editar un post cambia su updated_at y con eso la llave
+    template.render(user="ana", posts=[post("a", 2), post("b", 1)])
+    assert len(calls) == 2
+
+
+def test_none_key_disables_cache():
+    calls = []
+    template = make_env(calls).from_string(
+        "{% cache None %}{{ render() }}{% endcache %}"
+    )
+
+    template.render()
+    template.render()
+    assert len(calls) == 2
+
+
+def test_fragment_key_includes_extra_data():
+    posts = [post("a", 1)]
+    assert fragment_key("t", posts, {"a": 1}) != fragment_key("t", posts, {"a": 2})
+    assert fragment_key("t", posts) != fragment_key("u", posts)
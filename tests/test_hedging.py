@@ -0,0 +1,63 @@
+import threading
+import time
+
+from helpers.hedging import Hedger
+
+
+def test_slow_primary_is_hedged_and_backup_wins():
+    hedger = Hedger("test-hedge", min_delay=0.02, max_extra_ratio=1.0)
+    attempts = []
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            attempts.append(1)
+            first = len(attempts) == 1
+
+        time.sleep(0.5 if first else 0.01)
+        return "primary" if first else "backup"
+
+    start = time.monotonic()
+    assert hedger.call(fetch) == "backup"
+    assert time.monotonic() - start < 0.3
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+def test_fast_calls_are_not_hedged():
+    hedger = Hedger("test-fast", min_delay=0.2, max_extra_ratio=1.0)
+
+    for _ in range(5):
+        assert hedger.call(lambda: "ok") == "ok"
+
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_extra_load_is_capped():
+    hedger = Hedger("test-cap", min_delay=0.001, max_extra_ratio=0.5)
+
+    def slow():
+        time.sleep(0.02)
+        return "ok"
+
+    for _ in range(6):
+        hedger.call(slow)
+
+    stats = hedger.stats()
+    assert stats["hedged"] <= 3
+    assert stats["budget_denied"] >= 1
+
+
+def test_failed_calls_count_towards_the_delay():
+    hedger = Hedger("test-failures", min_delay=0.001, max_extra_ratio=0)
+
+    def timeout():
+        time.sleep(0.05)
+        raise TimeoutError
+
+    for _ in range(3):
+        try:
+            hedger.call(timeout)
+        except TimeoutError:
+            pass
+
+    assert hedger.delay() >= 0.05
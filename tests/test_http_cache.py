@@ -0,0 +1,62 @@
+from flask import Flask, flash
+
+from helpers.http_cache import compute_etag, not_modified, with_etag
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config.update(SECRET_KEY="test", ETAG_VERSION="1")
+    calls = []
+
+    @app.get("/page")
+    def page():
+        etag = compute_etag("post", 1)
+        response = not_modified(etag)
+
+        if response is not None:
+            return response
+
+        calls.append(1)
+        return with_etag("<html></html>", etag)
+
+    @app.get("/flash")
+    def add_flash():
+        flash("hola")
+        return ""
+
+    return app, calls
+
+
+def test_not_modified_skips_render():
+    app, calls = make_app()
+    client = app.test_client()
+
+    response = client.get("/page")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get("/page", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert len(calls) == 1
+
+
+def test_pending_flash_always_renders():
+    app, calls = make_app()
+    client = app.test_client()
+    etag = client.get("/page").headers["ETag"]
+
+    client.get("/flash")
+    response = client.get("/page", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_etag_changes_with_version():
+    app, _ = make_app()
+
+    with app.test_request_context():
+        first = compute_etag("post", 1)
+        app.config["ETAG_VERSION"] = "2"
+        assert compute_etag("post", 1) != first
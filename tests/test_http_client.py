@@ -0,0 +1,145 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+
+from helpers import http_client
+from helpers.deadline import DeadlineExceeded, start_request_deadline
+from helpers.concurrency import submit
+from helpers.http_client import (
+    ServiceClient,
+    get_client,
+    init_upstream_calls,
+    upstream_calls,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        deadline = self.headers.get("X-Request-Deadline")
+        body = b'{"ok": true, "deadline": %s}' % (deadline or "null").encode()
+
+        if self.path == "/accept":
+            body = self.headers.get("Accept", "").encode()
+
+        # como drop_expired_requests de los microservicios
+        self.send_response(504 if self.path == "/expired" else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_keep_alive_connection(upstream):
+    client = ServiceClient("test", upstream, timeout=2)
+
+    for _ in range(5):
+        assert client.get("/ping").json() == {"ok": True, "deadline": None}
+
+    stats = client.stats.to_json()
+    assert stats["new_connections"] == 1
+    assert stats["hits"] == 4
+    client.close()
+
+
+def test_get_client_is_cached_per_process():
+    assert get_client("post") is get_client("post")
+    assert get_client("post") is not get_client("comments")
+    assert set(http_client.pool_stats()) >= {"post", "comments"}
+
+
+def test_deadline_is_forwarded_and_enforced(upstream):
+    client = ServiceClient("test-deadline", upstream, timeout=2)
+    app = Flask(__name__)
+    app.config["REQUEST_BUDGET_SECONDS"] = 5
+
+    with app.test_request_context():
+        start_request_deadline()
+        deadline = client.get("/ping").json()["deadline"]
+        assert time.time() * 1000 < deadline <= (time.time() + 5) * 1000
+
+    app.config["REQUEST_BUDGET_SECONDS"] = 0.001
+
+    with app.test_request_context():
+        start_request_deadline()
+        time.sleep(0.01)
+
+        with pytest.raises(DeadlineExceeded):
+            client.get("/ping")
+
+    client.close()
+
+
+def test_upstream_calls_are_counted_per_request(upstream):
+    client = ServiceClient("test-calls", upstream, timeout=2)
+    app = Flask(__name__)
+
+    with app.test_request_context():
+        init_upstream_calls()
+        client.get("/ping")
+        # las llamadas de los hilos de fan-out cuentan para la misma petición
+        submit(client.get, "/ping").result()
+        assert upstream_calls() == {"test-calls": 2}
+
+    with app.test_request_context():
+        init_upstream_calls()
+        assert upstream_calls() == {}
+
+    client.close()
+
+
+def test_wire_format_msgpack_sets_accept(upstream):
+    client = ServiceClient("test-wire", upstream, timeout=2, wire_format="msgpack")
+
+    try:
+        accept = client.get("/accept").text
+    finally:
+        client.close()
+
+    assert accept.startswith("application/msgpack")
+    assert "application/json" in accept
+
+
+def test_504_after_own_deadline_is_not_a_breaker_failure(upstream):
+    client = ServiceClient("test-expired", upstream, timeout=2)
+    app = Flask(__name__)
+    app.config["REQUEST_BUDGET_SECONDS"] = 0.05
+    request = client.session.request
+
+    def late_request(*args, **kwargs):
+        # la respuesta llega cuando el deadline de la petición ya pasó
+        response = request(*args, **kwargs)
+        time.sleep(0.06)
+        return response
+
+    client.session.request = late_request
+
+    try:
+        with app.test_request_context():
+            start_request_deadline()
+            assert client.get("/expired").status_code == 504
+
+        assert client.breaker.stats()["window_calls"] == 0
+
+        # sin deadline vencido, un 504 sí cuenta como fallo
+        assert client.get("/expired").status_code == 504
+        assert client.breaker.stats()["error_rate"] == 1.0
+    finally:
+        client.close()
@@ -0,0 +1,109 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+import requests
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from helpers import json_provider
+from helpers.json_provider import JSONProvider, response_json
+
+
+@dataclass
+class Item:
+    id: str
+    created_at: datetime
+
+
+PAYLOAD = {
+    "success": True,
+    "message": "Posts obtenidas",
+    "data": [Item("p1", datetime(2025, 9, 21, 10, 0, tzinfo=timezone.utc))],
+    "total": 10**20,
+    "títulos": ["Año nuevo"],
+}
+
+
+def render(provider_class) -> dict:
+    app = Flask(__name__)
+    app.json = provider_class(app)
+
+    with app.app_context():
+        response = jsonify(PAYLOAD)
+
+    assert response.mimetype == "application/json"
+    return json.loads(response.get_data())
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_provider_matches_flask_default(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(json_provider, "orjson", None)
+
+    assert render(JSONProvider) == render(DefaultJSONProvider)
+    assert render(JSONProvider)["data"][0]["created_at"] == (
+        "Sun, 21 Sep 2025 10:00:00 GMT"
+    )
+
+
+def test_request_get_json_uses_provider():
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
+
+    with app.test_request_context(json={"a": [1, 2]}):
+        from flask import request
+
+        assert request.get_json() == {"a": [1, 2]}
+
+
+def test_response_json_parses_once(monkeypatch):
+    response = requests.Response()
+    response._content = b'{"data": {"id": "p1"}}'
+    calls = []
+
+    def counting_loads(data):
+        calls.append(data)
+        return json.loads(data)
+
+    monkeypatch.setattr(json_provider, "loads", counting_loads)
+
+    assert response_json(response)["data"] == {"id": "p1"}
+    assert response_json(response) is response_json(response)
+    assert len(calls) == 1
+
+
+def test_jsonify_answers_msgpack_when_preferred():
+    app = Flask(__name__)
+    app.json = JSONProvider(app)
+    accept = {"Accept": "application/msgpack, application/json;q=0.9"}
+
+    with app.test_request_context(headers=accept):
+        response = jsonify(PAYLOAD | {"total": 10})
+
+    assert response.mimetype == "application/msgpack"
+    assert "Accept" in response.vary
+    assert msgpack.unpackb(response.get_data()) == render(JSONProvider) | {"total": 10}
+
+    with app.test_request_context(headers={"Accept": "*/*"}):
+        response = jsonify(PAYLOAD)
+
+    assert response.mimetype == "application/json"
+    assert "Accept" in response.vary
+
+    with app.test_request_context(headers=accept):
+        # más de 64 bits no cabe en MessagePack: se responde en JSON
+        response = jsonify(PAYLOAD)
+
+    assert response.mimetype == "application/json"
+    assert "Accept" in response.vary
+
+
+def test_response_json_reads_msgpack():
+    response = requests.Response()
+    response.headers["Content-Type"] = "application/msgpack"
+    response._content = msgpack.packb({"data": {"id": "p1"}})
+
+    assert response_json(response) == {"data": {"id": "p1"}}
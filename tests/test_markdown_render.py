@@ -0,0 +1,48 @@
+import threading
+
+import markdown
+from flask import Flask
+
+from helpers import markdown_render
+from helpers.markdown_render import (
+    POST_EXTENSIONS,
+    _renderer,
+    init_markdown,
+    render_markdown,
+)
+
+
+def test_reused_renderer_matches_markdown_and_resets_state():
+    text = "Texto[^1]\n\n[^1]: nota\n\n```python\nx = 1\n```"
+    expected = markdown.markdown(text, extensions=list(POST_EXTENSIONS))
+
+    assert render_markdown(text) == expected
+    assert "nota" not in render_markdown("Otro texto")
+    assert render_markdown(text) == expected
+
+
+def test_one_renderer_per_thread():
+    main = _renderer(POST_EXTENSIONS)
+    assert _renderer(POST_EXTENSIONS) is main
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(_renderer(POST_EXTENSIONS)))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main
+
+
+def test_cache_is_sized_from_app_config():
+    app = Flask(__name__)
+    app.config.update(MARKDOWN_CACHE_MAX_BYTES=0, MARKDOWN_WARM_UP=False)
+    maxbytes = markdown_render._rendered.maxbytes
+
+    try:
+        init_markdown(app)
+        render_markdown("# Hola", cache_key="p1")
+
+        assert markdown_render._rendered.maxbytes == 0
+        assert len(markdown_render._rendered) == 0
+    finally:
+        markdown_render._rendered.resize(maxbytes)
@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+
+import requests
+from flask import Flask
+
+from dtos import PostDto
+from helpers.request_cache import memo_get, memo_set
+from services import post_service
+
+NOW = "2025-09-21T10:00:00"
+
+
+def post_json(post_id: str) -> dict:
+    return {
+        "id": post_id,
+        "title": f"Post {post_id}",
+        "content": "Contenido",
+        "created_at": NOW,
+        "updated_at": NOW,
+        "user_id": "1",
+        "username": "juan",
+    }
+
+
+class BatchClient:
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.calls = []
+
+    def get(self, path, params=None, **kwargs):
+        post_ids = params["ids"].split(",")
+        self.calls.append((path, post_ids))
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        data = [post_json(i) for i in post_ids if i not in self.missing]
+        response._content = json.dumps({"data": data}).encode()
+        return response
+
+
+def test_get_posts_merges_memo_cache_and_batch(monkeypatch):
+    client = BatchClient(missing={"p4"})
+    monkeypatch.setattr(post_service, "get_client", lambda name: client)
+    post_service._post_cache.clear()
+    cached = PostDto.from_json(post_json("p2"))
+    post_service._post_cache.set("p2", cached)
+
+    with Flask(__name__).test_request_context():
+        memoized = PostDto.from_json(post_json("p1"))
+        memo_set("post", "p1", memoized)
+
+        posts = post_service.get_posts(["p3", "p1", "p2", "p4", "p3"])
+
+        # en el orden pedido, sin repetidos y sin los que no existen
+        assert [post.id for post in posts] == ["p3", "p1", "p2"]
+        assert posts[1] is memoized
+        assert posts[2] is cached
+        assert memo_get("post", "p3") is posts[0]
+
+    assert client.calls == [("/post/batch", ["p3", "p4"])]
+    assert post_service._post_cache.get("p3") is posts[0]
+    post_service._post_cache.clear()
+
+
+def test_get_posts_chunks_batch_calls(monkeypatch):
+    client = BatchClient()
+    monkeypatch.setattr(post_service, "get_client", lambda name: client)
+    post_service._post_cache.clear()
+    post_ids = [f"p{i}" for i in range(250)]
+
+    posts = post_service.get_posts(post_ids)
+
+    assert [post.id for post in posts] == post_ids
+    assert [len(ids) for _, ids in client.calls] == [100, 100, 50]
+    post_service._post_cache.clear()
+
+
+class FeedClient:
+    """Microservicio de Post de mentira: /post/feed, /post/new y delete."""
+
+    def __init__(self):
+        self.posts = [post_json("p1")]
+
+    def _response(self, body: dict):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode()
+        return response
+
+    def get(self, path, params=None, **kwargs):
+        items = list(reversed(self.posts))
+        return self._response({"data": {"items": items, "next_cursor": None}})
+
+    def post(self, path, json=None, **kwargs):
+        if path == "/post/new":
+            self.posts.append(post_json(f"p{len(self.posts) + 1}"))
+            return self._response({"data": self.posts[-1]})
+
+        post_id = path.split("/")[2]
+        self.posts = [post for post in self.posts if post["id"] != post_id]
+        return self._response({"data": None})
+
+
+def test_feed_read_right_after_a_write_is_fresh(monkeypatch):
+    client = FeedClient()
+    monkeypatch.setattr(post_service, "get_client", lambda name: client)
+    monkeypatch.setattr(post_service, "current_user", lambda: SimpleNamespace(id="1"))
+    post_service._feed_cache.clear()
+
+    def feed_ids():
+        posts, _ = post_service.get_feed_page(25)
+        return [post.id for post in posts]
+
+    assert feed_ids() == ["p1"]
+
+    post = post_service.create_post("juan", "Nuevo", "Contenido")
+    assert feed_ids() == [post.id, "p1"]
+
+    assert post_service.delete_post_by_id("p1")
+    assert feed_ids() == [post.id]
+
+    post_service._feed_cache.clear()
+    post_service._post_cache.clear()
@@ -0,0 +1,74 @@
+from flask import Flask
+
+from helpers.request_cache import memo_invalidate, memo_set, request_memoized
+
+
+def test_memoized_once_per_request():
+    app = Flask(__name__)
+    calls = []
+
+    @request_memoized("post")
+    def load(post_id):
+        calls.append(post_id)
+        return {"id": post_id}
+
+    with app.test_request_context():
+        assert load("p1") is load("p1")
+        load("p2")
+
+    with app.test_request_context():
+        load("p1")
+
+    assert calls == ["p1", "p2", "p1"]
+
+
+def test_none_is_not_memoized_and_invalidate():
+    app = Flask(__name__)
+    calls = []
+
+    @request_memoized("post")
+    def load(post_id):
+        calls.append(post_id)
+        return None if len(calls) == 1 else {"id": post_id}
+
+    with app.test_request_context():
+        assert load("p1") is None
+        assert load("p1") == {"id": "p1"}
+        memo_invalidate("post", "p1")
+        load("p1")
+        memo_set("post", "p1", {"id": "p1", "title": "nuevo"})
+        assert load("p1")["title"] == "nuevo"
+
+    assert len(calls) == 3
+
+
+def test_memo_outside_request_calls_through():
+    calls = []
+
+    @request_memoized("post")
+    def load(post_id):
+        calls.append(post_id)
+        return post_id
+
+    load("p1")
+    load("p1")
+    assert calls == ["p1", "p1"]
+
+
+def test_extra_args_are_part_of_the_key():
+    app = Flask(__name__)
+    calls = []
+
+    @request_memoized("comments")
+    def load(post_id, cursor=None):
+        calls.append((post_id, cursor))
+        return [post_id, cursor]
+
+    with app.test_request_context():
+        load("p1")
+        load("p1", "c1")
+        load("p1", "c1")
+        memo_invalidate("comments", "p1")
+        load("p1", "c1")
+
+    assert calls == [("p1", None), ("p1", "c1"), ("p1", "c1")]
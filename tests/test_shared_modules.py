@@ -0,0 +1,40 @@
+import filecmp
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = os.path.join(ROOT, "microservices")
+
+# módulos copiados igual en cada servicio (cada uno es una imagen aparte): las
+# pruebas de una copia valen para las demás solo si no divergen
+COPIES = {
+    "db_connector/storage.py": [
+        os.path.join(SERVICES, service, "db_connector", "storage.py")
+        for service in ("post", "user", "comments-service")
+    ],
+    "json_provider.py": [os.path.join(ROOT, "helpers", "json_provider.py")]
+    + [
+        os.path.join(SERVICES, service, "json_provider.py")
+        for service in ("post", "user", "comments-service")
+    ],
+    "db_connector/prefix_index.py": [
+        os.path.join(SERVICES, service, "db_connector", "prefix_index.py")
+        for service in ("post", "user")
+    ],
+    "dtos/wire.py": [
+        os.path.join(ROOT, "dtos", "wire.py"),
+        os.path.join(SERVICES, "post", "dtos", "wire.py"),
+    ],
+}
+
+
+@pytest.mark.parametrize("name", sorted(COPIES))
+def test_copies_are_identical(name):
+    first, *others = COPIES[name]
+
+    for other in others:
+        assert filecmp.cmp(first, other, shallow=False), (
+            f"{os.path.relpath(other, ROOT)} difiere de "
+            f"{os.path.relpath(first, ROOT)}"
+        )
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from helpers.singleflight import SingleFlight, singleflight_stats
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    group = SingleFlight("test-shared")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"id": "p1"}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(group.do("p1", fetch)))
+    leader.start()
+    started.wait(2)
+
+    followers = [
+        threading.Thread(target=lambda: results.append(group.do("p1", fetch)))
+        for _ in range(5)
+    ]
+    for t in followers:
+        t.start()
+
+    # los seguidores quedan esperando al líder
+    while group.stats()["coalesced"] < 5:
+        threading.Event().wait(0.01)
+
+    release.set()
+    for t in [leader, *followers]:
+        t.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 6
+    assert all(r is results[0] for r in results)
+    assert singleflight_stats()["test-shared"] == {
+        "calls": 1,
+        "coalesced": 5,
+        "in_flight": 0,
+    }
+
+
+def test_errors_propagate_and_key_is_released():
+    group = SingleFlight("test-errors")
+
+    @group.coalesced_call("post")
+    def fetch(post_id):
+        raise RuntimeError(post_id)
+
+    with pytest.raises(RuntimeError):
+        fetch("p1")
+
+    assert group.stats()["in_flight"] == 0
+    assert group.do("p1", lambda: "ok") == "ok"
+
+
+def test_forget_starts_a_new_call():
+    group = SingleFlight("test-forget")
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def old_read():
+        started.set()
+        release.wait(2)
+        return "antes"
+
+    leader = threading.Thread(
+        target=lambda: results.append(group.do(("feed", "25"), old_read))
+    )
+    leader.start()
+    started.wait(2)
+
+    group.forget("feed")
+    assert group.do(("feed", "25"), lambda: "después") == "después"
+
+    release.set()
+    leader.join(2)
+    assert results == ["antes"]
+    assert group.stats()["in_flight"] == 0
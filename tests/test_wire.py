@@ -0,0 +1,27 @@
+from dataclasses import fields
+from datetime import datetime
+
+from dtos import PostDto
+from dtos.wire import POST_FIELDS, SUMMARY_CONTENT_CHARS, summarize_post
+
+
+def test_post_fields_match_post_dto():
+    assert POST_FIELDS == tuple(field.name for field in fields(PostDto))
+
+
+def test_summary_keeps_fields_and_cuts_content():
+    now = datetime(2025, 9, 21).isoformat()
+    post = {
+        "id": "p1",
+        "title": "Hola",
+        "content": "x" * 500,
+        "created_at": now,
+        "updated_at": now,
+        "user_id": "1",
+        "username": "juan",
+    }
+
+    summary = summarize_post(post | {"extra": True})
+
+    assert PostDto.from_json(summary).content == "x" * SUMMARY_CONTENT_CHARS
+    assert set(summary) == set(POST_FIELDS)